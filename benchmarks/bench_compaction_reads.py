@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Compare read times of the per-match bronze layout against the compacted,
+competition/season partitioned layout.
+
+Queries (each run --repeat times, best and median reported):
+  full scan           every row of the dataset, a few columns, grouped by match
+  single competition  one competition's rows (per-match layout: matches table -> file list)
+  single match        one match's rows
+
+Usage:
+    python benchmarks/bench_compaction_reads.py --dataset events --repeat 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+import polars as pl
+
+from football_pipeline.bronze.open_data.compact import COMPACTED_DATASETS, load_match_partitions
+from football_pipeline.utils.constants import BRONZE_OPEN_DATA_COMPACTED_DIR, BRONZE_OPEN_DATA_DIR
+
+BRONZE_DIRS = {
+    "events": BRONZE_OPEN_DATA_DIR / "events",
+    "lineups": BRONZE_OPEN_DATA_DIR / "lineups",
+    "three-sixty": BRONZE_OPEN_DATA_DIR / "three-sixty",
+}
+# Columns present in every file of each dataset
+COLUMNS = {
+    "events": ["id", "type_name", "team_name"],
+    "lineups": ["team_id", "team_name"],
+    "three-sixty": ["event_uuid"],
+}
+# Tolerate per-file schema drift in the per-match layout
+SCAN_OPTIONS = {"missing_columns": "insert", "extra_columns": "ignore"}
+
+
+def _time(fn, repeat: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", choices=list(COMPACTED_DATASETS), default="events")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--competition-id", type=int, default=None, help="Defaults to the largest competition")
+    args = parser.parse_args()
+
+    prefix = COMPACTED_DATASETS[args.dataset][1]
+    per_match_dir = BRONZE_DIRS[args.dataset]
+    compacted_dir = BRONZE_OPEN_DATA_COMPACTED_DIR / args.dataset
+    columns = COLUMNS[args.dataset]
+    if not any(compacted_dir.glob("**/*.parquet")):
+        print(f"No compacted data in {compacted_dir}; run the bronze layer first.", file=sys.stderr)
+        return 1
+
+    partitions = load_match_partitions(BRONZE_OPEN_DATA_DIR / "matches")
+    # Only matches that exist in this dataset (not every match has 360 data)
+    available = [int(f.stem.rsplit("_", 1)[1]) for f in per_match_dir.glob(f"{prefix}_*.parquet")]
+    partitions = partitions.filter(pl.col("match_id").is_in(available))
+    competition_id = args.competition_id
+    if competition_id is None:
+        competition_id = partitions.group_by("competition_id").len().sort("len").row(-1)[0]
+    competition_matches = partitions.filter(pl.col("competition_id") == competition_id)["match_id"].to_list()
+    match_id = competition_matches[0]
+
+    def per_match_full():
+        pl.scan_parquet(per_match_dir / f"{prefix}_*.parquet", include_file_paths="path", **SCAN_OPTIONS) \
+            .select(columns + ["path"]).group_by("path").len().collect()
+
+    def compacted_full():
+        pl.scan_parquet(compacted_dir, hive_partitioning=True, **SCAN_OPTIONS) \
+            .select(columns + ["match_id"]).group_by("match_id").len().collect()
+
+    def per_match_competition():
+        files = [per_match_dir / f"{prefix}_{m}.parquet" for m in competition_matches]
+        pl.scan_parquet(files, **SCAN_OPTIONS).select(columns).collect()
+
+    def compacted_competition():
+        pl.scan_parquet(compacted_dir, hive_partitioning=True, **SCAN_OPTIONS) \
+            .filter(pl.col("competition_id") == competition_id).select(columns).collect()
+
+    def per_match_single():
+        pl.scan_parquet(per_match_dir / f"{prefix}_{match_id}.parquet").select(columns).collect()
+
+    def compacted_single():
+        pl.scan_parquet(compacted_dir, hive_partitioning=True, **SCAN_OPTIONS) \
+            .filter(pl.col("match_id") == match_id).select(columns).collect()
+
+    print(f"{args.dataset}: {len(available)} per-match files; competition {competition_id} "
+          f"({len(competition_matches)} matches); match {match_id}")
+    print(f"{'query':<20} {'per-match best/median (s)':>27} {'compacted best/median (s)':>27} {'speed-up':>9}")
+    for name, old, new in [
+        ("full scan", per_match_full, compacted_full),
+        ("single competition", per_match_competition, compacted_competition),
+        ("single match", per_match_single, compacted_single),
+    ]:
+        old_best, old_median = _time(old, args.repeat)
+        new_best, new_median = _time(new, args.repeat)
+        print(f"{name:<20} {old_best:>13.3f} / {old_median:<11.3f} {new_best:>13.3f} / {new_median:<11.3f} "
+              f"{old_median / new_median:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ingestion hot paths on synthetic data.
+
+Generates a deterministic synthetic landing tree (benchmarks/synthetic_data.py)
+at the requested scale, or reuses one generated earlier with the same
+parameters, then times each step in a fresh worker process:
+
+  serialize_all_lists          the pandas path's list serialization (JSON load excluded)
+  ingest_json_to_parquet       the largest events file, and the J1 events file streamed
+  ingest_json_batch_to_parquet events, lineups and three-sixty directories
+  ingest_csv_batch_to_parquet  the J1 mapping CSVs
+  compact_open_data            bronze compaction (input of the silver builds)
+  build_silver_*               silver events, lineups and three-sixty
+
+For every step the median wall time over --repeat runs is reported with CPU
+time (including the pool workers', start-up included), throughput (MB/s of input, rows/s of output) and peak RSS of the step's
+process and of its pool workers. Results can be written to JSON together with
+the commit, library versions and machine, and compared against an earlier
+result file; the same --matches/--events-per-match/--seed produce identical
+data, so runs on different commits are comparable.
+
+Usage:
+    python benchmarks/bench_ingest.py --matches 200 --json bench_$(git rev-parse --short HEAD).json
+    python benchmarks/bench_ingest.py --matches 200 --compare bench_abc1234.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import synthetic_data
+
+BENCHMARKS = [
+    "serialize_all_lists/events",
+    "ingest_json_to_parquet/events",
+    "ingest_json_to_parquet/j1_events_streaming",
+    "ingest_json_batch_to_parquet/events",
+    "ingest_json_batch_to_parquet/lineups",
+    "ingest_json_batch_to_parquet/three-sixty",
+    "ingest_csv_batch_to_parquet/mappings",
+    "compact_open_data",
+    "build_silver_events",
+    "build_silver_lineups",
+    "build_silver_three_sixty",
+]
+# Memory cap of the streaming J1 benchmark
+STREAMING_MAX_MEMORY_MB = 256
+# Files whose lists are serialized in the serialize_all_lists benchmark
+SERIALIZE_FILES = 20
+GENERATED_MARKER = "_generated.json"
+# Steps that fan out to the shared process pool (started before timing)
+POOLED_BENCHMARKS = ("ingest_json_batch_to_parquet/", "ingest_csv_batch_to_parquet/")
+
+
+def _paths(root: Path) -> dict:
+    """The open_data and J1 League paths of a synthetic tree, keyed like the ingest modules' _get_paths."""
+    landing, bronze = root / "landing" / "open_data" / "data", root / "bronze" / "open_data"
+    j1 = root / "landing" / "j1_league"
+    return {
+        "landing_events": landing / "events",
+        "landing_lineups": landing / "lineups",
+        "landing_three_sixty_events": landing / "three-sixty",
+        "landing_matches": landing / "matches",
+        "bronze_matches": bronze / "matches",
+        "bronze_events": bronze / "events",
+        "bronze_lineups": bronze / "lineups",
+        "bronze_three_sixty_events": bronze / "three-sixty",
+        "bronze_compacted": bronze / "compacted",
+        "landing_j1_events": j1 / "sb-events" / "sb_events.json",
+        "landing_j1_mappings": j1 / "mappings",
+        "bronze_j1": root / "bronze" / "j1_league",
+        "silver": root / "silver" / "open_data",
+    }
+
+
+def _size(path: Path) -> int:
+    if path.is_dir():
+        return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+    return path.stat().st_size if path.exists() else 0
+
+
+def _parquet_rows(path: Path) -> int:
+    import pyarrow.parquet as pq
+
+    files = [path] if path.is_file() else sorted(path.rglob("*.parquet"))
+    return sum(pq.read_metadata(f).num_rows for f in files)
+
+
+def _peak_mb(who: int) -> float:
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def _setup(name: str, paths: dict, workers: int):
+    """Produce the bronze inputs a benchmark needs (not timed)."""
+    from football_pipeline.bronze.open_data.compact import compact_open_data
+    from football_pipeline.utils.dataframe import ingest_json_batch_to_parquet
+
+    if name in ("compact_open_data", "build_silver_events", "build_silver_lineups", "build_silver_three_sixty"):
+        ingest_json_batch_to_parquet(
+            paths["landing_matches"], paths["bronze_matches"], file_pattern="*/*.json",
+            output_prefix="matches", workers=workers, schema="matches",
+        )
+        for dataset, prefix, schema in [
+            ("events", "events", "events"),
+            ("lineups", "lineups", "lineups"),
+            ("three_sixty_events", "events_three_sixty", "three-sixty"),
+        ]:
+            ingest_json_batch_to_parquet(
+                paths[f"landing_{dataset}"], paths[f"bronze_{dataset}"],
+                output_prefix=prefix, workers=workers, schema=schema,
+            )
+    if name.startswith("build_silver"):
+        compact_open_data(paths)
+
+
+def _run_benchmark(name: str, paths: dict, workers: int) -> tuple[Path, Path, float]:
+    """Run one benchmark step; returns (input, output, seconds of untimed preparation to subtract)."""
+    from football_pipeline.bronze.open_data.compact import compact_open_data
+    from football_pipeline.silver.open_data.events.base import build_silver_events
+    from football_pipeline.silver.open_data.lineups import build_silver_lineups
+    from football_pipeline.silver.open_data.three_sixty import build_silver_three_sixty
+    from football_pipeline.utils.dataframe import (
+        ingest_csv_batch_to_parquet,
+        ingest_json_batch_to_parquet,
+        ingest_json_to_parquet,
+        serialize_all_lists,
+    )
+
+    bronze, silver = paths["bronze_events"].parent, paths["silver"]
+    if name == "serialize_all_lists/events":
+        files = sorted(paths["landing_events"].glob("*.json"))[:SERIALIZE_FILES]
+        start = time.perf_counter()
+        data = [json.loads(f.read_text()) for f in files]
+        load = time.perf_counter() - start
+        for records in data:
+            serialize_all_lists(records)
+        return files[0].parent, None, load
+    if name == "ingest_json_to_parquet/events":
+        largest = max(paths["landing_events"].glob("*.json"), key=lambda f: f.stat().st_size)
+        output = bronze / "single" / "events.parquet"
+        ingest_json_to_parquet(largest, output, overwrite=True, use_manifest=False, schema="events")
+        return largest, output, 0.0
+    if name == "ingest_json_to_parquet/j1_events_streaming":
+        output = paths["bronze_j1"] / "events" / "sb_events.parquet"
+        ingest_json_to_parquet(
+            paths["landing_j1_events"], output, overwrite=True, use_manifest=False,
+            max_memory_mb=STREAMING_MAX_MEMORY_MB, schema="j1_events",
+        )
+        return paths["landing_j1_events"], output, 0.0
+    if name.startswith("ingest_json_batch_to_parquet/"):
+        dataset = name.split("/")[1]
+        key, prefix = ("three_sixty_events", "events_three_sixty") if dataset == "three-sixty" else (dataset, dataset)
+        output = paths[f"bronze_{key}"]
+        ingest_json_batch_to_parquet(
+            paths[f"landing_{key}"], output, output_prefix=prefix,
+            workers=workers, overwrite=True, schema=dataset,
+        )
+        return paths[f"landing_{key}"], output, 0.0
+    if name == "ingest_csv_batch_to_parquet/mappings":
+        output = paths["bronze_j1"] / "mappings"
+        ingest_csv_batch_to_parquet(paths["landing_j1_mappings"], output, workers=workers, overwrite=True)
+        return paths["landing_j1_mappings"], output, 0.0
+    if name == "compact_open_data":
+        compact_open_data(paths, overwrite=True)
+        return paths["bronze_events"].parent, paths["bronze_compacted"], 0.0
+    compacted = paths["bronze_compacted"]
+    if name == "build_silver_events":
+        build_silver_events(compacted_dir=compacted / "events", output_dir=silver / "events", overwrite=True)
+        return compacted / "events", silver / "events", 0.0
+    if name == "build_silver_lineups":
+        build_silver_lineups(bronze_dir=paths["bronze_lineups"], output_dir=silver / "lineups", overwrite=True)
+        return paths["bronze_lineups"], silver / "lineups", 0.0
+    if name == "build_silver_three_sixty":
+        build_silver_three_sixty(
+            compacted_dir=compacted / "three-sixty", output_dir=silver / "three-sixty", overwrite=True
+        )
+        return compacted / "three-sixty", silver / "three-sixty", 0.0
+    raise ValueError(f"Unknown benchmark: {name}")
+
+
+def _warm_up(seconds: float):
+    """Pool task: import the ingestion stack and hold the worker so every worker starts."""
+    import football_pipeline.utils.dataframe  # noqa: F401
+
+    time.sleep(seconds)
+
+
+def _run_once(name: str, root: str, workers: int) -> dict:
+    """Run one benchmark in the current (fresh) process and measure it."""
+    from football_pipeline.utils.parallel import map_tasks, shutdown_executors
+
+    paths = _paths(Path(root))
+    _setup(name, paths, workers)
+    # Collect the setup pool's CPU time before the measurement starts
+    shutdown_executors()
+    # Start the shared pool up front: spawning workers and importing Polars in
+    # them takes seconds and would swamp the per-file cost at small scales
+    if name.startswith(POOLED_BENCHMARKS):
+        list(map_tasks(_warm_up, [0.2] * workers, workers))
+    # Setup ran in this process: only count what the step itself adds
+    baseline_mb = _peak_mb(resource.RUSAGE_SELF)
+    cpu_start = os.times()
+    start = time.perf_counter()
+    input_path, output_path, untimed = _run_benchmark(name, paths, workers)
+    seconds = time.perf_counter() - start - untimed
+    # Worker processes only report their resource usage once they exit
+    shutdown_executors()
+    cpu_end = os.times()
+    cpu = sum(cpu_end[:4]) - sum(cpu_start[:4]) - untimed
+    return {
+        "seconds": seconds,
+        "cpu_s": cpu,
+        "peak_rss_mb": _peak_mb(resource.RUSAGE_SELF),
+        "peak_rss_growth_mb": _peak_mb(resource.RUSAGE_SELF) - baseline_mb,
+        "worker_peak_rss_mb": _peak_mb(resource.RUSAGE_CHILDREN),
+        "input_bytes": _size(input_path),
+        "rows": _parquet_rows(output_path) if output_path is not None else None,
+    }
+
+
+def _measure(name: str, data_root: Path, workers: int) -> dict:
+    # A fresh copy of the landing tree per run, so no bronze output from another step is reused
+    with tempfile.TemporaryDirectory(prefix="bench_ingest_") as tmp:
+        root = Path(tmp)
+        (root / "landing").symlink_to(data_root / "landing", target_is_directory=True)
+        # A plain process rather than a Pool: pool workers are daemonic and cannot start the steps' own pools
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_run_in_child, args=(sender, name, str(root), workers))
+        process.start()
+        sender.close()
+        try:
+            result = receiver.recv()
+        except EOFError:
+            result = None
+        process.join()
+        if result is None or process.exitcode != 0:
+            raise RuntimeError(f"Benchmark {name} failed (exit code {process.exitcode})")
+        return result
+
+
+def _run_in_child(sender, name: str, root: str, workers: int):
+    sender.send(_run_once(name, root, workers))
+    sender.close()
+
+
+def _ensure_data(args) -> Path:
+    """Generate the synthetic tree, or reuse one generated with the same parameters."""
+    params = {
+        "matches": args.matches,
+        "events_per_match": args.events_per_match,
+        "j1_matches": args.j1_matches,
+        "seed": args.seed,
+        "generator_version": 2,
+    }
+    data_root = args.data_dir or (
+        Path(tempfile.gettempdir()) / "football_pipeline_bench"
+        / f"m{args.matches}_e{args.events_per_match}_j{args.j1_matches}_s{args.seed}"
+    )
+    marker = data_root / GENERATED_MARKER
+    if marker.exists() and json.loads(marker.read_text()) == params:
+        print(f"Reusing synthetic data in {data_root}")
+        return data_root
+    if data_root.exists():
+        shutil.rmtree(data_root)
+    start = time.perf_counter()
+    synthetic_data.generate_open_data(data_root, args.matches, args.events_per_match, seed=args.seed)
+    synthetic_data.generate_j1_league(data_root, args.j1_matches, args.events_per_match, seed=args.seed)
+    marker.write_text(json.dumps(params))
+    print(f"Generated synthetic data ({_size(data_root / 'landing') / 1e6:.0f} MB) "
+          f"in {time.perf_counter() - start:.1f}s: {data_root}")
+    return data_root
+
+
+def _git_commit() -> str | None:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _environment() -> dict:
+    import polars as pl
+    import pyarrow
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "pyarrow": pyarrow.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", type=int, default=100, help="Open-data matches (10 to 10,000)")
+    parser.add_argument("--events-per-match", type=int, default=3500)
+    parser.add_argument("--j1-matches", type=int, default=None, help="J1 League matches (default: --matches / 10)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", type=Path, default=None, help="Where to generate (or reuse) the synthetic data")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Workers of the batch steps")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", default=None, choices=BENCHMARKS, metavar="BENCHMARK")
+    parser.add_argument("--json", type=Path, default=None, help="Write the results to this JSON file")
+    parser.add_argument("--compare", type=Path, default=None, help="Compare against an earlier --json result")
+    args = parser.parse_args()
+    if args.j1_matches is None:
+        args.j1_matches = max(1, args.matches // 10)
+
+    data_root = _ensure_data(args)
+    results = {}
+    print()
+    print(f"{'benchmark':<44} {'median s':>9} {'cpu s':>7} {'MB/s':>8} {'rows/s':>11} "
+          f"{'peak MB':>8} {'growth MB':>9} {'worker MB':>9}")
+    for name in args.only or BENCHMARKS:
+        runs = [_measure(name, data_root, args.workers) for _ in range(args.repeat)]
+        seconds = statistics.median(r["seconds"] for r in runs)
+        first = runs[0]
+        result = {
+            "seconds": seconds,
+            "seconds_min": min(r["seconds"] for r in runs),
+            "cpu_s": statistics.median(r["cpu_s"] for r in runs),
+            "input_bytes": first["input_bytes"],
+            "rows": first["rows"],
+            "mb_per_s": first["input_bytes"] / 1e6 / seconds if seconds > 0 else None,
+            "rows_per_s": first["rows"] / seconds if first["rows"] is not None and seconds > 0 else None,
+            "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+            "peak_rss_growth_mb": max(r["peak_rss_growth_mb"] for r in runs),
+            "worker_peak_rss_mb": max(r["worker_peak_rss_mb"] for r in runs),
+        }
+        results[name] = result
+        rows_per_s = f"{result['rows_per_s']:>11,.0f}" if result["rows_per_s"] is not None else f"{'-':>11}"
+        print(
+            f"{name:<44} {seconds:>9.3f} {result['cpu_s']:>7.2f} {result['mb_per_s']:>8.1f} {rows_per_s} "
+            f"{result['peak_rss_mb']:>8.0f} {result['peak_rss_growth_mb']:>9.0f} {result['worker_peak_rss_mb']:>9.0f}"
+        )
+
+    report = {
+        "environment": _environment(),
+        "parameters": {
+            "matches": args.matches,
+            "events_per_match": args.events_per_match,
+            "j1_matches": args.j1_matches,
+            "seed": args.seed,
+            "workers": args.workers,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline["parameters"]["matches"] != args.matches or baseline["parameters"]["seed"] != args.seed:
+            print("\nWarning: the baseline was run at a different scale or seed", file=sys.stderr)
+        print(f"\nCompared with {baseline['environment'].get('commit')} ({args.compare}):")
+        print(f"{'benchmark':<44} {'before s':>9} {'after s':>9} {'speedup':>8} {'peak MB before/after':>21}")
+        for name, result in results.items():
+            before = baseline["results"].get(name)
+            if before is None:
+                continue
+            print(
+                f"{name:<44} {before['seconds']:>9.3f} {result['seconds']:>9.3f} "
+                f"{before['seconds'] / result['seconds']:>7.2f}x "
+                f"{before['peak_rss_mb']:>10.0f}/{result['peak_rss_mb']:<10.0f}"
+            )
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
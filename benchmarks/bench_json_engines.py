@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON -> Parquet ingestion engines.
+
+Runs ingest_json_to_parquet once per (engine, file) in a fresh worker process so
+that the peak RSS of one run cannot leak into the next, and reports per-file
+wall time and peak memory growth for each engine.
+
+Usage:
+    python benchmarks/bench_json_engines.py --input-dir data/landing/open_data/data/events --limit 20
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from football_pipeline.utils.constants import LANDING_OPEN_DATA_EVENTS_DIR, SUPPORTED_JSON_ENGINES
+
+
+def _run_once(engine: str, input_file: str, output_file: str) -> dict:
+    """Ingest one file in the current (fresh) process and measure it."""
+    # Import inside the worker so library start-up is not part of the peak
+    from football_pipeline.utils.dataframe import ingest_json_to_parquet
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    ingest_json_to_parquet(Path(input_file), Path(output_file), overwrite=True, engine=engine)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"seconds": elapsed, "peak_mb": (peak_kb - baseline_kb) / 1024}
+
+
+def _measure(engine: str, input_file: Path, output_dir: Path) -> dict:
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        output_file = output_dir / f"{engine}_{input_file.stem}.parquet"
+        return pool.apply(_run_once, (engine, str(input_file), str(output_file)))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input-dir", type=Path, default=LANDING_OPEN_DATA_EVENTS_DIR)
+    parser.add_argument("--pattern", default="*.json")
+    parser.add_argument("--limit", type=int, default=20, help="Number of files to benchmark (largest first)")
+    parser.add_argument("--engines", nargs="+", default=SUPPORTED_JSON_ENGINES, choices=SUPPORTED_JSON_ENGINES)
+    parser.add_argument("--json", type=Path, default=None, help="Also write raw results to this JSON file")
+    args = parser.parse_args()
+
+    files = sorted(args.input_dir.glob(args.pattern), key=lambda f: f.stat().st_size, reverse=True)[: args.limit]
+    if not files:
+        print(f"No files matching {args.pattern} in {args.input_dir}", file=sys.stderr)
+        return 1
+
+    results = {engine: [] for engine in args.engines}
+    with tempfile.TemporaryDirectory() as tmp:
+        for input_file in files:
+            size_mb = input_file.stat().st_size / 1024 / 1024
+            row = [f"{input_file.name:<28} {size_mb:7.2f} MB"]
+            for engine in args.engines:
+                result = _measure(engine, input_file, Path(tmp))
+                result["file"] = input_file.name
+                result["size_mb"] = size_mb
+                results[engine].append(result)
+                row.append(f"{engine}: {result['seconds'] * 1000:8.1f} ms {result['peak_mb']:7.1f} MB")
+            print(" | ".join(row))
+
+    print()
+    print(f"{'engine':<8} {'median ms/file':>15} {'mean ms/file':>13} {'median peak MB':>15} {'max peak MB':>12}")
+    for engine, rows in results.items():
+        seconds = [r["seconds"] * 1000 for r in rows]
+        peaks = [r["peak_mb"] for r in rows]
+        print(
+            f"{engine:<8} {statistics.median(seconds):>15.1f} {statistics.mean(seconds):>13.1f} "
+            f"{statistics.median(peaks):>15.1f} {max(peaks):>12.1f}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
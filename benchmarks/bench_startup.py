@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Check the start-up cost of the CLI against an import-time budget.
+
+Measures, in fresh interpreters (median of --repeat runs), the time on top of
+a bare ``python -c pass`` of:
+
+  help     football_pipeline --help
+  import   import football_pipeline.pipeline
+  no-op    an incremental bronze run with nothing to do (skip with --no-run)
+
+and which heavy libraries (pandas, Polars, pyarrow, scikit-learn, ...) ``help``
+and ``import`` load; neither may load any. Exits with 1 when a budget is
+exceeded, so it can run in CI or before a release.
+
+The no-op run first brings the bronze layer up to date with one untimed run;
+point it at a scratch copy with --data-dir (sets FOOTBALL_PIPELINE_DATA_DIR).
+Its logs and run reports go to a temporary directory.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --data-dir /mnt/nvme/football --source open_data
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES = ["pandas", "polars", "pyarrow", "numpy", "sklearn", "socceraction", "joblib"]
+# Milliseconds on top of interpreter start-up
+DEFAULT_BUDGETS_MS = {"help": 150, "import": 150, "no-op": 1500}
+
+PROBE = """
+import json, sys
+sys.argv = {argv!r}
+try:
+    {statement}
+except SystemExit:
+    pass
+print(json.dumps([m for m in {heavy!r} if m in sys.modules]), file=sys.stderr)
+"""
+
+
+def _time(args: list[str], env: dict, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _heavy_modules(argv: list[str], statement: str, env: dict) -> list[str]:
+    """Heavy libraries in sys.modules after running ``statement`` in a fresh interpreter."""
+    code = PROBE.format(argv=argv, statement=statement, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    return json.loads(result.stderr.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", default=None, help="Data directory of the no-op run")
+    parser.add_argument("--source", default="all", help="Source of the no-op run")
+    parser.add_argument("--no-run", action="store_true", help="Skip the no-op pipeline run")
+    for name, budget in DEFAULT_BUDGETS_MS.items():
+        parser.add_argument(f"--{name}-budget-ms", type=float, default=budget)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    logs_dir = tempfile.TemporaryDirectory(prefix="bench_startup_")
+    env["FOOTBALL_PIPELINE_LOGS_DIR"] = logs_dir.name
+    if args.data_dir:
+        env["FOOTBALL_PIPELINE_DATA_DIR"] = args.data_dir
+
+    python = [sys.executable]
+    baseline = _time(python + ["-c", "pass"], env, args.repeat)
+    commands = {
+        "help": python + ["-m", "football_pipeline.cli", "--help"],
+        "import": python + ["-c", "import football_pipeline.pipeline"],
+    }
+    heavy = {
+        "help": _heavy_modules(["football_pipeline", "--help"], "from football_pipeline.cli import main; main()", env),
+        "import": _heavy_modules([], "import football_pipeline.pipeline", env),
+    }
+    if not args.no_run:
+        commands["no-op"] = python + ["-m", "football_pipeline.cli", "--bronze", "--source", args.source]
+        # Bring the bronze layer up to date so the timed runs have nothing to do
+        subprocess.run(commands["no-op"], env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    print(f"interpreter start-up: {baseline:.0f} ms")
+    print(f"{'command':<8} {'total ms':>9} {'over python ms':>15} {'budget ms':>10}  heavy modules loaded")
+    failed = False
+    for name, command in commands.items():
+        total = _time(command, env, args.repeat)
+        over = total - baseline
+        budget = getattr(args, f"{name.replace('-', '_')}_budget_ms")
+        loaded = heavy.get(name, [])
+        ok = over <= budget and not loaded
+        failed |= not ok
+        print(
+            f"{name:<8} {total:>9.0f} {over:>15.0f} {budget:>10.0f}  "
+            f"{', '.join(loaded) if loaded else '-':<20} {'ok' if ok else 'OVER BUDGET'}"
+        )
+    logs_dir.cleanup()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Generate StatsBomb- and J1 League-shaped synthetic landing data.
+
+The output mirrors ``data/landing`` so any stage can run against it:
+
+    <output>/landing/open_data/data/competitions.json
+    <output>/landing/open_data/data/matches/<competition_id>/<season_id>.json
+    <output>/landing/open_data/data/{lineups,events,three-sixty}/<match_id>.json
+    <output>/landing/j1_league/sb-events/sb_events.json
+    <output>/landing/j1_league/sb-matches/sb_matches.json
+    <output>/landing/j1_league/hudl-physical/hudl_physical.json
+    <output>/landing/j1_league/mappings/{players,teams,matches}.csv
+
+Records follow the field layout of the schema registry (utils/schemas.py), with
+realistic event type mixes, nested type objects, 360 freeze frames and key
+passes linked to shots. Output is deterministic for a given seed and scale, so
+benchmark results are comparable across commits. Matches are written in
+parallel worker processes.
+
+Usage:
+    python benchmarks/synthetic_data.py --matches 100 --output /tmp/football_synthetic
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import random
+import sys
+import uuid
+from pathlib import Path
+
+# Matches per competition season, as in a 20-team league
+MATCHES_PER_SEASON = 380
+FIRST_MATCH_ID = 100_000
+FIRST_COMPETITION_ID = 1000
+
+# (type id, type name, share of events) - roughly the mix of a real StatsBomb match
+EVENT_TYPES = [
+    (30, "Pass", 0.29),
+    (42, "Ball Receipt*", 0.27),
+    (43, "Carry", 0.23),
+    (17, "Pressure", 0.08),
+    (4, "Duel", 0.02),
+    (2, "Ball Recovery", 0.02),
+    (9, "Clearance", 0.015),
+    (14, "Dribble", 0.01),
+    (10, "Interception", 0.005),
+    (22, "Foul Committed", 0.01),
+    (21, "Foul Won", 0.01),
+    (16, "Shot", 0.01),
+    (23, "Goal Keeper", 0.01),
+    (38, "Miscontrol", 0.01),
+]
+POSITIONS = [
+    (1, "Goalkeeper"), (2, "Right Back"), (3, "Right Center Back"), (5, "Left Center Back"),
+    (6, "Left Back"), (10, "Center Defensive Midfield"), (13, "Right Center Midfield"),
+    (15, "Left Center Midfield"), (17, "Right Wing"), (21, "Left Wing"), (23, "Center Forward"),
+]
+PLAY_PATTERNS = [(1, "Regular Play"), (4, "From Throw In"), (3, "From Free Kick"), (2, "From Corner"), (9, "From Keeper")]
+BODY_PARTS = [(40, "Right Foot"), (38, "Left Foot"), (37, "Head")]
+PASS_HEIGHTS = [(1, "Ground Pass"), (2, "Low Pass"), (3, "High Pass")]
+SHOT_OUTCOMES = [(100, "Saved"), (98, "Off T"), (96, "Blocked"), (97, "Goal"), (101, "Wayward")]
+PHYSICAL_PHASES = ["1st Half", "2nd Half"]
+
+
+def _named(pair: tuple) -> dict:
+    return {"id": pair[0], "name": pair[1]}
+
+
+def _location(rng: random.Random) -> list[float]:
+    return [round(rng.uniform(0, 120), 1), round(rng.uniform(0, 80), 1)]
+
+
+def _team_ids(match_id: int) -> tuple[int, int]:
+    # 20 teams per competition, paired deterministically from the match id
+    home = 100 + match_id % 20
+    away = 100 + (match_id // 20 + match_id % 20 + 1) % 20
+    return home, away if away != home else 100 + (home - 99) % 20
+
+
+def _players(team_id: int) -> list[dict]:
+    return [
+        {"id": team_id * 100 + i, "name": f"Player {team_id}-{i}", "jersey_number": i + 1, "position": POSITIONS[i]}
+        for i in range(11)
+    ]
+
+
+def competition_records(n_matches: int) -> list[tuple[int, int, int]]:
+    """(competition_id, season_id, number of matches) for every competition season."""
+    seasons = []
+    remaining, index = n_matches, 0
+    while remaining > 0:
+        count = min(MATCHES_PER_SEASON, remaining)
+        # Two seasons per competition
+        seasons.append((FIRST_COMPETITION_ID + index // 2, 1 + index % 2, count))
+        remaining -= count
+        index += 1
+    return seasons
+
+
+def _event(rng, index, minute, second, period, type_pair, team, player, possession) -> dict:
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "index": index,
+        "period": period,
+        "timestamp": f"00:{minute % 45:02d}:{second:02d}.{rng.randrange(1000):03d}",
+        "minute": minute,
+        "second": second,
+        "type": _named(type_pair),
+        "possession": possession,
+        "possession_team": {"id": team["id"], "name": team["name"]},
+        "play_pattern": _named(rng.choice(PLAY_PATTERNS)),
+        "team": {"id": team["id"], "name": team["name"]},
+        "player": {"id": player["id"], "name": player["name"]},
+        "position": _named(player["position"]),
+        "location": _location(rng),
+        "duration": round(rng.uniform(0, 2.5), 6),
+        "related_events": [],
+    }
+
+
+def _add_type_object(rng: random.Random, event: dict, type_name: str, players: list[dict]):
+    """Attach the type-specific object (and occasional flags) of an event."""
+    if rng.random() < 0.2:
+        event["under_pressure"] = True
+    if type_name == "Pass":
+        recipient = rng.choice(players)
+        event["pass"] = {
+            "recipient": {"id": recipient["id"], "name": recipient["name"]},
+            "length": round(rng.uniform(2, 60), 2),
+            "angle": round(rng.uniform(-3.14, 3.14), 4),
+            "height": _named(rng.choice(PASS_HEIGHTS)),
+            "end_location": _location(rng),
+            "body_part": _named(rng.choice(BODY_PARTS)),
+        }
+        if rng.random() < 0.05:
+            event["pass"]["cross"] = True
+        if rng.random() < 0.15:
+            event["pass"]["outcome"] = {"id": 9, "name": "Incomplete"}
+    elif type_name == "Carry":
+        event["carry"] = {"end_location": _location(rng)}
+    elif type_name == "Duel":
+        event["duel"] = {"type": {"id": 11, "name": "Tackle"}, "outcome": {"id": 4, "name": "Won"}}
+    elif type_name == "Pressure" and rng.random() < 0.3:
+        event["counterpress"] = True
+    elif type_name == "Ball Recovery" and rng.random() < 0.1:
+        event["ball_recovery"] = {"recovery_failure": True}
+    elif type_name == "Clearance":
+        event["clearance"] = {"body_part": _named(rng.choice(BODY_PARTS))}
+    elif type_name == "Dribble":
+        event["dribble"] = {"outcome": {"id": 8, "name": "Complete"} if rng.random() < 0.6 else {"id": 9, "name": "Incomplete"}}
+    elif type_name == "Interception":
+        event["interception"] = {"outcome": {"id": 4, "name": "Won"}}
+    elif type_name == "Foul Committed" and rng.random() < 0.15:
+        event["foul_committed"] = {"card": {"id": 7, "name": "Yellow Card"}}
+    elif type_name == "Goal Keeper":
+        event["goalkeeper"] = {"type": {"id": 33, "name": "Shot Saved"}, "outcome": {"id": 15, "name": "Success"}}
+    elif type_name == "Shot":
+        event["location"] = [round(rng.uniform(90, 119), 1), round(rng.uniform(20, 60), 1)]
+        event["shot"] = {
+            "statsbomb_xg": round(rng.betavariate(1.2, 9), 6),
+            "end_location": [120.0, round(rng.uniform(34, 46), 1), round(rng.uniform(0, 3), 1)],
+            "outcome": _named(rng.choice(SHOT_OUTCOMES)),
+            "type": {"id": 87, "name": "Open Play"},
+            "body_part": _named(rng.choice(BODY_PARTS)),
+            "technique": {"id": 93, "name": "Normal"},
+            "freeze_frame": [
+                {
+                    "location": [round(rng.uniform(80, 120), 1), round(rng.uniform(10, 70), 1)],
+                    "player": {"id": p["id"], "name": p["name"]},
+                    "position": _named(p["position"]),
+                    "teammate": i < 5,
+                }
+                for i, p in enumerate(rng.sample(players, 8))
+            ],
+        }
+        if rng.random() < 0.2:
+            event["shot"]["first_time"] = True
+
+
+def match_events(match_id: int, n_events: int, seed: int) -> list[dict]:
+    """
+    Generate one match's events: two Starting XI events, then a realistic type mix.
+
+    Args:
+        match_id (int): The match id (also seeds the generator).
+        n_events (int): Number of events in the match.
+        seed (int): Global seed.
+
+    Returns:
+        list[dict]: StatsBomb-shaped events in index order.
+    """
+    rng = random.Random(seed * 1_000_003 + match_id)
+    home_id, away_id = _team_ids(match_id)
+    teams = [{"id": t, "name": f"Team {t}", "players": _players(t)} for t in (home_id, away_id)]
+    events = []
+    for team in teams:
+        events.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "index": len(events) + 1,
+            "period": 1,
+            "timestamp": "00:00:00.000",
+            "minute": 0,
+            "second": 0,
+            "type": {"id": 35, "name": "Starting XI"},
+            "possession": 1,
+            "possession_team": {"id": teams[0]["id"], "name": teams[0]["name"]},
+            "play_pattern": {"id": 1, "name": "Regular Play"},
+            "team": {"id": team["id"], "name": team["name"]},
+            "duration": 0.0,
+            "tactics": {
+                "formation": 433,
+                "lineup": [
+                    {"player": {"id": p["id"], "name": p["name"]}, "position": _named(p["position"]),
+                     "jersey_number": p["jersey_number"]}
+                    for p in team["players"]
+                ],
+            },
+        })
+
+    types = [(t[0], t[1]) for t in EVENT_TYPES]
+    weights = [t[2] for t in EVENT_TYPES]
+    possession, team = 1, teams[0]
+    last_pass = None
+    for i in range(max(0, n_events - len(events))):
+        if rng.random() < 0.08:
+            possession += 1
+            team = teams[possession % 2]
+        seconds = int(i * 5400 / max(1, n_events))
+        period = 1 if seconds < 2700 else 2
+        type_pair = rng.choices(types, weights)[0]
+        player = rng.choice(team["players"])
+        event = _event(rng, len(events) + 1, seconds // 60, seconds % 60, period, type_pair, team, player, possession)
+        _add_type_object(rng, event, type_pair[1], teams[(possession + 1) % 2]["players"] + team["players"])
+        if type_pair[1] == "Pass":
+            last_pass = event
+        elif type_pair[1] == "Shot" and last_pass is not None and last_pass["team"]["id"] == team["id"]:
+            event["shot"]["key_pass_id"] = last_pass["id"]
+            last_pass["pass"]["shot_assist"] = True
+            last_pass["pass"]["assisted_shot_id"] = event["id"]
+        events.append(event)
+    return events
+
+
+def match_three_sixty(events: list[dict], seed: int, share: float = 0.85) -> list[dict]:
+    """360 frames (visible area and visible players) for a share of a match's events."""
+    rng = random.Random(seed + len(events))
+    frames = []
+    for event in events:
+        if "location" not in event or rng.random() > share:
+            continue
+        x, y = event["location"]
+        players = [{"teammate": False, "actor": True, "keeper": False, "location": [x, y]}]
+        for i in range(rng.randint(6, 16)):
+            players.append({
+                "teammate": i % 2 == 0,
+                "actor": False,
+                "keeper": i == 1 and rng.random() < 0.3,
+                "location": [round(rng.uniform(max(0, x - 40), min(120, x + 40)), 2), round(rng.uniform(0, 80), 2)],
+            })
+        left, right = max(0.0, x - 45), min(120.0, x + 45)
+        frames.append({
+            "event_uuid": event["id"],
+            "visible_area": [left, 0.0, right, 0.0, right, 80.0, left, 80.0, left, 0.0],
+            "freeze_frame": players,
+        })
+    return frames
+
+
+def match_lineups(match_id: int) -> list[dict]:
+    """One lineup record per team with 11 starters and 5 substitutes."""
+    lineups = []
+    for team_id in _team_ids(match_id):
+        players = []
+        for i in range(16):
+            position = POSITIONS[i % len(POSITIONS)]
+            players.append({
+                "player_id": team_id * 100 + i,
+                "player_name": f"Player {team_id}-{i}",
+                "player_nickname": None,
+                "jersey_number": i + 1,
+                "country": {"id": 1, "name": "Synthetic"},
+                "cards": [{"time": "63:12", "card_type": "Yellow Card", "reason": "Foul Committed", "period": 2}] if i == 4 else [],
+                "positions": [] if i >= 11 else [{
+                    "position_id": position[0],
+                    "position": position[1],
+                    "from": "00:00",
+                    "to": None,
+                    "from_period": 1,
+                    "to_period": None,
+                    "start_reason": "Starting XI",
+                    "end_reason": "Final Whistle",
+                }],
+            })
+        lineups.append({"team_id": team_id, "team_name": f"Team {team_id}", "lineup": players})
+    return lineups
+
+
+def match_record(match_id: int, competition_id: int, season_id: int, week: int, has_360: bool) -> dict:
+    home_id, away_id = _team_ids(match_id)
+    country = {"id": 1, "name": "Synthetic"}
+    return {
+        "match_id": match_id,
+        "match_date": f"20{10 + season_id:02d}-{1 + week % 12:02d}-{1 + week % 28:02d}",
+        "kick_off": "20:00:00.000",
+        "competition": {"competition_id": competition_id, "country_name": "Synthetic", "competition_name": f"League {competition_id}"},
+        "season": {"season_id": season_id, "season_name": f"20{10 + season_id}/20{11 + season_id}"},
+        "home_team": {"home_team_id": home_id, "home_team_name": f"Team {home_id}", "home_team_gender": "male",
+                      "home_team_group": None, "country": country,
+                      "managers": [{"id": home_id, "name": f"Manager {home_id}", "nickname": None, "dob": None, "country": country}]},
+        "away_team": {"away_team_id": away_id, "away_team_name": f"Team {away_id}", "away_team_gender": "male",
+                      "away_team_group": None, "country": country,
+                      "managers": [{"id": away_id, "name": f"Manager {away_id}", "nickname": None, "dob": None, "country": country}]},
+        "home_score": match_id % 4,
+        "away_score": match_id % 3,
+        "match_status": "available",
+        "match_status_360": "available" if has_360 else "unscheduled",
+        "last_updated": "2024-01-01T00:00:00",
+        "last_updated_360": None,
+        "metadata": {"data_version": "1.1.0", "shot_fidelity_version": "2", "xy_fidelity_version": "2"},
+        "match_week": week,
+        "competition_stage": {"id": 1, "name": "Regular Season"},
+        "stadium": {"id": home_id, "name": f"Stadium {home_id}", "country": country},
+        "referee": {"id": 1, "name": "Referee", "country": country},
+    }
+
+
+def _write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+def _write_match(task: tuple) -> int:
+    """Worker: write one match's events, lineups and (optionally) 360 frames; returns the event count."""
+    data_dir, match_id, n_events, has_360, seed = task
+    data_dir = Path(data_dir)
+    events = match_events(match_id, n_events, seed)
+    _write_json(data_dir / "events" / f"{match_id}.json", events)
+    _write_json(data_dir / "lineups" / f"{match_id}.json", match_lineups(match_id))
+    if has_360:
+        _write_json(data_dir / "three-sixty" / f"{match_id}.json", match_three_sixty(events, seed))
+    return len(events)
+
+
+def generate_open_data(
+    output: Path,
+    n_matches: int,
+    events_per_match: int = 3500,
+    three_sixty_share: float = 0.5,
+    seed: int = 0,
+    workers: int | None = None,
+) -> Path:
+    """
+    Write StatsBomb open-data shaped landing files.
+
+    Args:
+        output (Path): Root of the synthetic data (landing/ is created inside).
+        n_matches (int): Number of matches.
+        events_per_match (int, optional): Events per match. Defaults to 3500 (a real match).
+        three_sixty_share (float, optional): Share of matches with 360 data. Defaults to 0.5.
+        seed (int, optional): Seed. Defaults to 0.
+        workers (int, optional): Worker processes. Defaults to one per CPU.
+
+    Returns:
+        Path: The open_data landing directory.
+    """
+    data_dir = output / "landing" / "open_data" / "data"
+    rng = random.Random(seed)
+    competitions, tasks = [], []
+    match_id = FIRST_MATCH_ID
+    for competition_id, season_id, count in competition_records(n_matches):
+        # The first season always has 360 data, so small scales cover every dataset
+        has_360 = not competitions or rng.random() < three_sixty_share
+        competitions.append({
+            "competition_id": competition_id,
+            "season_id": season_id,
+            "country_name": "Synthetic",
+            "competition_name": f"League {competition_id}",
+            "competition_gender": "male",
+            "competition_youth": False,
+            "competition_international": False,
+            "season_name": f"20{10 + season_id}/20{11 + season_id}",
+            "match_updated": "2024-01-01T00:00:00",
+            "match_updated_360": "2024-01-01T00:00:00" if has_360 else None,
+            "match_available_360": "2024-01-01T00:00:00" if has_360 else None,
+            "match_available": "2024-01-01T00:00:00",
+        })
+        matches = []
+        for i in range(count):
+            matches.append(match_record(match_id, competition_id, season_id, 1 + i // 10, has_360))
+            tasks.append((str(data_dir), match_id, events_per_match, has_360, seed))
+            match_id += 1
+        _write_json(data_dir / "matches" / str(competition_id) / f"{season_id}.json", matches)
+    _write_json(data_dir / "competitions.json", competitions)
+
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers) as pool:
+        for _ in pool.imap_unordered(_write_match, tasks, chunksize=max(1, len(tasks) // 64)):
+            pass
+    return data_dir
+
+
+def generate_j1_league(output: Path, n_matches: int, events_per_match: int = 3500, seed: int = 0) -> Path:
+    """
+    Write J1 League shaped landing files (single season-sized JSON arrays and mapping CSVs).
+
+    Args:
+        output (Path): Root of the synthetic data (landing/ is created inside).
+        n_matches (int): Number of matches in the season.
+        events_per_match (int, optional): Events per match. Defaults to 3500.
+        seed (int, optional): Seed. Defaults to 0.
+
+    Returns:
+        Path: The j1_league landing directory.
+    """
+    j1_dir = output / "landing" / "j1_league"
+    rng = random.Random(seed)
+    match_ids = [FIRST_MATCH_ID * 10 + i for i in range(n_matches)]
+
+    # The events file is written incrementally, like the season-sized files we receive
+    events_file = j1_dir / "sb-events" / "sb_events.json"
+    events_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(events_file, "w") as f:
+        f.write("[")
+        first = True
+        for match_id in match_ids:
+            for event in match_events(match_id, events_per_match, seed):
+                f.write(("" if first else ",") + json.dumps(event))
+                first = False
+        f.write("]")
+
+    _write_json(
+        j1_dir / "sb-matches" / "sb_matches.json",
+        [match_record(m, 2001, 1, 1 + i // 9, False) for i, m in enumerate(match_ids)],
+    )
+
+    physical = []
+    for match_id in match_ids:
+        for team_id in _team_ids(match_id):
+            for player in _players(team_id):
+                for phase in PHYSICAL_PHASES:
+                    minutes = round(rng.uniform(30, 47), 1)
+                    physical.append({
+                        "match_id": match_id,
+                        "team_id": team_id,
+                        "team_name": f"Team {team_id}",
+                        "player_id": player["id"],
+                        "player_name": player["name"],
+                        "position": player["position"][1],
+                        "phase": phase,
+                        "minutes_played": minutes,
+                        "total_distance": round(minutes * rng.uniform(95, 125), 1),
+                        "high_speed_running_distance": round(minutes * rng.uniform(5, 15), 1),
+                        "sprint_distance": round(minutes * rng.uniform(1, 6), 1),
+                        "sprint_count": rng.randint(2, 25),
+                        "max_speed": round(rng.uniform(26, 35), 2),
+                    })
+    _write_json(j1_dir / "hudl-physical" / "hudl_physical.json", physical)
+
+    mappings_dir = j1_dir / "mappings"
+    mappings_dir.mkdir(parents=True, exist_ok=True)
+    team_ids = sorted({t for m in match_ids for t in _team_ids(m)})
+    tables = {
+        "teams.csv": (["statsbomb_team_id", "hudl_team_id", "team_name"],
+                      [[t, 50_000 + t, f"Team {t}"] for t in team_ids]),
+        "players.csv": (["statsbomb_player_id", "hudl_player_id", "player_name", "team_id"],
+                        [[p["id"], 900_000 + p["id"], p["name"], t] for t in team_ids for p in _players(t)]),
+        "matches.csv": (["statsbomb_match_id", "hudl_match_id", "match_date"],
+                        [[m, 70_000 + i, f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}"] for i, m in enumerate(match_ids)]),
+    }
+    for name, (header, rows) in tables.items():
+        with open(mappings_dir / name, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+    return j1_dir
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, required=True, help="Root directory (landing/ is created inside)")
+    parser.add_argument("--matches", type=int, default=100, help="Number of open-data matches (10 to 10,000)")
+    parser.add_argument("--events-per-match", type=int, default=3500)
+    parser.add_argument("--three-sixty-share", type=float, default=0.5, help="Share of seasons with 360 data")
+    parser.add_argument("--j1-matches", type=int, default=None, help="J1 League matches (default: --matches / 10)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    generate_open_data(args.output, args.matches, args.events_per_match, args.three_sixty_share, args.seed, args.workers)
+    j1_matches = args.j1_matches if args.j1_matches is not None else max(1, args.matches // 10)
+    generate_j1_league(args.output, j1_matches, args.events_per_match, args.seed)
+    print(f"Wrote {args.matches} open-data and {j1_matches} J1 League matches to {args.output / 'landing'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,6 @@
-import polars as pl
-from football_pipeline.utils.constants import DATA_DIR, LOGS_DIR
+from football_pipeline.config import PipelineConfig
+from football_pipeline.utils.constants import DATA_DIR
 from football_pipeline.utils.dataframe import ingest_json_to_parquet, ingest_csv_batch_to_parquet
-from football_pipeline.utils.logging import setup_logger
 
 # Simple helper to get j1_league paths
 def _get_paths():
@@ -22,46 +21,62 @@ def _get_paths():
         "bronze_mappings": base["bronze"] / "mappings",
     }
 
-def ingest_j1_league_events(logger):
+def ingest_j1_league_events(logger, config: PipelineConfig | None = None):
     """
     Ingest J1 League events from the landing directory into the bronze layer.
     """
+    config = config or PipelineConfig()
     p = _get_paths()
     ingest_json_to_parquet(
         p["landing_sb_events"] / "sb_events.json",
         p["bronze_events"] / "sb_events.parquet",
         logger,
         description="events",
+        engine=config.engine,
+        overwrite=config.force,
+        max_memory_mb=config.max_memory_mb,
+        schema="j1_events",
     )
 
-def ingest_j1_league_matches(logger):
+def ingest_j1_league_matches(logger, config: PipelineConfig | None = None):
     """
     Ingest J1 League matches from the landing directory into the bronze layer.
     """
+    config = config or PipelineConfig()
     p = _get_paths()
     ingest_json_to_parquet(
         p["landing_sb_matches"] / "sb_matches.json",
         p["bronze_matches"] / "sb_matches.parquet",
         logger,
         description="matches",
+        engine=config.engine,
+        overwrite=config.force,
+        max_memory_mb=config.max_memory_mb,
+        schema="j1_matches",
     )
 
-def ingest_j1_league_physical(logger):
+def ingest_j1_league_physical(logger, config: PipelineConfig | None = None):
     """
     Ingest J1 League physical data from the landing directory into the bronze layer.
     """
+    config = config or PipelineConfig()
     p = _get_paths()
     ingest_json_to_parquet(
         p["landing_hudl_physical"] / "hudl_physical.json",
         p["bronze_physical"] / "hudl_physical.parquet",
         logger,
-        description="physical"
+        description="physical",
+        engine=config.engine,
+        overwrite=config.force,
+        max_memory_mb=config.max_memory_mb,
+        schema="j1_physical",
     )
 
-def ingest_j1_league_mappings(logger):
+def ingest_j1_league_mappings(logger, config: PipelineConfig | None = None):
     """
     Ingest all CSV mapping files in the J1 League mappings directory.
     """
+    config = config or PipelineConfig()
     logger.info("Starting J1 League mappings ingestion...")
     p = _get_paths()
     mappings_dir = p["landing_mappings"]
@@ -72,41 +87,26 @@ def ingest_j1_league_mappings(logger):
         logger=logger,
         description="mapping",
         log_frequency=1,
+        # One file at a time: each read already uses every core
+        workers=1,
+        overwrite=config.force,
     )
 
-def j1_league_ingest(logger=None):
+def j1_league_ingest(logger=None, *, config: PipelineConfig | None = None):
     """
     Main function to ingest all J1 League bronze layer data.
-    
+
+    The bronze stages and their dependencies are declared once, in
+    football_pipeline.pipeline; this runs them for j1_league.
+
     Args:
-        logger: Optional logger to use. If None, creates a new one.
+        logger: Accepted for existing callers and not used: the stages log to the
+            pipeline's own logs (logs/open_data/pipeline.log and the per-stage logs).
+        config: Optional run options (workers, engine, ...). If None, uses defaults.
     """
-    if logger is None:
-        # Setup logger only when this function is called
-        log_path = LOGS_DIR / "j1_league" / "bronze" / "j1_league_bronze.log"
-        logger = setup_logger(log_path, "j1_league_bronze")
-    
-    logger.info("Starting J1 League bronze layer ingestion...")
-    
-    # Ensure all necessary directories exist
-    # Directories are created by the pipeline
-    
-    # Configure Polars for better performance
-    pl.Config.set_tbl_rows(0)
-    pl.Config.set_tbl_cols(0)
-    
-    try:
-        # Ingest all data types
-        ingest_j1_league_matches(logger)
-        ingest_j1_league_events(logger)
-        ingest_j1_league_physical(logger)
-        ingest_j1_league_mappings(logger)
-        
-        logger.info("J1 League bronze layer ingestion completed successfully!")
-        
-    except Exception as e:
-        logger.error(f"Error during J1 League bronze layer ingestion: {e}")
-        raise
+    from football_pipeline.pipeline import run_bronze_layer
+
+    return run_bronze_layer("j1_league", config=config)
 
 if __name__ == "__main__":
     j1_league_ingest() 
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Compaction of the per-match bronze open_data files into partitioned datasets.
+
+Bronze writes one small Parquet file per match, which makes whole-dataset scans
+pay for thousands of file opens and footer reads. This stage rewrites events,
+lineups and three-sixty into one Hive-partitioned dataset each:
+
+    bronze/open_data/compacted/<dataset>/competition_id=<id>/season_id=<id>/part-0.parquet
+
+Rows are sorted by match_id so row-group statistics let single-match reads skip
+most of a partition. A partition is only rewritten when the set of bronze files
+behind it (or their size/mtime) changed, so reruns after a few new matches only
+touch the affected competition/season. The per-partition inputs are tracked in
+``compacted/_<dataset>_compaction_state.json``.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+import polars as pl
+
+from football_pipeline.utils.logging import NullLogger
+from football_pipeline.utils.metrics import measure_file
+
+# Bronze dataset name -> (bronze path key, per-match file prefix)
+COMPACTED_DATASETS = {
+    "events": ("bronze_events", "events"),
+    "lineups": ("bronze_lineups", "lineups"),
+    "three-sixty": ("bronze_three_sixty_events", "events_three_sixty"),
+}
+
+# ~30 matches of events per row group: large enough for efficient scans, small
+# enough that a single-match filter reads one row group
+ROW_GROUP_SIZE = 100_000
+
+PARTITION_FILENAME = "part-0.parquet"
+
+
+def load_match_partitions(matches_dir: Path) -> pl.DataFrame:
+    """
+    Map every match to its competition and season using the bronze matches tables.
+
+    Args:
+        matches_dir (Path): The bronze matches directory.
+
+    Returns:
+        pl.DataFrame: Columns match_id, competition_id, season_id (one row per match).
+    """
+    files = sorted(matches_dir.glob("matches_*.parquet"))
+    if not files:
+        return pl.DataFrame(schema={"match_id": pl.Int64, "competition_id": pl.Int64, "season_id": pl.Int64})
+    frames = [
+        pl.scan_parquet(f).select(
+            pl.col("match_id").cast(pl.Int64),
+            pl.col("competition_competition_id").cast(pl.Int64).alias("competition_id"),
+            pl.col("season_season_id").cast(pl.Int64).alias("season_id"),
+        )
+        for f in files
+    ]
+    return pl.concat(frames).unique("match_id").collect()
+
+
+def _match_files(bronze_dir: Path, prefix: str) -> dict[int, Path]:
+    """Find per-match bronze files and key them by the match id in their name."""
+    pattern = re.compile(rf"^{re.escape(prefix)}_(\d+)\.parquet$")
+    files = {}
+    for f in bronze_dir.glob(f"{prefix}_*.parquet"):
+        match = pattern.match(f.name)
+        if match:
+            files[int(match.group(1))] = f
+    return files
+
+
+def _partition_inputs(files: list[Path]) -> dict[str, list[int]]:
+    """Stat-based fingerprint of the bronze files behind one partition."""
+    inputs = {}
+    for f in sorted(files):
+        stat = f.stat()
+        inputs[f.name] = [stat.st_size, stat.st_mtime_ns]
+    return inputs
+
+
+def _write_partition(files: dict[int, Path], output_file: Path):
+    """Rewrite one partition from its per-match files in a single streaming query."""
+    frames = [
+        pl.scan_parquet(f).with_columns(pl.lit(match_id, dtype=pl.Int64).alias("match_id"))
+        for match_id, f in files.items()
+    ]
+    # Per-match files may differ in columns/dtypes, so align them by name
+    query = pl.concat(frames, how="diagonal_relaxed").sort("match_id", maintain_order=True)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output_file.with_suffix(".parquet.tmp")
+    query.sink_parquet(tmp_file, compression="zstd", row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp_file, output_file)
+
+
+def compact_dataset(
+    dataset: str,
+    bronze_dir: Path,
+    prefix: str,
+    output_dir: Path,
+    match_partitions: pl.DataFrame,
+    logger=None,
+    overwrite: bool = False,
+):
+    """
+    Compact one per-match bronze dataset into a competition/season partitioned dataset.
+
+    Args:
+        dataset (str): The dataset name, for logging.
+        bronze_dir (Path): Directory with the per-match bronze files.
+        prefix (str): The per-match file prefix (e.g. "events").
+        output_dir (Path): The compacted dataset directory.
+        match_partitions (pl.DataFrame): match_id -> competition_id/season_id mapping.
+        logger (Logger, optional): The logger to use. Defaults to None.
+        overwrite (bool, optional): Rewrite every partition. Defaults to False.
+
+    Returns:
+        tuple: (rewritten_count, skipped_count, error_count) partitions.
+    """
+    if logger is None:
+        logger = NullLogger()
+    match_files = _match_files(bronze_dir, prefix)
+    if not match_files:
+        logger.warning(f"No {dataset} files found in {bronze_dir}, nothing to compact.")
+        return 0, 0, 0
+
+    partition_of = {
+        row["match_id"]: (row["competition_id"], row["season_id"])
+        for row in match_partitions.iter_rows(named=True)
+    }
+    partitions: dict[tuple[int, int], dict[int, Path]] = {}
+    unmapped = []
+    for match_id, f in match_files.items():
+        key = partition_of.get(match_id)
+        if key is None:
+            unmapped.append(match_id)
+            continue
+        partitions.setdefault(key, {})[match_id] = f
+    if unmapped:
+        logger.warning(f"{len(unmapped)} {dataset} files have no entry in the matches tables and were not compacted.")
+
+    # Kept beside (not inside) the dataset so the directory can be scanned as-is
+    state_file = output_dir.parent / f"_{output_dir.name}_compaction_state.json"
+    state = json.loads(state_file.read_text()) if state_file.exists() and not overwrite else {}
+    new_state = {}
+    rewritten_count = skipped_count = error_count = 0
+    for (competition_id, season_id), files in sorted(partitions.items()):
+        partition = f"competition_id={competition_id}/season_id={season_id}"
+        output_file = output_dir / partition / PARTITION_FILENAME
+        inputs = _partition_inputs(list(files.values()))
+        if state.get(partition) == inputs and output_file.exists():
+            new_state[partition] = inputs
+            skipped_count += 1
+            continue
+        try:
+            with measure_file(list(files.values()), output_file):
+                _write_partition(files, output_file)
+            new_state[partition] = inputs
+            rewritten_count += 1
+            logger.debug("Compacted %d %s files into %s", len(files), dataset, partition)
+        except Exception as e:
+            logger.error(f"Failed to compact {dataset} partition {partition}: {e}")
+            error_count += 1
+
+    # Drop partitions whose matches no longer exist in bronze
+    current_partitions = {f"competition_id={c}/season_id={s}" for c, s in partitions}
+    for partition in set(state) - current_partitions:
+        (output_dir / partition / PARTITION_FILENAME).unlink(missing_ok=True)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    state_file.write_text(json.dumps(new_state, indent=1, sort_keys=True))
+    logger.info(
+        f"{dataset.title()} compaction complete: {rewritten_count} partitions rewritten, "
+        f"{skipped_count} unchanged, {error_count} errors"
+    )
+    return rewritten_count, skipped_count, error_count
+
+
+def compact_open_data(paths: dict, logger=None, overwrite: bool = False, datasets: list[str] | None = None):
+    """
+    Compact the per-match open_data bronze datasets (events, lineups, three-sixty).
+
+    Args:
+        paths (dict): The open_data paths from bronze.open_data.ingest._get_paths.
+        logger (Logger, optional): The logger to use. Defaults to None.
+        overwrite (bool, optional): Rewrite every partition. Defaults to False.
+        datasets (list[str], optional): Only compact these datasets. Defaults to None (all).
+
+    Raises:
+        RuntimeError: When a partition could not be written. Its previous file is
+            still on disk, so the stage must fail rather than let the match index
+            and catalog serve it as current.
+    """
+    if logger is None:
+        logger = NullLogger()
+    logger.info("Starting open_data bronze compaction...")
+    match_partitions = load_match_partitions(paths["bronze_matches"])
+    failed = []
+    for dataset, (path_key, prefix) in COMPACTED_DATASETS.items():
+        if datasets is not None and dataset not in datasets:
+            continue
+        _, _, error_count = compact_dataset(
+            dataset,
+            paths[path_key],
+            prefix,
+            paths["bronze_compacted"] / dataset,
+            match_partitions,
+            logger=logger,
+            overwrite=overwrite,
+        )
+        if error_count:
+            failed.append(f"{dataset} ({error_count} partitions)")
+    if failed:
+        raise RuntimeError(f"Compaction failed for {', '.join(failed)}; they are retried on the next run")
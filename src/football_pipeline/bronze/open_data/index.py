@@ -0,0 +1,154 @@
+"""
+Match-level index of the bronze open_data files.
+
+Written at the end of bronze ingestion to ``bronze/open_data/_match_index.parquet``
+with one row per dataset and match:
+
+    dataset, match_id, competition_id, season_id, file, compacted_file, row_groups
+
+``file`` is the per-match bronze file (for dataset "matches", the
+competition/season matches table), ``compacted_file`` the compacted partition
+holding the match and ``row_groups`` the row groups of that partition whose
+match_id statistics cover it. Paths are relative to the index's directory.
+
+Building it only lists file names and reads the footers of the compacted
+partitions, so it is cheap to rebuild on every run. The catalog
+(football_pipeline/catalog.py) uses it to open only the files a query needs.
+"""
+
+import os
+from pathlib import Path
+
+import polars as pl
+import pyarrow.parquet as pq
+
+from football_pipeline.bronze.open_data.compact import COMPACTED_DATASETS, PARTITION_FILENAME, _match_files
+from football_pipeline.utils.logging import NullLogger
+
+INDEX_SCHEMA = {
+    "dataset": pl.String,
+    "match_id": pl.Int64,
+    "competition_id": pl.Int64,
+    "season_id": pl.Int64,
+    "file": pl.String,
+    "compacted_file": pl.String,
+    "row_groups": pl.List(pl.Int32),
+}
+
+
+def _relative(path: Path, root: Path) -> str:
+    return Path(os.path.relpath(path, root)).as_posix()
+
+
+def _row_groups_by_match(partition_file: Path, match_ids: list[int]) -> dict[int, list[int]]:
+    """
+    Row groups of a compacted partition that may hold each match, from the footer statistics.
+
+    Args:
+        partition_file (Path): The compacted partition file.
+        match_ids (list[int]): The matches compacted into it.
+
+    Returns:
+        dict: match_id -> row group numbers.
+    """
+    parquet_file = pq.ParquetFile(partition_file)
+    metadata = parquet_file.metadata
+    row_groups = {match_id: [] for match_id in match_ids}
+    if metadata.num_row_groups == 0:
+        return row_groups
+    first = metadata.row_group(0)
+    column = next(j for j in range(first.num_columns) if first.column(j).path_in_schema == "match_id")
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(column).statistics
+        if stats is not None and stats.has_min_max:
+            present = [m for m in match_ids if stats.min <= m <= stats.max]
+        else:
+            present = parquet_file.read_row_group(i, columns=["match_id"]).column(0).unique().to_pylist()
+        for match_id in present:
+            if match_id in row_groups:
+                row_groups[match_id].append(i)
+    return row_groups
+
+
+def build_match_index(paths: dict, root: Path) -> pl.DataFrame:
+    """
+    Build the match index of the bronze open_data datasets.
+
+    Args:
+        paths (dict): The open_data paths from bronze.open_data.ingest._get_paths.
+        root (Path): Directory the stored paths are relative to.
+
+    Returns:
+        pl.DataFrame: One row per dataset and match, columns INDEX_SCHEMA.
+    """
+    rows = []
+    matches_files = sorted(paths["bronze_matches"].glob("matches_*.parquet"))
+    if matches_files:
+        matches = pl.scan_parquet(matches_files, include_file_paths="file").select(
+            pl.col("match_id").cast(pl.Int64),
+            pl.col("competition_competition_id").cast(pl.Int64).alias("competition_id"),
+            pl.col("season_season_id").cast(pl.Int64).alias("season_id"),
+            "file",
+        ).unique("match_id", keep="last").sort("match_id").collect()
+    else:
+        matches = pl.DataFrame(schema={k: INDEX_SCHEMA[k] for k in ["match_id", "competition_id", "season_id", "file"]})
+    partition_of = {}
+    for row in matches.iter_rows(named=True):
+        partition_of[row["match_id"]] = (row["competition_id"], row["season_id"])
+        rows.append({
+            **row,
+            "dataset": "matches",
+            "file": _relative(Path(row["file"]), root),
+            "compacted_file": None,
+            "row_groups": None,
+        })
+
+    for dataset, (path_key, prefix) in COMPACTED_DATASETS.items():
+        partitions: dict[tuple, list[int]] = {}
+        match_files = _match_files(paths[path_key], prefix)
+        for match_id in match_files:
+            partitions.setdefault(partition_of.get(match_id, (None, None)), []).append(match_id)
+        for (competition_id, season_id), match_ids in partitions.items():
+            partition_file = (
+                paths["bronze_compacted"] / dataset
+                / f"competition_id={competition_id}" / f"season_id={season_id}" / PARTITION_FILENAME
+            )
+            compacted = competition_id is not None and partition_file.exists()
+            row_groups = _row_groups_by_match(partition_file, match_ids) if compacted else {}
+            for match_id in sorted(match_ids):
+                rows.append({
+                    "dataset": dataset,
+                    "match_id": match_id,
+                    "competition_id": competition_id,
+                    "season_id": season_id,
+                    "file": _relative(match_files[match_id], root),
+                    "compacted_file": _relative(partition_file, root) if compacted else None,
+                    "row_groups": row_groups.get(match_id),
+                })
+    return pl.DataFrame(rows, schema=INDEX_SCHEMA)
+
+
+def write_match_index(paths: dict, index_file: Path, logger=None) -> Path:
+    """
+    Build the match index and write it next to the bronze open_data datasets.
+
+    Args:
+        paths (dict): The open_data paths from bronze.open_data.ingest._get_paths.
+        index_file (Path): The index file to write.
+        logger (Logger, optional): The logger to use. Defaults to None.
+
+    Returns:
+        Path: The index file.
+    """
+    if logger is None:
+        logger = NullLogger()
+    index = build_match_index(paths, index_file.parent)
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = index_file.with_suffix(".parquet.tmp")
+    index.write_parquet(tmp_file)
+    os.replace(tmp_file, index_file)
+    logger.info(
+        f"Wrote match index of {index['match_id'].n_unique()} matches "
+        f"({len(index)} dataset entries) to {index_file}"
+    )
+    return index_file
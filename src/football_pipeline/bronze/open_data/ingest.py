@@ -1,114 +1,166 @@
-from football_pipeline.utils.constants import DATA_DIR, LOGS_DIR
+from pathlib import Path
+
+from football_pipeline.bronze.open_data.compact import compact_open_data
+from football_pipeline.bronze.open_data.index import write_match_index
+from football_pipeline.config import PipelineConfig
+from football_pipeline.utils.archive import find_archive_root, landing_file
+from football_pipeline.utils.constants import DATA_DIR
 from football_pipeline.utils.dataframe import ingest_json_batch_to_parquet, ingest_json_to_parquet
-from football_pipeline.utils.logging import setup_logger
 
 # Simple helper to get open_data paths
-def _get_paths():
-    """Get open_data paths with subdirectories."""
+def _get_paths(config: PipelineConfig | None = None):
+    """
+    Get open_data paths with subdirectories.
+
+    With ``config.open_data_archive`` set, the landing entries are directories
+    inside that archive (utils/archive.py) instead of data/landing.
+    """
     source_path = "open_data/data"
+    landing = DATA_DIR / "landing" / source_path
+    if config is not None and config.open_data_archive:
+        # The directory holding competitions.json, wherever the snapshot nests it
+        landing = find_archive_root(Path(config.open_data_archive).expanduser(), "competitions.json")
     return {
         # Landing
-        "landing_competitions": DATA_DIR / "landing" / source_path,
-        "landing_matches": DATA_DIR / "landing" / source_path / "matches", 
-        "landing_lineups": DATA_DIR / "landing" / source_path / "lineups",
-        "landing_events": DATA_DIR / "landing" / source_path / "events",
-        "landing_three_sixty_events": DATA_DIR / "landing" / source_path / "three-sixty",
+        "landing_competitions": landing,
+        "landing_matches": landing / "matches",
+        "landing_lineups": landing / "lineups",
+        "landing_events": landing / "events",
+        "landing_three_sixty_events": landing / "three-sixty",
         # Bronze
         "bronze_competitions": DATA_DIR / "bronze" / source_path,
         "bronze_matches": DATA_DIR / "bronze" / source_path / "matches",
         "bronze_lineups": DATA_DIR / "bronze" / source_path / "lineups", 
         "bronze_events": DATA_DIR / "bronze" / source_path / "events",
-        "bronze_three_sixty_events": DATA_DIR / "bronze" / source_path / "three-sixty"
+        "bronze_three_sixty_events": DATA_DIR / "bronze" / source_path / "three-sixty",
+        # Partitioned datasets built from the per-match bronze files
+        "bronze_compacted": DATA_DIR / "bronze" / "open_data" / "compacted",
+        # match_id -> file/row group index used by football_pipeline.catalog
+        "bronze_match_index": DATA_DIR / "bronze" / "open_data" / "_match_index.parquet",
     }
 
-def ingest_competitions_local():
+def ingest_competitions_local(config: PipelineConfig | None = None):
     """
     Ingest competitions from the raw data directory into the bronze layer.
     """
-    paths = _get_paths()
+    config = config or PipelineConfig()
+    paths = _get_paths(config)
     ingest_json_to_parquet(
-        paths["landing_competitions"] / "competitions.json",
+        landing_file(paths["landing_competitions"], "competitions.json"),
         paths["bronze_competitions"] / "competitions.parquet",
         logger=None,
-        description="competitions"
+        description="competitions",
+        engine=config.engine,
+        overwrite=config.force,
+        schema="competitions",
     )
 
-def ingest_matches_local(logger):
+def ingest_matches_local(logger, config: PipelineConfig | None = None):
     """
     Ingest matches from the raw data directory into the bronze layer.
     """
+    config = config or PipelineConfig()
     ingest_json_batch_to_parquet(
-        input_dir=_get_paths()["landing_matches"],
+        input_dir=_get_paths(config)["landing_matches"],
         output_dir=_get_paths()["bronze_matches"],
         logger=logger,
         description="matches",
         file_pattern="*/*.json",  # matches are in subdirectories
         output_prefix="matches",
-        log_frequency=5
+        log_frequency=5,
+        workers=config.workers,
+        engine=config.engine,
+        overwrite=config.force,
+        schema="matches",
+        shard=config.shard,
     )
 
-def ingest_lineups_local(logger):
+def ingest_lineups_local(logger, config: PipelineConfig | None = None):
     """
     Ingest lineups from the raw data directory into the bronze layer.
     """
+    config = config or PipelineConfig()
     ingest_json_batch_to_parquet(
-        input_dir=_get_paths()["landing_lineups"],
+        input_dir=_get_paths(config)["landing_lineups"],
         output_dir=_get_paths()["bronze_lineups"],
         logger=logger,
         description="lineups",
         output_prefix="lineups",
-        log_frequency=10
+        log_frequency=10,
+        workers=config.workers,
+        engine=config.engine,
+        overwrite=config.force,
+        schema="lineups",
+        shard=config.shard,
     )
 
-def ingest_events_local(logger):
+def ingest_events_local(logger, config: PipelineConfig | None = None):
     """
     Ingest events from the raw data directory into the bronze layer.
     """
+    config = config or PipelineConfig()
     ingest_json_batch_to_parquet(
-        input_dir=_get_paths()["landing_events"],
+        input_dir=_get_paths(config)["landing_events"],
         output_dir=_get_paths()["bronze_events"],
         logger=logger,
         description="events",
         output_prefix="events",
-        log_frequency=50
+        log_frequency=50,
+        workers=config.workers,
+        engine=config.engine,
+        overwrite=config.force,
+        schema="events",
+        shard=config.shard,
     )
 
-def ingest_three_sixty_events_local(logger):
+def ingest_three_sixty_events_local(logger, config: PipelineConfig | None = None):
     """
     Ingest three-sixty events from the raw data directory into the bronze layer.
     """
+    config = config or PipelineConfig()
     ingest_json_batch_to_parquet(
-        input_dir=_get_paths()["landing_three_sixty_events"],
+        input_dir=_get_paths(config)["landing_three_sixty_events"],
         output_dir=_get_paths()["bronze_three_sixty_events"],
         logger=logger,
         description="three-sixty events",
         output_prefix="events_three_sixty",
-        log_frequency=50
+        log_frequency=50,
+        workers=config.workers,
+        engine=config.engine,
+        overwrite=config.force,
+        schema="three-sixty",
+        shard=config.shard,
     )
 
-def open_data_ingest(logger=None):
+def compact_bronze_local(logger, config: PipelineConfig | None = None, datasets: list[str] | None = None):
+    """
+    Compact the per-match bronze files into competition/season partitioned datasets.
+    """
+    config = config or PipelineConfig()
+    compact_open_data(_get_paths(), logger=logger, overwrite=config.force, datasets=datasets)
+
+def index_bronze_local(logger):
+    """
+    Index the bronze files by match so catalog queries open only the files they need.
+    """
+    paths = _get_paths()
+    write_match_index(paths, paths["bronze_match_index"], logger=logger)
+
+def open_data_ingest(logger=None, *, config: PipelineConfig | None = None):
     """
     Ingest all open_data bronze layer data from the raw data directory.
-    
+
+    The bronze stages and their dependencies are declared once, in
+    football_pipeline.pipeline; this runs them for open_data.
+
     Args:
-        logger: Optional logger to use. If None, creates a new one.
-    """
-    if logger is None:
-        log_path = LOGS_DIR / "open_data" / "bronze" / "bronze_open_data.log"
-        logger = setup_logger(log_path, "open_data_bronze")
-    
-    logger.info("Starting open_data bronze layer ingestion...")
-    
-    # Ensure all necessary directories exist
-    # Directories are created by the pipeline
-    
-    ingest_competitions_local()
-    ingest_matches_local(logger)
-    ingest_lineups_local(logger)
-    ingest_events_local(logger)
-    ingest_three_sixty_events_local(logger)
-    
-    logger.info("Open_data bronze layer ingestion complete!")
+        logger: Accepted for existing callers and not used: the stages log to the
+            pipeline's own logs (logs/open_data/pipeline.log and the per-stage logs).
+        config: Optional run options (workers, engine, ...). If None, uses defaults.
+    """
+    from football_pipeline.pipeline import run_bronze_layer
+
+    return run_bronze_layer("open_data", config=config)
 
 if __name__ == "__main__":
     open_data_ingest()
\ No newline at end of file
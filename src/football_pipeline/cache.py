@@ -0,0 +1,329 @@
+"""
+On-disk memoization of derived analytics.
+
+Decorate a function computing an aggregate from the catalog and repeated calls
+with the same arguments read the stored result instead of rescanning bronze or
+silver:
+
+    import polars as pl
+    from football_pipeline import cache, catalog
+
+    @cache.cached
+    def team_passes(competition_id: int, season_id: int) -> pl.DataFrame:
+        return (
+            catalog.scan(
+                "silver", "open_data", "events",
+                columns=["match_id", "team_name", "type_name"],
+                competition_id=competition_id, season_id=season_id,
+            )
+            .filter(pl.col("type_name") == "Pass")
+            .group_by("match_id", "team_name")
+            .len("passes")
+            .collect()
+        )
+
+    team_passes(43, 106)  # computed and stored
+    team_passes(43, 106)  # read back from data/_cache
+
+A result is keyed by the function (its qualified name and source code, so an
+edited function recomputes) and its arguments. Every dataset the function
+opens through the catalog is recorded with the result, together with a
+fingerprint of the dataset's files (paths, sizes and mtimes); a later call
+re-fingerprints them and recomputes when any of them changed, e.g. after a
+pipeline run rewrote silver events. Files read without the catalog can be
+declared with ``@cache.cached(inputs=[path, ...])``.
+
+Results (Polars or pandas DataFrames, or LazyFrames, which are collected) are
+stored as uncompressed Arrow IPC files and memory-mapped when read back. The
+cache holds at most ``max_mb`` (DEFAULT_CACHE_MAX_MB); storing a result beyond
+that evicts the least recently used ones.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+
+from football_pipeline.bronze.open_data.compact import COMPACTED_DATASETS
+from football_pipeline.utils.constants import (
+    BRONZE_OPEN_DATA_COMPACTED_DIR,
+    BRONZE_OPEN_DATA_MATCH_INDEX,
+    CACHE_DIR,
+    DEFAULT_CACHE_MAX_MB,
+    get_data_path,
+)
+
+RESULT_SUFFIX = ".arrow"
+META_SUFFIX = ".json"
+
+# The inputs recorded by the cached calls running in this thread (innermost last)
+_LOCAL = threading.local()
+
+
+def record_read(dataset):
+    """
+    Note that the running cached call(s) read a dataset (called by catalog).
+
+    Args:
+        dataset (tuple | Path): A (layer, source, dataset) key or a file/directory.
+    """
+    for reads in getattr(_LOCAL, "reads", []):
+        reads.add(tuple(dataset) if isinstance(dataset, (tuple, list)) else str(dataset))
+
+
+def _input_paths(dataset) -> list[Path]:
+    """The files and directories behind a dataset key or path."""
+    if isinstance(dataset, str):
+        return [Path(dataset)]
+    layer, source, name = dataset
+    paths = [get_data_path(layer, source, name)]
+    if (layer, source) == ("bronze", "open_data"):
+        # Resolved through the match index, and read from the compacted partitions
+        paths.append(BRONZE_OPEN_DATA_MATCH_INDEX)
+        if name in COMPACTED_DATASETS:
+            paths.append(BRONZE_OPEN_DATA_COMPACTED_DIR / name)
+    return paths
+
+
+def fingerprint_input(dataset) -> str:
+    """
+    Fingerprint the files of a dataset by path, size and mtime (no content is read).
+
+    Directories count their Parquet files, leaving out manifests, state files
+    and temporary files, which the pipeline rewrites on runs that change nothing.
+
+    Args:
+        dataset (tuple | str): A (layer, source, dataset) key or a file/directory path.
+
+    Returns:
+        str: A digest that changes whenever a file is added, removed or rewritten.
+    """
+    entries = []
+    for path in _input_paths(dataset):
+        if path.is_file():
+            files = [path]
+        elif path.is_dir():
+            files = sorted(f for f in path.rglob("*.parquet") if not f.name.startswith(("_", ".")))
+        else:
+            entries.append([str(path), None, None])
+            continue
+        for f in files:
+            stat = f.stat()
+            entries.append([str(f), stat.st_size, stat.st_mtime_ns])
+    return hashlib.blake2b(json.dumps(entries).encode(), digest_size=16).hexdigest()
+
+
+def _code_digest(fn) -> str:
+    """Digest of a function's source (its bytecode where the source is unavailable)."""
+    try:
+        code = inspect.getsource(fn)
+    except (OSError, TypeError):
+        code = repr((fn.__code__.co_code, fn.__code__.co_consts))
+    return hashlib.blake2b(code.encode(), digest_size=16).hexdigest()
+
+
+def _entry_files(cache_dir: Path, key: str) -> tuple[Path, Path]:
+    return cache_dir / f"{key}{RESULT_SUFFIX}", cache_dir / f"{key}{META_SUFFIX}"
+
+
+def _remove(cache_dir: Path, key: str):
+    for f in _entry_files(cache_dir, key):
+        f.unlink(missing_ok=True)
+
+
+def _write_result(result, path: Path) -> str:
+    """Write a result as Arrow IPC and return its kind."""
+    if isinstance(result, pl.LazyFrame):
+        result.collect().write_ipc(path, compression="uncompressed")
+        return "lazy"
+    if isinstance(result, pl.DataFrame):
+        result.write_ipc(path, compression="uncompressed")
+        return "polars"
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    if pd is not None and isinstance(result, pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        feather.write_feather(pa.Table.from_pandas(result), path, compression="uncompressed")
+        return "pandas"
+    raise TypeError(f"Cached functions must return a Polars or pandas DataFrame, got {type(result).__name__}")
+
+
+def _read_result(path: Path, kind: str):
+    if kind == "pandas":
+        import pyarrow.feather as feather
+
+        return feather.read_table(path, memory_map=True).to_pandas()
+    df = pl.read_ipc(path, memory_map=True)
+    return df.lazy() if kind == "lazy" else df
+
+
+def _load(cache_dir: Path, key: str):
+    """The stored result of a key, or None when there is none or its inputs changed."""
+    result_file, meta_file = _entry_files(cache_dir, key)
+    try:
+        meta = json.loads(meta_file.read_text())
+    except (OSError, ValueError):
+        return None
+    for entry in meta["inputs"]:
+        dataset = tuple(entry["dataset"]) if isinstance(entry["dataset"], list) else entry["dataset"]
+        if fingerprint_input(dataset) != entry["fingerprint"]:
+            _remove(cache_dir, key)
+            return None
+    try:
+        result = _read_result(result_file, meta["kind"])
+    except (OSError, ValueError, pl.exceptions.PolarsError):
+        # Evicted or half-written by a concurrent process: compute it again
+        _remove(cache_dir, key)
+        return None
+    # The result file's mtime is its last use, the order of eviction
+    os.utime(result_file)
+    return result
+
+
+def _store(cache_dir: Path, key: str, meta: dict, result):
+    """Atomically store a result with its metadata."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    result_file, meta_file = _entry_files(cache_dir, key)
+    tmp_file = result_file.with_suffix(f"{RESULT_SUFFIX}.tmp")
+    meta["kind"] = _write_result(result, tmp_file)
+    meta["bytes"] = tmp_file.stat().st_size
+    tmp_meta = meta_file.with_suffix(f"{META_SUFFIX}.tmp")
+    tmp_meta.write_text(json.dumps(meta, indent=1, default=str))
+    # Result first: a metadata file always points at a complete result
+    os.replace(tmp_file, result_file)
+    os.replace(tmp_meta, meta_file)
+
+
+def evict(cache_dir: Path = CACHE_DIR, max_mb: float = DEFAULT_CACHE_MAX_MB, keep: str | None = None) -> int:
+    """
+    Remove the least recently used results until the cache fits in max_mb.
+
+    Args:
+        cache_dir (Path, optional): The cache directory. Defaults to CACHE_DIR.
+        max_mb (float, optional): The size cap. Defaults to DEFAULT_CACHE_MAX_MB.
+        keep (str, optional): A key that is never evicted (the result just stored). Defaults to None.
+
+    Returns:
+        int: The number of results removed.
+    """
+    entries = []
+    for result_file in Path(cache_dir).glob(f"*{RESULT_SUFFIX}"):
+        try:
+            stat = result_file.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, result_file.stem))
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, key in sorted(entries):
+        if total <= max_mb * (1 << 20):
+            break
+        if key == keep:
+            continue
+        _remove(Path(cache_dir), key)
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear_cache(fn=None, cache_dir: Path = CACHE_DIR) -> int:
+    """
+    Remove stored results.
+
+    Args:
+        fn (callable, optional): Only the results of this cached function. Defaults to None (all).
+        cache_dir (Path, optional): The cache directory. Defaults to CACHE_DIR.
+
+    Returns:
+        int: The number of results removed.
+    """
+    name = getattr(fn, "cache_name", None) if fn is not None else None
+    removed = 0
+    for meta_file in Path(cache_dir).glob(f"*{META_SUFFIX}"):
+        if name is not None:
+            try:
+                if json.loads(meta_file.read_text())["function"] != name:
+                    continue
+            except (OSError, ValueError, KeyError):
+                continue
+        _remove(Path(cache_dir), meta_file.stem)
+        removed += 1
+    return removed
+
+
+def cached(fn=None, *, inputs=(), cache_dir: Path | None = None, max_mb: float | None = None):
+    """
+    Memoize a function returning a DataFrame on disk (see the module docstring).
+
+    Usable bare (``@cached``) or with options (``@cached(inputs=[...])``). The
+    decorated function gains ``cache_clear()`` and ``uncached`` (the original).
+
+    Args:
+        fn (callable, optional): The function to decorate.
+        inputs (list, optional): Datasets read without the catalog, as
+            (layer, source, dataset) keys or file/directory paths. Defaults to ().
+        cache_dir (Path, optional): The cache directory. Defaults to CACHE_DIR.
+        max_mb (float, optional): The cache size cap. Defaults to DEFAULT_CACHE_MAX_MB.
+
+    Returns:
+        callable: The memoized function.
+    """
+    declared = [tuple(i) if isinstance(i, (tuple, list)) else str(i) for i in inputs]
+
+    def decorate(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        code = _code_digest(fn)
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            directory = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = json.dumps(dict(bound.arguments), sort_keys=True, default=repr)
+            key = hashlib.blake2b(
+                json.dumps([name, code, arguments]).encode(), digest_size=16
+            ).hexdigest()
+
+            result = _load(directory, key)
+            if result is not None:
+                return result
+
+            reads = set(declared)
+            _LOCAL.reads = getattr(_LOCAL, "reads", []) + [reads]
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                _LOCAL.reads = _LOCAL.reads[:-1]
+            meta = {
+                "function": name,
+                "arguments": arguments,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "inputs": [
+                    {"dataset": dataset, "fingerprint": fingerprint_input(dataset)}
+                    for dataset in sorted(reads, key=str)
+                ],
+            }
+            _store(directory, key, meta, result)
+            evict(directory, max_mb if max_mb is not None else DEFAULT_CACHE_MAX_MB, keep=key)
+            if isinstance(result, pl.LazyFrame):
+                # Return what later calls get: the collected frame, not the query again
+                return _read_result(_entry_files(directory, key)[0], "lazy")
+            return result
+
+        wrapper.cache_name = name
+        wrapper.uncached = fn
+        wrapper.cache_clear = lambda: clear_cache(wrapper, Path(cache_dir) if cache_dir is not None else CACHE_DIR)
+        return wrapper
+
+    return decorate(fn) if fn is not None else decorate
@@ -0,0 +1,252 @@
+"""
+Query API over the pipeline's datasets.
+
+Every (layer, source, dataset) in utils.constants.DATA_PATHS can be opened as a
+LazyFrame with a column projection and match/competition/season filters:
+
+    from football_pipeline import catalog
+
+    # Opens one compacted partition and reads only the row groups of the match
+    events = catalog.scan("bronze", "open_data", "events", match_ids=[3788741]).collect()
+
+    shots = (
+        catalog.scan(
+            "silver", "open_data", "events",
+            columns=["match_id", "type_name", "location_x", "location_y"],
+            competition_id=43, season_id=106,
+        )
+        .filter(pl.col("type_name") == "Shot")
+        .collect()
+    )
+
+The bronze open_data datasets are resolved through the match index written at
+the end of bronze ingestion (bronze/open_data/index.py): a match_ids filter reads
+only the row groups holding those matches, a competition/season filter only the
+partitions (or matches tables) of that competition/season. Per-match datasets
+always come back with match_id, competition_id and season_id columns.
+
+Other datasets are single files or partitioned directories that are filtered
+lazily, so Polars pushes the filters into the scan; a competition/season filter
+on a table without those columns is turned into match ids with the index.
+
+Aggregates computed from these scans can be memoized on disk with
+football_pipeline.cache.
+"""
+
+from pathlib import Path
+
+import polars as pl
+import pyarrow.parquet as pq
+
+from football_pipeline.bronze.open_data.compact import COMPACTED_DATASETS
+from football_pipeline.cache import record_read
+from football_pipeline.utils.constants import BRONZE_OPEN_DATA_MATCH_INDEX, get_data_path
+from football_pipeline.utils.schemas import flat_schema, get_schema
+
+PARTITION_COLUMNS = ["match_id", "competition_id", "season_id"]
+
+
+def load_match_index(index_file: Path = BRONZE_OPEN_DATA_MATCH_INDEX) -> pl.DataFrame:
+    """
+    Load the bronze open_data match index.
+
+    Args:
+        index_file (Path, optional): The index file. Defaults to BRONZE_OPEN_DATA_MATCH_INDEX.
+
+    Returns:
+        pl.DataFrame: One row per dataset and match (see bronze/open_data/index.py).
+    """
+    if not index_file.exists():
+        raise FileNotFoundError(f"No match index at {index_file}, run the open_data bronze layer first.")
+    record_read(index_file)
+    return pl.read_parquet(index_file)
+
+
+def find_match_ids(
+    competition_id: int | None = None,
+    season_id: int | None = None,
+    index_file: Path = BRONZE_OPEN_DATA_MATCH_INDEX,
+) -> list[int]:
+    """
+    Look up the matches of a competition and/or season.
+
+    Args:
+        competition_id (int, optional): The competition. Defaults to None (any).
+        season_id (int, optional): The season. Defaults to None (any).
+        index_file (Path, optional): The match index file.
+
+    Returns:
+        list[int]: The sorted match ids.
+    """
+    matches = load_match_index(index_file).filter(pl.col("dataset") == "matches")
+    predicate = _predicate(None, competition_id, season_id)
+    if predicate is not None:
+        matches = matches.filter(predicate)
+    return sorted(matches["match_id"].to_list())
+
+
+def _predicate(
+    match_ids: list[int] | None,
+    competition_id: int | None,
+    season_id: int | None,
+) -> pl.Expr | None:
+    """Filter expression over match_id/competition_id/season_id columns (None when unfiltered)."""
+    conditions = []
+    if match_ids is not None:
+        conditions.append(pl.col("match_id").is_in(list(match_ids)))
+    if competition_id is not None:
+        conditions.append(pl.col("competition_id") == competition_id)
+    if season_id is not None:
+        conditions.append(pl.col("season_id") == season_id)
+    if not conditions:
+        return None
+    return pl.all_horizontal(conditions)
+
+
+def _read_row_groups(root: Path, entries: pl.DataFrame, columns: list[str] | None) -> list[pl.LazyFrame]:
+    """Read only the indexed row groups of the requested matches from their compacted partitions."""
+    read_columns = None
+    if columns is not None:
+        read_columns = ["match_id"] + [c for c in columns if c not in PARTITION_COLUMNS]
+    frames = []
+    for (compacted_file,), group in entries.group_by("compacted_file", maintain_order=True):
+        row_groups = sorted(set(group["row_groups"].explode().drop_nulls().to_list()))
+        table = pq.ParquetFile(root / compacted_file).read_row_groups(row_groups, columns=read_columns)
+        first = group.row(0, named=True)
+        frames.append(
+            pl.from_arrow(table).lazy()
+            .filter(pl.col("match_id").is_in(group["match_id"].to_list()))
+            .with_columns(
+                pl.lit(first["competition_id"], dtype=pl.Int64).alias("competition_id"),
+                pl.lit(first["season_id"], dtype=pl.Int64).alias("season_id"),
+            )
+        )
+    return frames
+
+
+def _scan_match_files(root: Path, entries: pl.DataFrame) -> list[pl.LazyFrame]:
+    """Scan per-match bronze files, adding the match/competition/season ids from the index."""
+    return [
+        pl.scan_parquet(root / row["file"]).with_columns(
+            pl.lit(row["match_id"], dtype=pl.Int64).alias("match_id"),
+            pl.lit(row["competition_id"], dtype=pl.Int64).alias("competition_id"),
+            pl.lit(row["season_id"], dtype=pl.Int64).alias("season_id"),
+        )
+        for row in entries.iter_rows(named=True)
+    ]
+
+
+def _scan_per_match(
+    dataset: str,
+    columns: list[str] | None,
+    match_ids: list[int] | None,
+    competition_id: int | None,
+    season_id: int | None,
+    index_file: Path,
+) -> pl.LazyFrame:
+    """Scan a per-match bronze dataset, opening only the files (and row groups) the filters need."""
+    root = index_file.parent
+    entries = load_match_index(index_file).filter(pl.col("dataset") == dataset)
+    predicate = _predicate(match_ids, competition_id, season_id)
+    if predicate is not None:
+        entries = entries.filter(predicate)
+
+    compacted = entries.filter(pl.col("compacted_file").is_not_null())
+    frames = _scan_match_files(root, entries.filter(pl.col("compacted_file").is_null()))
+    if not compacted.is_empty():
+        if match_ids is not None:
+            frames.extend(_read_row_groups(root, compacted, columns))
+        else:
+            files = [root / f for f in compacted["compacted_file"].unique(maintain_order=True)]
+            frames.append(
+                pl.scan_parquet(files, hive_partitioning=True, missing_columns="insert", extra_columns="ignore")
+                .with_columns(pl.col(PARTITION_COLUMNS).cast(pl.Int64))
+            )
+    if not frames:
+        schema = {**flat_schema(get_schema(dataset)), **{c: pl.Int64 for c in PARTITION_COLUMNS}}
+        frames = [pl.LazyFrame(schema=schema)]
+
+    lf = pl.concat(frames, how="diagonal_relaxed")
+    return lf.select(columns) if columns is not None else lf
+
+
+def _scan_path(path: Path) -> pl.LazyFrame:
+    """Scan a dataset file or a directory of Parquet files (Hive partitions are read as columns)."""
+    if not path.exists():
+        raise FileNotFoundError(f"No data at {path}, run the layer that builds it first.")
+    if path.is_dir():
+        return pl.scan_parquet(path / "**" / "*.parquet", hive_partitioning=True, missing_columns="insert")
+    return pl.scan_parquet(path)
+
+
+def _apply_filters(
+    lf: pl.LazyFrame,
+    match_ids: list[int] | None,
+    competition_id: int | None,
+    season_id: int | None,
+    index_file: Path,
+) -> pl.LazyFrame:
+    """Filter a scanned table, turning competition/season filters into match ids when it lacks those columns."""
+    names = set(lf.collect_schema().names())
+    if (competition_id is not None and "competition_id" not in names) or (
+        season_id is not None and "season_id" not in names
+    ):
+        indexed = set(find_match_ids(competition_id, season_id, index_file))
+        match_ids = sorted(indexed if match_ids is None else indexed & set(match_ids))
+        competition_id = season_id = None
+    if match_ids is not None and "match_id" not in names:
+        raise ValueError("This dataset has no match_id column and cannot be filtered by match.")
+    predicate = _predicate(match_ids, competition_id, season_id)
+    return lf.filter(predicate) if predicate is not None else lf
+
+
+def scan(
+    layer: str,
+    source: str,
+    dataset: str,
+    columns: list[str] | None = None,
+    match_ids: list[int] | None = None,
+    competition_id: int | None = None,
+    season_id: int | None = None,
+    index_file: Path = BRONZE_OPEN_DATA_MATCH_INDEX,
+) -> pl.LazyFrame:
+    """
+    Open a dataset as a LazyFrame.
+
+    Args:
+        layer (str): The layer, e.g. "bronze".
+        source (str): The source, e.g. "open_data".
+        dataset (str): The dataset, e.g. "events" (see utils.constants.DATA_PATHS).
+        columns (list[str], optional): Columns to return. Defaults to None (all).
+        match_ids (list[int], optional): Only these matches. Defaults to None.
+        competition_id (int, optional): Only this competition. Defaults to None.
+        season_id (int, optional): Only this season. Defaults to None.
+        index_file (Path, optional): The match index file.
+
+    Returns:
+        pl.LazyFrame: The (filtered, projected) dataset.
+    """
+    path = get_data_path(layer, source, dataset)
+    # Results cached from this scan (football_pipeline/cache.py) are invalidated when the dataset changes
+    record_read((layer, source, dataset))
+    if match_ids is not None:
+        match_ids = [int(m) for m in match_ids]
+
+    if (layer, source) == ("bronze", "open_data") and dataset in COMPACTED_DATASETS:
+        return _scan_per_match(dataset, columns, match_ids, competition_id, season_id, index_file)
+
+    if (layer, source, dataset) == ("bronze", "open_data", "matches"):
+        # One table per competition/season: the index says which ones to open
+        entries = load_match_index(index_file).filter(pl.col("dataset") == "matches")
+        predicate = _predicate(match_ids, competition_id, season_id)
+        if predicate is not None:
+            entries = entries.filter(predicate)
+        files = [index_file.parent / f for f in entries["file"].unique(maintain_order=True)]
+        if not files:
+            return _scan_path(path).head(0).select(columns or pl.all())
+        lf = pl.scan_parquet(files, missing_columns="insert", extra_columns="ignore")
+        if match_ids is not None:
+            lf = lf.filter(pl.col("match_id").is_in(match_ids))
+    else:
+        lf = _apply_filters(_scan_path(path), match_ids, competition_id, season_id, index_file)
+    return lf.select(columns) if columns is not None else lf
@@ -9,7 +9,15 @@ Keeps the surface area small and obvious.
 import argparse
 import sys
 
-from football_pipeline.utils.constants import SUPPORTED_SOURCES
+from football_pipeline.utils.constants import (
+    DEFAULT_JSON_ENGINE,
+    DEFAULT_STREAM_MEMORY_MB,
+    DEFAULT_WATCH_MAX_WAIT_SECONDS,
+    DEFAULT_WATCH_POLL_SECONDS,
+    DEFAULT_WATCH_SETTLE_SECONDS,
+    SUPPORTED_JSON_ENGINES,
+    SUPPORTED_SOURCES,
+)
 
 def create_parser() -> argparse.ArgumentParser:
     """Create the argument parser for the CLI."""
@@ -22,8 +30,26 @@ Examples:
   football_pipeline --bronze           # Run only bronze layer
   football_pipeline --source all       # Process all data sources
   football_pipeline --all-layers       # Run all layers (bronze, silver, gold)
+  football_pipeline --workers 8        # Ingest files with 8 worker processes
+  football_pipeline --profile          # Write cProfile dumps of the slow stages
+  football_pipeline --log-json         # Also write JSON lines logs
+  football_pipeline --archive open-data-master.zip  # Ingest open_data without extracting it
+  football_pipeline --all-layers --shard 2/4         # This machine's quarter of the per-match work
+  football_pipeline --all-layers --finalize          # Once every shard finished: the shared stages
+  football_pipeline --all-layers --plan               # Show the per-file work and estimated time, run nothing
+  football_pipeline watch              # Keep running: push newly landed matches through every layer
+  football_pipeline watch --bronze --source open_data  # Only ingest new open_data files to bronze
         """
     )
+
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["run", "watch"],
+        default="run",
+        help="'run' (default) processes everything once; 'watch' keeps running and processes "
+             "files as they land (all layers and sources unless selected)"
+    )
     
     # Layer selection
     parser.add_argument(
@@ -55,6 +81,90 @@ Examples:
         help=f"Data source to process. Options: {', '.join(SUPPORTED_SOURCES)}, or 'all' for all sources"
     )
     
+    # Execution options
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Number of worker processes for batch ingestion (default: number of CPUs)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=SUPPORTED_JSON_ENGINES,
+        default=DEFAULT_JSON_ENGINE,
+        help=f"JSON ingestion engine (default: {DEFAULT_JSON_ENGINE})"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every output, even when the source content is unchanged"
+    )
+    parser.add_argument(
+        "--max-memory-mb",
+        type=int,
+        default=DEFAULT_STREAM_MEMORY_MB,
+        metavar="MB",
+        help=f"Approximate memory ceiling when streaming large J1 League JSON files (default: {DEFAULT_STREAM_MEMORY_MB})"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile every stage with cProfile and write the slow ones next to the run report in logs/runs/"
+    )
+    parser.add_argument(
+        "--log-json",
+        action="store_true",
+        help="Also write structured JSON lines logs next to the text logs"
+    )
+    parser.add_argument(
+        "--archive",
+        default=None,
+        metavar="PATH",
+        help="Read open_data landing files from a .zip/.tar.gz snapshot instead of data/landing"
+    )
+    parser.add_argument(
+        "--shard",
+        default=None,
+        metavar="I/N",
+        help="Run only shard I of N (1 <= I <= N) of the per-match stages, e.g. on one of N machines"
+    )
+    parser.add_argument(
+        "--finalize",
+        action="store_true",
+        help="After every shard finished: merge their manifests and run the shared stages "
+             "(compaction, catalog index, silver/gold tables, summary report)"
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print how the per-file work would be split into tasks and its estimated wall time, "
+             "without running anything"
+    )
+
+    # Watch options
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_WATCH_POLL_SECONDS,
+        metavar="SECONDS",
+        help=f"watch: seconds between landing scans without inotify (default: {DEFAULT_WATCH_POLL_SECONDS:g})"
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_WATCH_SETTLE_SECONDS,
+        metavar="SECONDS",
+        help=f"watch: a file is processed once unchanged for this long (default: {DEFAULT_WATCH_SETTLE_SECONDS:g})"
+    )
+    parser.add_argument(
+        "--max-wait",
+        type=float,
+        default=DEFAULT_WATCH_MAX_WAIT_SECONDS,
+        metavar="SECONDS",
+        help=f"watch: longest a batch waits for files still being written (default: {DEFAULT_WATCH_MAX_WAIT_SECONDS:g})"
+    )
+    
     return parser
 
 def main() -> int:
@@ -62,6 +172,8 @@ def main() -> int:
     parser = create_parser()
     args = parser.parse_args()
     
+    watch = args.command == "watch"
+
     # Determine what layers to run
     if args.all_layers:
         run_bronze = run_silver = run_gold = True
@@ -70,26 +182,77 @@ def main() -> int:
         run_silver = args.silver
         run_gold = args.gold
     else:
-        # Defaults: bronze only
+        # Defaults: bronze only, every layer when watching
         run_bronze = True
-        run_silver = False
-        run_gold = False
+        run_silver = watch
+        run_gold = watch
     
-    # Determine source
-    source = args.source if args.source else 'open_data'
+    # Determine source (watch defaults to every source)
+    source = args.source if args.source else 'all' if watch else 'open_data'
     if source == 'all':
         source = None
     
+    if args.shard and args.finalize:
+        parser.error("--shard and --finalize are separate runs")
+    if watch and (args.shard or args.finalize or args.archive or args.plan):
+        parser.error("watch reads data/landing; --shard, --finalize, --archive and --plan are for 'run'")
+    if args.plan and args.finalize:
+        parser.error("--finalize runs no per-file stages, there is nothing to --plan")
+    shard = None
+    if args.shard:
+        from football_pipeline.utils.sharding import Shard
+
+        try:
+            shard = Shard.parse(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+
     # Import pipeline function
+    from football_pipeline.config import PipelineConfig
     from football_pipeline.pipeline import run_pipeline
     
+    config = PipelineConfig(
+        workers=args.workers,
+        engine=args.engine,
+        force=args.force,
+        max_memory_mb=args.max_memory_mb,
+        profile=args.profile,
+        log_json=args.log_json,
+        open_data_archive=args.archive,
+        shard=shard,
+    )
+    
+    if args.plan:
+        from football_pipeline.pipeline import plan_pipeline
+        from football_pipeline.utils.planning import format_plans
+
+        print(format_plans(plan_pipeline(run_bronze, run_silver, run_gold, source, config)))
+        return 0
+
+    if watch:
+        from football_pipeline.watch import watch_landing
+
+        watch_landing(
+            bronze=run_bronze,
+            silver=run_silver,
+            gold=run_gold,
+            source=source,
+            config=config,
+            poll_seconds=args.poll_interval,
+            settle_seconds=args.settle,
+            max_wait_seconds=args.max_wait,
+        )
+        return 0
+
     # Run the pipeline - it handles all logging and error handling
     try:
         success = run_pipeline(
             bronze=run_bronze,
             silver=run_silver, 
             gold=run_gold,
-            source=source
+            source=source,
+            config=config,
+            finalize=args.finalize,
         )
         return 0 if success else 1
         
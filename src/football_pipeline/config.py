@@ -0,0 +1,39 @@
+"""
+Run-time options shared by the pipeline layers.
+
+The CLI builds one PipelineConfig per run and it is handed down to every layer
+and ingest function, so new knobs only need to be added here and read where
+they are used.
+"""
+
+from dataclasses import dataclass
+
+from football_pipeline.utils.constants import DEFAULT_JSON_ENGINE, DEFAULT_STREAM_MEMORY_MB
+from football_pipeline.utils.sharding import Shard
+
+
+@dataclass
+class PipelineConfig:
+    """
+    Options for a single pipeline run.
+
+    Attributes:
+        workers: Number of worker processes for batch ingestion. None means one per CPU.
+        engine: JSON ingestion engine, "pandas" or "native".
+        force: Rebuild every output, ignoring the incremental ingest manifests.
+        max_memory_mb: Approximate memory ceiling for streaming ingestion of large JSON files.
+        profile: Dump cProfile profiles of the slow stages next to the run report.
+        log_json: Also write the run logs as JSON lines (``<log>_<timestamp>.jsonl``).
+        open_data_archive: A .zip/.tar.gz snapshot of StatsBomb open-data to read the
+            open_data landing files from, instead of data/landing (see utils/archive.py).
+        shard: Only run this shard's part of the per-match stages (see utils/sharding.py).
+            None runs everything.
+    """
+    workers: int | None = None
+    engine: str = DEFAULT_JSON_ENGINE
+    force: bool = False
+    max_memory_mb: int = DEFAULT_STREAM_MEMORY_MB
+    profile: bool = False
+    log_json: bool = False
+    open_data_archive: str | None = None
+    shard: Shard | None = None
@@ -0,0 +1 @@
+# Gold layer module 
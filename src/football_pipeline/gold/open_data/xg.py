@@ -0,0 +1,303 @@
+"""
+Expected goals (xG) for the StatsBomb open data.
+
+Shot features are built as one lazy Polars query over the silver events (and
+the silver 360 freeze frames when they exist), so every competition is
+handled in a single pass with column expressions only:
+
+- distance_to_goal (metres) and angle_to_goal (radians subtended by the posts)
+- body part, play pattern, shot type and technique
+- assist_type from the key pass (cross, through ball, cut back, ...)
+- first time / one on one / open goal / under pressure flags
+- defenders_in_cone: opponents between the ball and the posts (360 matches only)
+
+A gradient boosting classifier (scikit-learn, the ``ml`` extra) is trained on
+them with cross-validation grouped by match: every shot's published xG comes
+from the fold model that did not see its match, and the reported metrics are
+computed on those out-of-fold predictions. The model refit on every shot is
+only persisted (with joblib), for scoring new shots.
+
+Nothing is retrained when the silver events and freeze frames are unchanged
+since the last run (see ``_xg_state.json``).
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from football_pipeline.utils.constants import (
+    GOLD_OPEN_DATA_XG_DIR,
+    SILVER_OPEN_DATA_360_DIR,
+    SILVER_OPEN_DATA_EVENTS_DIR,
+)
+from football_pipeline.utils.logging import NullLogger
+from football_pipeline.utils.metrics import measure_file
+from football_pipeline.utils.spatial import (
+    GOAL_POST_Y,
+    GOAL_X,
+    METRES_PER_UNIT,
+    distance,
+    players_between_ball_and_goal,
+)
+
+CATEGORICAL_FEATURES = ["body_part", "play_pattern", "shot_type", "technique", "assist_type"]
+NUMERIC_FEATURES = [
+    "distance_to_goal",
+    "angle_to_goal",
+    "under_pressure",
+    "first_time",
+    "one_on_one",
+    "open_goal",
+    "follows_dribble",
+    "aerial_won",
+    "defenders_in_cone",
+]
+FEATURES = CATEGORICAL_FEATURES + NUMERIC_FEATURES
+
+SHOTS_XG_FILENAME = "shots_xg.parquet"
+MODEL_FILENAME = "xg_model.joblib"
+METRICS_FILENAME = "xg_metrics.json"
+STATE_FILENAME = "_xg_state.json"
+# Bump when the features or the model change, so the model is retrained on the same inputs
+XG_FORMAT = 2
+
+# Cross-validation folds (groups of matches) for the out-of-fold xG and the metrics
+CV_FOLDS = 5
+
+SKLEARN_MISSING = "xG training needs scikit-learn: pip install 'football_pipeline[ml]'"
+
+
+def _assist_type() -> pl.Expr:
+    """Classify the key pass of a shot (columns from the joined pass event)."""
+    return (
+        pl.when(pl.col("key_pass_id").is_null()).then(pl.lit("none"))
+        .when(pl.col("pass_cross")).then(pl.lit("cross"))
+        .when(pl.col("pass_through_ball") | (pl.col("pass_technique_name") == "Through Ball")).then(pl.lit("through_ball"))
+        .when(pl.col("pass_cut_back")).then(pl.lit("cut_back"))
+        .when(pl.col("pass_height_name") == "High Pass").then(pl.lit("high_pass"))
+        .otherwise(pl.lit("ground_pass"))
+    )
+
+
+def build_shot_features_query(events: pl.LazyFrame, frames: pl.LazyFrame | None = None) -> pl.LazyFrame:
+    """
+    Build the lazy query for one row of model features per shot.
+
+    Args:
+        events (pl.LazyFrame): Silver events.
+        frames (pl.LazyFrame, optional): Silver 360 freeze frames. Without them
+            defenders_in_cone is null. Defaults to None.
+
+    Returns:
+        pl.LazyFrame: Shot ids, context columns, FEATURES and is_goal.
+    """
+    dx = GOAL_X - pl.col("location_x")
+    dy = (pl.col("location_y") - (GOAL_POST_Y[0] + GOAL_POST_Y[1]) / 2).abs()
+    half_width = (GOAL_POST_Y[1] - GOAL_POST_Y[0]) / 2
+    goal_width = GOAL_POST_Y[1] - GOAL_POST_Y[0]
+
+    shots = events.filter(pl.col("type_name") == "Shot").select(
+        "match_id",
+        "competition_id",
+        "season_id",
+        "id",
+        "period",
+        "minute",
+        "team_name",
+        "player_name",
+        "location_x",
+        "location_y",
+        pl.col("shot_key_pass_id").alias("key_pass_id"),
+        (distance("location_x", "location_y", GOAL_X, (GOAL_POST_Y[0] + GOAL_POST_Y[1]) / 2)
+         * METRES_PER_UNIT).alias("distance_to_goal"),
+        # Angle between the lines to both posts; arctan2 keeps it in (0, pi)
+        pl.arctan2(goal_width * dx, dx ** 2 + dy ** 2 - half_width ** 2).alias("angle_to_goal"),
+        pl.col("shot_body_part_name").fill_null("Unknown").alias("body_part"),
+        pl.col("play_pattern_name").fill_null("Unknown").alias("play_pattern"),
+        pl.col("shot_type_name").fill_null("Unknown").alias("shot_type"),
+        pl.col("shot_technique_name").fill_null("Unknown").alias("technique"),
+        *[
+            pl.col(src).fill_null(False).cast(pl.Int8).alias(dst)
+            for src, dst in [
+                ("under_pressure", "under_pressure"),
+                ("shot_first_time", "first_time"),
+                ("shot_one_on_one", "one_on_one"),
+                ("shot_open_goal", "open_goal"),
+                ("shot_follows_dribble", "follows_dribble"),
+                ("shot_aerial_won", "aerial_won"),
+            ]
+        ],
+        (pl.col("shot_outcome_name") == "Goal").cast(pl.Int8).alias("is_goal"),
+        pl.col("shot_statsbomb_xg").alias("statsbomb_xg"),
+    )
+
+    key_passes = events.filter(pl.col("type_name") == "Pass").select(
+        pl.col("id").alias("key_pass_id"),
+        "pass_cross",
+        "pass_through_ball",
+        "pass_cut_back",
+        "pass_technique_name",
+        "pass_height_name",
+    )
+    shots = (
+        shots.join(key_passes, on="key_pass_id", how="left")
+        .with_columns(_assist_type().alias("assist_type"))
+        .drop("pass_cross", "pass_through_ball", "pass_cut_back", "pass_technique_name", "pass_height_name")
+    )
+
+    if frames is None:
+        return shots.with_columns(pl.lit(None, dtype=pl.Float64).alias("defenders_in_cone"))
+    cone = (
+        players_between_ball_and_goal(frames, shots, teammate=False)
+        .group_by("event_uuid")
+        .agg(pl.len().cast(pl.Float64).alias("in_cone"))
+    )
+    has_frame = frames.select(pl.col("event_uuid").unique(), pl.lit(True).alias("has_frame"))
+    return (
+        shots.join(has_frame, left_on="id", right_on="event_uuid", how="left")
+        .join(cone, left_on="id", right_on="event_uuid", how="left")
+        # 0 for shots with a 360 frame but nobody in the cone, null without a frame
+        .with_columns(
+            pl.when(pl.col("has_frame")).then(pl.col("in_cone").fill_null(0.0)).alias("defenders_in_cone")
+        )
+        .drop("has_frame", "in_cone")
+    )
+
+
+def _new_model():
+    """The xG classifier: one-hot categoricals + gradient boosting (handles missing 360 counts)."""
+    try:
+        from sklearn.compose import ColumnTransformer
+        from sklearn.ensemble import HistGradientBoostingClassifier
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import OneHotEncoder
+    except ImportError as e:
+        raise ImportError(SKLEARN_MISSING) from e
+
+    preprocess = ColumnTransformer([
+        ("categorical", OneHotEncoder(handle_unknown="ignore", sparse_output=False), CATEGORICAL_FEATURES),
+        ("numeric", "passthrough", NUMERIC_FEATURES),
+    ])
+    classifier = HistGradientBoostingClassifier(
+        max_iter=300,
+        learning_rate=0.05,
+        max_leaf_nodes=31,
+        l2_regularization=1.0,
+        early_stopping=False,
+        random_state=0,
+    )
+    return Pipeline([("preprocess", preprocess), ("classifier", classifier)])
+
+
+def train_xg_model(shots: pl.DataFrame):
+    """
+    Train the xG model and predict every shot with a model that did not see its match.
+
+    Shots are split into CV_FOLDS folds of whole matches; each fold is predicted
+    by a model fitted on the others. A fold whose training shots are all goals
+    or all misses gets null xG.
+
+    Args:
+        shots (pl.DataFrame): Output of build_shot_features_query.
+
+    Returns:
+        tuple: (model fitted on every shot, out-of-fold xG per shot as a numpy array, metrics dict)
+    """
+    try:
+        from sklearn.metrics import brier_score_loss, log_loss, roc_auc_score
+        from sklearn.model_selection import GroupKFold
+    except ImportError as e:
+        raise ImportError(SKLEARN_MISSING) from e
+
+    X = shots.select(FEATURES).to_pandas()
+    y = shots["is_goal"].to_numpy()
+    groups = shots["match_id"].to_numpy()
+    metrics = {"shots": len(shots), "goals": int(y.sum()), "matches": int(shots["match_id"].n_unique())}
+
+    xg = np.full(len(shots), np.nan)
+    if metrics["matches"] >= 2:
+        folds = GroupKFold(n_splits=min(CV_FOLDS, metrics["matches"]))
+        for train_idx, test_idx in folds.split(X, y, groups):
+            if len(set(y[train_idx])) == 2:
+                model = _new_model().fit(X.iloc[train_idx], y[train_idx])
+                xg[test_idx] = model.predict_proba(X.iloc[test_idx])[:, 1]
+        metrics["cv_folds"] = folds.n_splits
+    predicted = ~np.isnan(xg)
+    if predicted.any():
+        metrics.update({
+            "cv_shots": int(predicted.sum()),
+            "cv_log_loss": log_loss(y[predicted], xg[predicted], labels=[0, 1]),
+            "cv_brier": brier_score_loss(y[predicted], xg[predicted]),
+            "cv_roc_auc": roc_auc_score(y[predicted], xg[predicted]) if len(set(y[predicted])) == 2 else None,
+        })
+    return _new_model().fit(X, y), xg, metrics
+
+
+def build_xg_model(
+    logger=None,
+    events_file: Path = SILVER_OPEN_DATA_EVENTS_DIR / "events.parquet",
+    frames_file: Path = SILVER_OPEN_DATA_360_DIR / "freeze_frames.parquet",
+    output_dir: Path = GOLD_OPEN_DATA_XG_DIR,
+    overwrite: bool = False,
+) -> Path | None:
+    """
+    Build shot features, train and persist the xG model and write per-shot xG.
+
+    Args:
+        logger (Logger, optional): The logger to use. Defaults to None.
+        events_file (Path, optional): The silver events file.
+        frames_file (Path, optional): The silver 360 freeze frames file (optional input).
+        output_dir (Path, optional): The gold xG directory.
+        overwrite (bool, optional): Retrain even when the inputs are unchanged. Defaults to False.
+
+    Returns:
+        Path | None: The per-shot xG table, or None when there is nothing to train on.
+    """
+    import joblib
+
+    if logger is None:
+        logger = NullLogger()
+    if not events_file.exists():
+        logger.warning(f"No silver events at {events_file}, run the silver layer first. Skipping xG.")
+        return None
+    inputs = {"format": XG_FORMAT}
+    for name, f in [("events", events_file), ("frames", frames_file)]:
+        stat = f.stat() if f.exists() else None
+        inputs[name] = [stat.st_size, stat.st_mtime_ns] if stat else None
+    state_file = output_dir / STATE_FILENAME
+    output_file = output_dir / SHOTS_XG_FILENAME
+    outputs = [output_file, output_dir / MODEL_FILENAME, output_dir / METRICS_FILENAME]
+    if not overwrite and state_file.exists() and all(f.exists() for f in outputs):
+        try:
+            state = json.loads(state_file.read_text())
+        except ValueError:
+            state = None
+        if state == inputs:
+            logger.info(f"xG in {output_dir} is up to date, skipping.")
+            return output_file
+    events = pl.scan_parquet(events_file)
+    frames = pl.scan_parquet(frames_file) if frames_file.exists() else None
+    shots = build_shot_features_query(events, frames).collect()
+    if shots["is_goal"].n_unique() < 2:
+        logger.warning(f"Need both goals and non-goals to train xG, got {len(shots)} shots. Skipping xG.")
+        return None
+
+    model, xg, metrics = train_xg_model(shots)
+    shots = shots.with_columns(pl.Series("xg", xg, nan_to_null=True))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Forget the previous model until this one is written
+    state_file.unlink(missing_ok=True)
+    tmp_file = output_file.with_suffix(".parquet.tmp")
+    with measure_file(events_file, output_file):
+        shots.write_parquet(tmp_file, compression="zstd")
+        tmp_file.replace(output_file)
+    joblib.dump(model, output_dir / MODEL_FILENAME)
+    (output_dir / METRICS_FILENAME).write_text(json.dumps(metrics, indent=2))
+    state_file.write_text(json.dumps(inputs, indent=1))
+    logger.info(
+        f"Trained xG on {metrics['shots']} shots from {metrics['matches']} matches "
+        f"(out-of-fold log loss: {metrics.get('cv_log_loss', float('nan')):.4f}); wrote {output_file}"
+    )
+    return output_file
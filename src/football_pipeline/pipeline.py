@@ -5,165 +5,290 @@ This module contains the main pipeline execution functions that can be
 imported and used both by the CLI and the main.py script.
 """
 
+import json
+import time
+from dataclasses import asdict
+from typing import TYPE_CHECKING
+
+from football_pipeline.config import PipelineConfig
 from football_pipeline.utils.constants import SUPPORTED_SOURCES, DATA_DIR, LOGS_DIR
 from football_pipeline.utils.logging import setup_logger
+from football_pipeline.utils.manifest import merge_shard_manifests
+from football_pipeline.utils.metrics import finish_run, start_run
+from football_pipeline.utils.scheduler import Stage, log_critical_path_report, run_stages
+from football_pipeline.utils.sharding import (
+    clear_shard_marker,
+    clear_shard_markers,
+    finished_shards,
+    write_shard_marker,
+)
 
-# Bronze layer imports
-from football_pipeline.bronze.open_data.ingest import open_data_ingest
-from football_pipeline.bronze.j1_league.ingest import j1_league_ingest
+if TYPE_CHECKING:
+    from football_pipeline.utils.planning import WorkPlan
 
+# Layer modules (and with them pandas/Polars/pyarrow/scikit-learn) are imported
+# only when their stages are declared, so `--help` and importing this module stay fast
 
-# Gold layer imports
-# TODO: Import gold layer functions when implemented
+# Per-match stages that a sharded run (--shard i/N) splits between the shards;
+# every other stage reads or writes data of all matches and runs in --finalize
+SHARDED_STAGES = [
+    "bronze/open_data/matches",
+    "bronze/open_data/lineups",
+    "bronze/open_data/events",
+    "bronze/open_data/three-sixty",
+    "silver/open_data/spadl",
+]
 
-# Paths are now dynamic - no global variables needed
+# Stages that fan their files out to the worker processes, planned by --plan (utils/planning.py)
+PLANNED_STAGES = SHARDED_STAGES + ["bronze/j1_league/mappings"]
 
-def run_bronze_layer(source_name: str | None = None):
+def run_bronze_layer(source_name: str | None = None, config: PipelineConfig | None = None):
     """
     Run bronze layer processing for specified source(s).
     """
-    # Setup logger only when this function is called
-    log_path = LOGS_DIR / "open_data" / "bronze" / "bronze.log"
-    logger = setup_logger(log_path, "bronze_layer")
+    return run_pipeline(bronze=True, silver=False, gold=False, source=source_name, config=config)
 
-    # Simple error handling defaults
-    fail_fast = True
-    continue_on_error = False
+def run_silver_layer(source_name: str | None = None, config: PipelineConfig | None = None):
+    """
+    Run silver layer processing for specified source(s).
+    """
+    return run_pipeline(bronze=False, silver=True, gold=False, source=source_name, config=config)
 
-    logger.info("=== BRONZE LAYER PROCESSING ===")
-    logger.debug(f"Error handling: fail_fast={fail_fast}, continue_on_error={continue_on_error}")
+def run_gold_layer(source_name: str | None = None, config: PipelineConfig | None = None):
+    """
+    Run gold layer processing for specified source(s).
+    """
+    return run_pipeline(bronze=False, silver=False, gold=True, source=source_name, config=config)
 
-    if source_name:
-        sources = [source_name]
-        logger.info(f"Processing single source: {source_name}")
-    else:
-        sources = SUPPORTED_SOURCES
-        logger.info(f"Processing all sources: {', '.join(sources)}")
-    
-    errors = []
-    
-    for source in sources:
-        logger.info(f"Starting {source} bronze layer processing...")
-        logger.debug(f"Source: {source}, Available sources: {SUPPORTED_SOURCES}")
-        
-        try:
-            match source:
-                case "open_data":
-                    open_data_ingest(logger)
-                    logger.info(f"✓ {source} bronze layer completed successfully")
-                case "j1_league":
-                    j1_league_ingest(logger)
-                    logger.info(f"✓ {source} bronze layer completed successfully")
-                case _:
-                    logger.error(f"Unknown source: {source}")
-                    logger.debug(f"Supported sources: {SUPPORTED_SOURCES}")
-                    if fail_fast:
-                        raise ValueError(f"Unknown source: {source}")
-        except Exception as e:
-            error_msg = f"✗ Failed to process {source} bronze layer: {e}"
-            logger.error(error_msg)
-            logger.debug(f"Exception details", exc_info=True)
-            
-            errors.append((source, e))
-            
-            if fail_fast:
-                raise
-            elif not continue_on_error:
-                logger.warning(f"Stopping bronze processing due to error in {source}")
-                break
-            else:
-                logger.warning(f"Continuing with next source despite error in {source}")
-    
-    # Report final status
-    if errors:
-        logger.warning(f"Bronze layer completed with {len(errors)} errors: {[err[0] for err in errors]}")
-        if not continue_on_error and not fail_fast:
-            raise Exception(f"Bronze layer failed for sources: {[err[0] for err in errors]}")
-    else:
-        logger.info("✓ Bronze Layer Processing Complete")
+def bronze_stages(source: str, config: PipelineConfig, logger) -> list[Stage]:
+    """
+    Declare the bronze stages of a source and the stages each one reads from.
+    """
+    match source:
+        case "open_data":
+            from football_pipeline.bronze.open_data import ingest as open_data_bronze
 
-def run_silver_layer(source_name: str | None = None):
+            stages = [
+                Stage("bronze/open_data/competitions", lambda: open_data_bronze.ingest_competitions_local(config)),
+                Stage("bronze/open_data/matches", lambda: open_data_bronze.ingest_matches_local(logger, config)),
+                Stage("bronze/open_data/lineups", lambda: open_data_bronze.ingest_lineups_local(logger, config)),
+                Stage("bronze/open_data/events", lambda: open_data_bronze.ingest_events_local(logger, config)),
+                Stage("bronze/open_data/three-sixty", lambda: open_data_bronze.ingest_three_sixty_events_local(logger, config)),
+            ]
+            # Compaction maps matches to competition/season, so it also waits for matches
+            for dataset in ["events", "lineups", "three-sixty"]:
+                stages.append(Stage(
+                    f"bronze/open_data/compact/{dataset}",
+                    lambda dataset=dataset: open_data_bronze.compact_bronze_local(logger, config, datasets=[dataset]),
+                    ["bronze/open_data/matches", f"bronze/open_data/{dataset}"],
+                ))
+            stages.append(Stage(
+                "bronze/open_data/index",
+                lambda: open_data_bronze.index_bronze_local(logger),
+                ["bronze/open_data/matches"] + [f"bronze/open_data/compact/{d}" for d in ["events", "lineups", "three-sixty"]],
+            ))
+            return stages
+        case "j1_league":
+            from football_pipeline.bronze.j1_league import ingest as j1_league_bronze
+
+            return [
+                Stage("bronze/j1_league/matches", lambda: j1_league_bronze.ingest_j1_league_matches(logger, config)),
+                Stage("bronze/j1_league/events", lambda: j1_league_bronze.ingest_j1_league_events(logger, config)),
+                Stage("bronze/j1_league/physical", lambda: j1_league_bronze.ingest_j1_league_physical(logger, config)),
+                Stage("bronze/j1_league/mappings", lambda: j1_league_bronze.ingest_j1_league_mappings(logger, config)),
+            ]
+        case _:
+            raise ValueError(f"Unknown source: {source}")
+
+def silver_stages(source: str, config: PipelineConfig, logger) -> list[Stage]:
     """
-    Run silver layer processing for specified source(s).
+    Declare the silver stages of a source and the stages each one reads from.
     """
-    # Setup logger for silver layer
-    log_path = LOGS_DIR / "open_data" / "silver" / "silver.log"
-    logger = setup_logger(log_path, "silver_layer")
-    
-    logger.info("=== SILVER LAYER PROCESSING ===")
-    
-    if source_name:
-        sources = [source_name]
-        logger.info(f"Processing single source: {source_name}")
-    else:
-        sources = SUPPORTED_SOURCES
-        logger.info(f"Processing all sources: {', '.join(sources)}")
-    
-    for source in sources:
-        logger.info(f"Starting {source} silver layer processing...")
-        logger.debug(f"Source: {source}, Available sources: {SUPPORTED_SOURCES}")
-        
-        try:
-            match source:
-                case "open_data":
-                    logger.info(f"✓ {source} silver layer completed successfully")
-                case "j1_league":
-                    logger.info(f"⚠ {source} silver layer not yet implemented")
-                case _:
-                    logger.error(f"Unknown source: {source}")
-                    logger.debug(f"Supported sources: {SUPPORTED_SOURCES}")
-        except Exception as e:
-            logger.error(f"✗ Failed to process {source} silver layer: {e}")
-            logger.debug(f"Exception details", exc_info=True)
-            raise
-
-def run_gold_layer(source_name: str | None = None):
+    match source:
+        case "open_data":
+            from football_pipeline.silver.open_data.events.base import build_silver_events
+            from football_pipeline.silver.open_data.lineups import build_silver_lineups
+            from football_pipeline.silver.open_data.spadl import build_spadl_actions
+            from football_pipeline.silver.open_data.star import build_star_schema
+            from football_pipeline.silver.open_data.three_sixty import build_silver_three_sixty
+
+            return [
+                Stage(
+                    "silver/open_data/events",
+                    lambda: build_silver_events(logger, overwrite=config.force),
+                    ["bronze/open_data/compact/events"],
+                ),
+                Stage(
+                    "silver/open_data/lineups",
+                    lambda: build_silver_lineups(logger, overwrite=config.force),
+                    ["bronze/open_data/lineups"],
+                ),
+                Stage(
+                    "silver/open_data/three-sixty",
+                    lambda: build_silver_three_sixty(logger, overwrite=config.force),
+                    ["bronze/open_data/compact/three-sixty"],
+                ),
+                # Converts the landing events; bronze matches give home teams and partitions
+                Stage("silver/open_data/spadl", lambda: build_spadl_actions(logger, config), ["bronze/open_data/matches"]),
+                Stage(
+                    "silver/open_data/star",
+                    lambda: build_star_schema(logger, overwrite=config.force),
+                    ["silver/open_data/events", "silver/open_data/lineups", "bronze/open_data/competitions"],
+                ),
+            ]
+        case "j1_league":
+            from football_pipeline.silver.j1_league.physical import build_silver_physical
+
+            return [
+                # Matches give each physical row its competition and season
+                Stage(
+                    "silver/j1_league/physical",
+                    lambda: build_silver_physical(logger, overwrite=config.force),
+                    ["bronze/j1_league/physical", "bronze/j1_league/matches"],
+                ),
+            ]
+        case _:
+            raise ValueError(f"Unknown source: {source}")
+
+def gold_stages(source: str, config: PipelineConfig, logger) -> list[Stage]:
     """
-    Run gold layer processing for specified source(s).
+    Declare the gold stages of a source and the stages each one reads from.
     """
-    # Setup logger for gold layer
-    log_path = LOGS_DIR / "open_data" / "gold" / "gold.log"
-    logger = setup_logger(log_path, "gold_layer")
-    
-    logger.info("=== GOLD LAYER PROCESSING ===")
-    
-    if source_name:
-        sources = [source_name]
-        logger.info(f"Processing single source: {source_name}")
-    else:
-        sources = SUPPORTED_SOURCES
-        logger.info(f"Processing all sources: {', '.join(sources)}")
-    
-    for source in sources:
-        logger.info(f"Starting {source} gold layer processing...")
-        logger.debug(f"Source: {source}, Available sources: {SUPPORTED_SOURCES}")
-        
-        try:
-            # TODO: Update build_xg_model to accept source_name parameter
-            # build_xg_model(source)
+    match source:
+        case "open_data":
+            from football_pipeline.gold.open_data.xg import build_xg_model
+
+            return [
+                Stage(
+                    "gold/open_data/xg",
+                    lambda: build_xg_model(logger, overwrite=config.force),
+                    ["silver/open_data/events", "silver/open_data/three-sixty"],
+                ),
+            ]
+        case "j1_league":
             logger.warning(f"⚠ Gold layer processing for {source} not yet implemented")
-            logger.debug(f"TODO: Implement gold layer processing for {source}")
-        except Exception as e:
-            logger.error(f"✗ Failed to process {source} gold layer: {e}")
-            logger.debug(f"Exception details", exc_info=True)
-            raise
+            return []
+        case _:
+            raise ValueError(f"Unknown source: {source}")
+
+def declare_stages(
+    bronze: bool,
+    silver: bool,
+    gold: bool,
+    source: str | None,
+    config: PipelineConfig,
+) -> list[Stage]:
+    """
+    Declare the stages of the requested layers and sources, with their layer loggers.
 
-def run_pipeline(bronze: bool = True, silver: bool = False, gold: bool = False, source: str | None = None):
+    Args:
+        bronze: Whether to include the bronze layer
+        silver: Whether to include the silver layer
+        gold: Whether to include the gold layer
+        source: Source to process (None for all sources)
+        config: Run options handed to every stage
+
+    Returns:
+        list[Stage]: The stages, in declaration order.
+    """
+    sources = [source] if source else SUPPORTED_SOURCES
+    stages = []
+    if bronze:
+        logger = setup_logger(
+            LOGS_DIR / "open_data" / "bronze" / "bronze.log", "bronze_layer", json_lines=config.log_json
+        )
+        for name in sources:
+            stages.extend(bronze_stages(name, config, logger))
+    if silver:
+        logger = setup_logger(
+            LOGS_DIR / "open_data" / "silver" / "silver.log", "silver_layer", json_lines=config.log_json
+        )
+        for name in sources:
+            stages.extend(silver_stages(name, config, logger))
+    if gold:
+        logger = setup_logger(
+            LOGS_DIR / "open_data" / "gold" / "gold.log", "gold_layer", json_lines=config.log_json
+        )
+        for name in sources:
+            stages.extend(gold_stages(name, config, logger))
+    return stages
+
+def plan_pipeline(
+    bronze: bool = True,
+    silver: bool = False,
+    gold: bool = False,
+    source: str | None = None,
+    config: PipelineConfig | None = None,
+) -> list[tuple[str, "WorkPlan | str"]]:
+    """
+    Plan the per-file stages of a run without running them (``--plan``).
+
+    Every requested stage in PLANNED_STAGES lists and sizes its pending inputs
+    against its manifest and stops before any file is processed; the other
+    stages are not run at all.
+
+    Args:
+        bronze: Whether to include the bronze layer
+        silver: Whether to include the silver layer
+        gold: Whether to include the gold layer
+        source: Source to plan (None for all sources)
+        config: Run options (workers, force, shard, ...)
+
+    Returns:
+        list[tuple]: (stage name, WorkPlan, or a message when the stage has nothing to plan).
+    """
+    from football_pipeline.utils.planning import PlanOnly, dry_run
+
+    config = config or PipelineConfig()
+    stages = [
+        stage for stage in declare_stages(bronze, silver, gold, source, config)
+        if stage.name in PLANNED_STAGES and (config.shard is None or stage.name in SHARDED_STAGES)
+    ]
+    plans = []
+    with dry_run():
+        for stage in stages:
+            try:
+                stage.fn()
+                plans.append((stage.name, "no input files"))
+            except PlanOnly as planned:
+                plans.append((stage.name, planned.plan))
+            except Exception as e:
+                plans.append((stage.name, f"cannot plan: {e}"))
+    return plans
+
+def run_pipeline(
+    bronze: bool = True,
+    silver: bool = False,
+    gold: bool = False,
+    source: str | None = None,
+    config: PipelineConfig | None = None,
+    finalize: bool = False,
+):
     """
     Run the complete pipeline with specified layers and sources.
+
+    With ``config.shard`` set only the shard's part of SHARDED_STAGES runs (see
+    utils/sharding.py). ``finalize`` completes a sharded round: it checks that
+    every shard finished, merges their manifests and runs the requested layers
+    once, which skips the matches the shards already processed.
     
     Args:
         bronze: Whether to run bronze layer
         silver: Whether to run silver layer  
         gold: Whether to run gold layer
         source: Source to process (None for all sources)
+        config: Run options such as the worker count (None for defaults)
+        finalize: Finalize a sharded round instead of running a shard
     """
+    config = config or PipelineConfig()
+    if finalize and config.shard is not None:
+        raise ValueError("A shard cannot finalize its own round, run --finalize separately")
     # Setup main pipeline logger
     main_log_path = LOGS_DIR / "open_data" / "pipeline.log"
     
     # Simple logging defaults
     import logging
-    main_logger = setup_logger(main_log_path, "main_pipeline", logging.INFO, logging.DEBUG)
+    main_logger = setup_logger(main_log_path, "main_pipeline", logging.INFO, logging.DEBUG, json_lines=config.log_json)
     
     main_logger.info("🚀 Football Pipeline Starting")
     main_logger.info(f"Configuration: BRONZE={bronze}, SILVER={silver}, GOLD={gold}")
@@ -176,25 +301,59 @@ def run_pipeline(bronze: bool = True, silver: bool = False, gold: bool = False,
             (DATA_DIR / layer).mkdir(parents=True, exist_ok=True)
         LOGS_DIR.mkdir(parents=True, exist_ok=True)
         main_logger.debug("✓ Directories verified")
+
+        shard_runs = None
+        if finalize:
+            shard_count, shard_runs = finished_shards()
+            merged = merge_shard_manifests(DATA_DIR)
+            main_logger.info(f"Finalizing {shard_count} shards: merged {merged} shard manifests")
+            for run in shard_runs:
+                main_logger.info(
+                    f"  shard {run['shard']}: run {run['run_id']}, {run['wall_s']:.1f}s, "
+                    f"{run['files']} files, finished {run['finished_at']}"
+                )
+        elif config.shard is not None:
+            # A re-run shard counts as unfinished until it succeeds again
+            clear_shard_marker(config.shard)
         
-        # BRONZE STAGE
-        if bronze:
-            main_logger.info("Starting Bronze Layer Processing")
-            run_bronze_layer(source)
-            main_logger.info("✓ Bronze Layer Processing Complete")
-
-        # SILVER STAGE
-        if silver:
-            main_logger.info("Starting Silver Layer Processing")
-            run_silver_layer(source)
-            main_logger.info("✓ Silver Layer Processing Complete")
-
-        # GOLD STAGE
-        if gold:
-            main_logger.info("Starting Gold Layer Processing")
-            run_gold_layer(source)
-            main_logger.info("✓ Gold Layer Processing Complete")
-            
+        # Declare every requested stage, then run them concurrently as their inputs become ready
+        stages = declare_stages(bronze, silver, gold, source, config)
+
+        if config.shard is not None:
+            deferred = [stage.name for stage in stages if stage.name not in SHARDED_STAGES]
+            stages = [stage for stage in stages if stage.name in SHARDED_STAGES]
+            main_logger.info(f"Shard {config.shard}: {len(deferred)} shared stages are left to --finalize")
+            main_logger.debug(f"Stages left to --finalize: {deferred}")
+
+        main_logger.info(f"Running {len(stages)} stages on up to {config.workers or 'one per CPU'} workers")
+        label = config.shard.name if config.shard is not None else "finalize" if finalize else None
+        start_run(profile=config.profile, label=label)
+        start = time.perf_counter()
+        report = {"config": asdict(config), "source": source or "all"}
+        if shard_runs is not None:
+            report["shards"] = shard_runs
+        try:
+            results = run_stages(stages, config.workers, main_logger, fail_fast=True, continue_on_error=False)
+        finally:
+            # Failed runs get a report too
+            report_file = finish_run(report)
+            main_logger.info(f"Run report written to {report_file}")
+        log_critical_path_report(stages, results, time.perf_counter() - start, main_logger)
+
+        if config.shard is not None:
+            summary = json.loads(report_file.read_text())
+            marker = write_shard_marker(config.shard, {
+                "run_id": summary["run_id"],
+                "layers": [layer for layer, run in [("bronze", bronze), ("silver", silver), ("gold", gold)] if run],
+                "source": source or "all",
+                "wall_s": summary["wall_s"],
+                "files": summary["files"],
+                "stages": summary["stages"],
+            })
+            main_logger.info(f"Shard {config.shard} finished, marked in {marker}")
+        elif finalize:
+            clear_shard_markers()
+
         main_logger.info("🎉 Pipeline execution completed successfully!")
         return True
         
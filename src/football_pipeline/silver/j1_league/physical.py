@@ -0,0 +1,294 @@
+"""
+Silver Hudl physical data for the J1 League.
+
+Bronze keeps the Hudl export as inferred (one row per player, match and phase,
+64-bit numbers and strings). Silver writes three tables to SILVER_J1_PHYSICAL:
+
+    physical.parquet        the bronze rows with compact dtypes: Int32 ids,
+                            Float32 metrics, UInt16 counts, categorical names,
+                            positions and phases
+    player_match.parquet    one row per player per match (phases summed)
+    player_season.parquet   one row per player per competition/season
+
+The aggregates hold distance, high-speed running and sprint totals, their
+per-90 rates and the top speed, so dashboards read them instead of rescanning
+the full table. Competition and season come from the bronze J1 matches.
+
+The export has no published field specification, so columns are matched by
+name against PHYSICAL_ALIASES (case, spaces and dashes ignored); metrics the
+export does not have come back as nulls. The build is skipped when the bronze
+files behind it are unchanged (``_physical_state.json``).
+"""
+
+import json
+import re
+from pathlib import Path
+
+import polars as pl
+
+from football_pipeline.utils.constants import BRONZE_J1_MATCHES, BRONZE_J1_PHYSICAL, SILVER_J1_PHYSICAL
+from football_pipeline.utils.logging import NullLogger
+from football_pipeline.utils.metrics import measure_file
+
+PHYSICAL_FILENAME = "physical.parquet"
+PLAYER_MATCH_FILENAME = "player_match.parquet"
+PLAYER_SEASON_FILENAME = "player_season.parquet"
+STATE_FILENAME = "_physical_state.json"
+
+# Silver column -> names it may have in the export (normalized: lower case, "_" separated)
+PHYSICAL_ALIASES = {
+    "match_id": ["match_id", "statsbomb_match_id", "hudl_match_id", "game_id"],
+    "team_id": ["team_id", "statsbomb_team_id", "hudl_team_id"],
+    "team_name": ["team_name", "team"],
+    "player_id": ["player_id", "statsbomb_player_id", "hudl_player_id", "athlete_id"],
+    "player_name": ["player_name", "player", "athlete_name", "name"],
+    "position": ["position", "position_name", "player_position"],
+    "phase": ["phase", "period", "half", "match_phase"],
+    "minutes_played": ["minutes_played", "minutes", "mins_played", "duration_minutes"],
+    "total_distance": ["total_distance", "distance", "distance_covered", "total_distance_m"],
+    "high_speed_running_distance": [
+        "high_speed_running_distance", "high_speed_running", "hsr_distance", "hsr", "hi_distance",
+    ],
+    "sprint_distance": ["sprint_distance", "sprinting_distance", "sprint_distance_m"],
+    "sprint_count": ["sprint_count", "sprints", "number_of_sprints", "n_sprints"],
+    "max_speed": ["max_speed", "top_speed", "peak_speed", "max_velocity"],
+}
+
+ID_COLUMNS = ["match_id", "team_id", "player_id"]
+CATEGORICAL_COLUMNS = ["team_name", "player_name", "position", "phase"]
+DISTANCE_COLUMNS = ["total_distance", "high_speed_running_distance", "sprint_distance"]
+COUNT_COLUMNS = ["sprint_count"]
+
+REQUIRED_COLUMNS = ["match_id", "player_id"]
+
+INT32_MAX = 2**31 - 1
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[^0-9a-z]+", "_", name.strip().lower()).strip("_")
+
+
+def resolve_physical_columns(columns: list[str]) -> dict[str, str]:
+    """
+    Match the columns of a Hudl physical export to the silver column names.
+
+    Args:
+        columns (list[str]): The bronze column names.
+
+    Returns:
+        dict[str, str]: Silver column -> bronze column, for the columns found.
+    """
+    by_normalized = {}
+    for column in columns:
+        by_normalized.setdefault(_normalize(column), column)
+    resolved = {}
+    for target, aliases in PHYSICAL_ALIASES.items():
+        for alias in aliases:
+            if alias in by_normalized and by_normalized[alias] not in resolved.values():
+                resolved[target] = by_normalized[alias]
+                break
+    return resolved
+
+
+def _id_dtype(lf: pl.LazyFrame, column: str) -> pl.DataType:
+    """Int32 when every id fits, otherwise Int64 (one pass over the id column only)."""
+    bounds = lf.select(pl.col(column).min().alias("low"), pl.col(column).max().alias("high")).collect()
+    low, high = bounds.row(0)
+    if low is None or (-INT32_MAX <= low and high <= INT32_MAX):
+        return pl.Int32
+    return pl.Int64
+
+
+def build_physical_query(physical_file: Path, logger=None) -> pl.LazyFrame:
+    """
+    Build the lazy query that renames the Hudl columns and casts them to compact dtypes.
+
+    Args:
+        physical_file (Path): The bronze hudl_physical.parquet file.
+        logger (Logger, optional): The logger to use. Defaults to None.
+
+    Returns:
+        pl.LazyFrame: The columns of PHYSICAL_ALIASES in that order.
+    """
+    if logger is None:
+        logger = NullLogger()
+    lf = pl.scan_parquet(physical_file)
+    resolved = resolve_physical_columns(lf.collect_schema().names())
+    missing = [c for c in REQUIRED_COLUMNS if c not in resolved]
+    if missing:
+        raise ValueError(f"No {', '.join(missing)} column in {physical_file}, cannot build silver physical data.")
+    absent = [c for c in PHYSICAL_ALIASES if c not in resolved]
+    if absent:
+        logger.warning(f"Hudl physical export has no {', '.join(absent)} column, writing nulls.")
+    lf = lf.select(pl.col(source).alias(target) for target, source in resolved.items())
+
+    casts = []
+    for column in PHYSICAL_ALIASES:
+        if column not in resolved:
+            expr = pl.lit(None)
+        else:
+            expr = pl.col(column)
+        if column in ID_COLUMNS:
+            dtype = _id_dtype(lf, column) if column in resolved else pl.Int32
+            expr = expr.cast(pl.Int64).cast(dtype)
+        elif column in CATEGORICAL_COLUMNS:
+            expr = expr.cast(pl.String).cast(pl.Categorical)
+        elif column in COUNT_COLUMNS:
+            expr = expr.cast(pl.Float64).round().cast(pl.UInt16, strict=False)
+        else:
+            expr = expr.cast(pl.Float32)
+        casts.append(expr.alias(column))
+    return lf.select(casts)
+
+
+def _season_query(matches_file: Path) -> pl.LazyFrame | None:
+    """match_id -> competition_id, season_id, season_name from the bronze J1 matches."""
+    if not matches_file.exists():
+        return None
+    return pl.scan_parquet(matches_file).select(
+        pl.col("match_id").cast(pl.Int64),
+        pl.col("competition_competition_id").cast(pl.Int32).alias("competition_id"),
+        pl.col("season_season_id").cast(pl.Int32).alias("season_id"),
+        pl.col("season_season_name").cast(pl.Categorical).alias("season_name"),
+    ).unique("match_id")
+
+
+def _sum(column: str) -> pl.Expr:
+    # Null rather than 0 for a metric the export does not have
+    return pl.when(pl.col(column).count() > 0).then(pl.col(column).sum()).alias(column)
+
+
+def _totals() -> list[pl.Expr]:
+    return [
+        _sum("minutes_played"),
+        *[_sum(c) for c in DISTANCE_COLUMNS],
+        _sum("sprint_count").cast(pl.UInt32),
+        pl.col("max_speed").max(),
+    ]
+
+
+def _per_90() -> list[pl.Expr]:
+    minutes = pl.when(pl.col("minutes_played") > 0).then(pl.col("minutes_played"))
+    return [(pl.col(c) * 90 / minutes).cast(pl.Float32).alias(f"{c}_per_90") for c in DISTANCE_COLUMNS]
+
+
+def build_player_match_query(physical: pl.LazyFrame, seasons: pl.LazyFrame | None = None) -> pl.LazyFrame:
+    """
+    Aggregate silver physical rows to one row per player per match.
+
+    Args:
+        physical (pl.LazyFrame): The query of build_physical_query (or the silver table).
+        seasons (pl.LazyFrame, optional): match_id -> competition_id, season_id, season_name.
+
+    Returns:
+        pl.LazyFrame: Keys, summed minutes/distances/sprints, max_speed and per-90 distances.
+    """
+    player_match = (
+        physical.group_by(ID_COLUMNS)
+        .agg(pl.col("team_name", "player_name", "position").drop_nulls().first(), *_totals())
+        .with_columns(_per_90())
+    )
+    if seasons is None:
+        player_match = player_match.with_columns(
+            pl.lit(None, pl.Int32).alias("competition_id"),
+            pl.lit(None, pl.Int32).alias("season_id"),
+            pl.lit(None, pl.String).cast(pl.Categorical).alias("season_name"),
+        )
+    else:
+        seasons = seasons.with_columns(pl.col("match_id").cast(physical.collect_schema()["match_id"]))
+        player_match = player_match.join(seasons, on="match_id", how="left")
+    first = ["competition_id", "season_id", "season_name", *ID_COLUMNS]
+    return player_match.select(*first, pl.exclude(first)).sort(["competition_id", "season_id", "match_id", "player_id"])
+
+
+def build_player_season_query(player_match: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Aggregate player-match rows to one row per player per competition/season.
+
+    Args:
+        player_match (pl.LazyFrame): The query of build_player_match_query.
+
+    Returns:
+        pl.LazyFrame: Keys, matches played, season totals, max_speed and per-90 distances.
+    """
+    keys = ["competition_id", "season_id", "player_id"]
+    return (
+        player_match.group_by(keys)
+        .agg(
+            pl.col("season_name").first(),
+            pl.col("player_name").drop_nulls().last(),
+            pl.col("team_id").drop_nulls().last(),
+            pl.col("team_name").drop_nulls().last(),
+            pl.col("match_id").n_unique().cast(pl.UInt16).alias("matches"),
+            *_totals(),
+        )
+        .with_columns(_per_90())
+        .sort(keys)
+    )
+
+
+def _file_inputs(files: list[Path]) -> dict[str, list[int]]:
+    """Stat-based fingerprint of the bronze files behind the outputs."""
+    return {f.name: [f.stat().st_size, f.stat().st_mtime_ns] for f in files if f.exists()}
+
+
+def build_silver_physical(
+    logger=None,
+    physical_file: Path = BRONZE_J1_PHYSICAL / "hudl_physical.parquet",
+    matches_file: Path = BRONZE_J1_MATCHES / "sb_matches.parquet",
+    output_dir: Path = SILVER_J1_PHYSICAL,
+    overwrite: bool = False,
+) -> Path | None:
+    """
+    Build the compact silver physical table and the player-match/player-season aggregates.
+
+    Args:
+        logger (Logger, optional): The logger to use. Defaults to None.
+        physical_file (Path, optional): The bronze Hudl physical file.
+        matches_file (Path, optional): The bronze J1 matches file (competition/season of each match).
+        output_dir (Path, optional): The silver physical directory.
+        overwrite (bool, optional): Rebuild even if the bronze files are unchanged. Defaults to False.
+
+    Returns:
+        Path | None: The player-match file, or None when there is no bronze physical data.
+    """
+    if logger is None:
+        logger = NullLogger()
+    if not physical_file.exists():
+        logger.warning(f"No bronze physical data at {physical_file}, skipping silver physical.")
+        return None
+    output_dir.mkdir(parents=True, exist_ok=True)
+    physical_output = output_dir / PHYSICAL_FILENAME
+    player_match_output = output_dir / PLAYER_MATCH_FILENAME
+    player_season_output = output_dir / PLAYER_SEASON_FILENAME
+    state_file = output_dir / STATE_FILENAME
+
+    inputs = _file_inputs([physical_file, matches_file])
+    outputs = [physical_output, player_match_output, player_season_output]
+    if not overwrite and state_file.exists() and all(f.exists() for f in outputs):
+        if json.loads(state_file.read_text()) == inputs:
+            logger.info("Silver physical tables are up to date, skipping.")
+            return player_match_output
+    if not matches_file.exists():
+        logger.warning(f"No bronze J1 matches at {matches_file}, physical aggregates will have no season.")
+
+    bronze_files = [f for f in [physical_file, matches_file] if f.exists()]
+    # Each table reads the one before it: the casts and the player-match totals are done once
+    for query, output_file in [
+        (lambda: build_physical_query(physical_file, logger), physical_output),
+        (lambda: build_player_match_query(pl.scan_parquet(physical_output), _season_query(matches_file)),
+         player_match_output),
+        (lambda: build_player_season_query(pl.scan_parquet(player_match_output)), player_season_output),
+    ]:
+        tmp_file = output_file.with_suffix(".parquet.tmp")
+        with measure_file(bronze_files, output_file):
+            query().sink_parquet(tmp_file, compression="zstd")
+            tmp_file.replace(output_file)
+    state_file.write_text(json.dumps(inputs, indent=1, sort_keys=True))
+
+    n_rows = {f.name: pl.scan_parquet(f).select(pl.len()).collect().item() for f in outputs}
+    logger.info(
+        f"Successfully wrote silver physical data to {output_dir}: "
+        + ", ".join(f"{name} {rows} rows" for name, rows in n_rows.items())
+    )
+    return player_match_output
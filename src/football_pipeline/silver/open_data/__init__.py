@@ -0,0 +1 @@
+# This file makes the open_data directory a Python package
@@ -0,0 +1,139 @@
+"""
+Silver events for the StatsBomb open data.
+
+The whole build is one lazy query over the compacted bronze events
+(competition/season partitioned, match_id column) that is streamed to Parquet
+with sink_parquet, so the event history never has to fit in memory and Polars
+only reads the columns and partitions the query needs. Reruns only transform the
+partitions that changed since the last build (see silver/open_data/incremental.py).
+
+Silver events differ from bronze in that:
+- location columns are split into numeric x/y(/z) columns,
+- the event clock is typed (timestamp as Time) and small counters are downcast,
+- boolean flags that StatsBomb only writes when true are false instead of null,
+- match_id, competition_id and season_id are regular columns.
+"""
+
+from pathlib import Path
+
+import polars as pl
+
+from football_pipeline.silver.open_data.incremental import sink_incremental
+from football_pipeline.utils.constants import BRONZE_OPEN_DATA_EVENTS_COMPACTED, SILVER_OPEN_DATA_EVENTS_DIR
+from football_pipeline.utils.logging import NullLogger
+
+# Location list columns -> the axis suffixes they are split into
+LOCATION_COLUMNS = {
+    "location": ("x", "y"),
+    "pass_end_location": ("x", "y"),
+    "carry_end_location": ("x", "y"),
+    "goalkeeper_end_location": ("x", "y"),
+    "shot_end_location": ("x", "y", "z"),
+}
+
+# Narrower types for the event clock and counters
+COLUMN_CASTS = {
+    "match_id": pl.Int64,
+    "competition_id": pl.Int64,
+    "season_id": pl.Int64,
+    "index": pl.Int32,
+    "period": pl.Int8,
+    "minute": pl.Int16,
+    "second": pl.Int8,
+    "possession": pl.Int32,
+}
+
+KEY_COLUMNS = ["match_id", "competition_id", "season_id"]
+
+SILVER_EVENTS_FILENAME = "events.parquet"
+
+
+def split_location_columns(lf: pl.LazyFrame, columns: dict[str, tuple[str, ...]] = LOCATION_COLUMNS) -> pl.LazyFrame:
+    """
+    Replace coordinate list columns with one Float64 column per axis.
+    Example: 'pass_end_location' [x, y] -> 'pass_end_location_x', 'pass_end_location_y'
+
+    Args:
+        lf (pl.LazyFrame): Events with list[f64] location columns.
+        columns (dict, optional): Column -> axis suffixes. Defaults to LOCATION_COLUMNS.
+
+    Returns:
+        pl.LazyFrame: The events with the split columns in place of the lists.
+    """
+    schema = lf.collect_schema()
+    present = {col: axes for col, axes in columns.items() if col in schema}
+    selection = []
+    for col in schema.names():
+        if col in present:
+            # Shorter lists (e.g. shot end locations without z) give nulls
+            selection.extend(
+                pl.col(col).list.get(i, null_on_oob=True).cast(pl.Float64).alias(f"{col}_{axis}")
+                for i, axis in enumerate(present[col])
+            )
+        else:
+            selection.append(pl.col(col))
+    return lf.select(selection)
+
+
+def build_silver_events_query(compacted_dir: Path | list[Path] = BRONZE_OPEN_DATA_EVENTS_COMPACTED) -> pl.LazyFrame:
+    """
+    Build the lazy silver events query over the compacted bronze events.
+
+    Args:
+        compacted_dir (Path | list[Path], optional): The compacted bronze events dataset,
+            or some of its partition files. Defaults to BRONZE_OPEN_DATA_EVENTS_COMPACTED.
+
+    Returns:
+        pl.LazyFrame: One row per event with the silver columns.
+    """
+    lf = pl.scan_parquet(
+        compacted_dir,
+        hive_partitioning=True,
+        missing_columns="insert",
+        extra_columns="ignore",
+    )
+    schema = lf.collect_schema()
+    lf = lf.with_columns(
+        [pl.col(col).cast(dtype) for col, dtype in COLUMN_CASTS.items() if col in schema]
+        + [pl.col(col).fill_null(False) for col, dtype in schema.items() if dtype == pl.Boolean]
+    )
+    if "timestamp" in schema:
+        lf = lf.with_columns(pl.col("timestamp").str.to_time("%H:%M:%S%.f", strict=False))
+    lf = split_location_columns(lf)
+    # Keys first, then the event columns in bronze order
+    columns = lf.collect_schema().names()
+    return lf.select(KEY_COLUMNS + [col for col in columns if col not in KEY_COLUMNS])
+
+
+def build_silver_events(
+    logger=None,
+    compacted_dir: Path = BRONZE_OPEN_DATA_EVENTS_COMPACTED,
+    output_dir: Path = SILVER_OPEN_DATA_EVENTS_DIR,
+    overwrite: bool = False,
+) -> Path | None:
+    """
+    Build (or update) the silver events table and stream it to Parquet.
+
+    Args:
+        logger (Logger, optional): The logger to use. Defaults to None.
+        compacted_dir (Path, optional): The compacted bronze events dataset.
+        output_dir (Path, optional): The silver events directory.
+        overwrite (bool, optional): Rebuild from every partition. Defaults to False.
+
+    Returns:
+        Path | None: The written file, or None when there are no bronze events.
+    """
+    if logger is None:
+        logger = NullLogger()
+    if not any(compacted_dir.glob("**/*.parquet")):
+        logger.warning(f"No compacted bronze events in {compacted_dir}, skipping silver events.")
+        return None
+    output_file = output_dir / SILVER_EVENTS_FILENAME
+    status = sink_incremental(
+        build_silver_events_query, compacted_dir, output_file, logger, "events", overwrite=overwrite
+    )
+    if status == "unchanged":
+        return output_file
+    n_rows = pl.scan_parquet(output_file).select(pl.len()).collect().item()
+    logger.info(f"Successfully wrote {n_rows} silver events to {output_file}")
+    return output_file
@@ -0,0 +1,134 @@
+"""
+Incremental rebuilds of the silver tables derived from compacted bronze partitions.
+
+Silver events and three-sixty are row-wise transformations of the compacted
+competition/season partitions (bronze/open_data/compact.py), so the silver rows
+of a partition only change when that partition does. ``sink_incremental``
+records the size/mtime of every partition behind an output in
+``_<output>_state.json`` and, when some partitions changed, keeps the existing
+rows of the others and only runs the query over the changed ones. A matchday
+that adds a few matches to one season therefore transforms that season only.
+
+A changed schema (e.g. a new event type bringing new columns) falls back to a
+full rebuild, as does a missing or unreadable state file.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Callable
+
+import polars as pl
+
+from football_pipeline.utils.logging import NullLogger
+from football_pipeline.utils.metrics import measure_file
+
+PARTITION_PATTERN = re.compile(r"competition_id=(-?\d+)/season_id=(-?\d+)$")
+
+
+def compacted_partitions(compacted_dir: Path) -> dict[str, Path]:
+    """
+    The partition files of a compacted dataset.
+
+    Args:
+        compacted_dir (Path): The compacted dataset directory.
+
+    Returns:
+        dict: "competition_id=<id>/season_id=<id>" -> its Parquet file, in partition order.
+    """
+    partitions = {}
+    for f in sorted(Path(compacted_dir).glob("*/*/*.parquet")):
+        partition = f.parent.relative_to(compacted_dir).as_posix()
+        if PARTITION_PATTERN.search(partition):
+            partitions[partition] = f
+    return partitions
+
+
+def _state_file(output_file: Path) -> Path:
+    return output_file.parent / f"_{output_file.stem}_state.json"
+
+
+def _partition_filter(partitions: list[str]) -> pl.Expr:
+    """Rows that belong to none of the given partitions."""
+    keys = [tuple(int(v) for v in PARTITION_PATTERN.search(p).groups()) for p in partitions]
+    return ~pl.any_horizontal(
+        [(pl.col("competition_id") == c) & (pl.col("season_id") == s) for c, s in keys]
+    )
+
+
+def sink_incremental(
+    build_query: Callable[[Path | list[Path]], pl.LazyFrame],
+    compacted_dir: Path,
+    output_file: Path,
+    logger=None,
+    description: str = "",
+    overwrite: bool = False,
+    row_group_size: int | None = None,
+) -> str:
+    """
+    Write a silver table from a compacted dataset, re-running the query only for changed partitions.
+
+    The output must keep the competition_id and season_id columns.
+
+    Args:
+        build_query (callable): Builds the lazy query from the compacted directory or a list of partition files.
+        compacted_dir (Path): The compacted bronze dataset.
+        output_file (Path): The silver Parquet file.
+        logger (Logger, optional): The logger to use. Defaults to None.
+        description (str, optional): The description of the data. Defaults to "".
+        overwrite (bool, optional): Rebuild from every partition. Defaults to False.
+        row_group_size (int, optional): Row group size of the output. Defaults to Polars' default.
+
+    Returns:
+        str: "unchanged", "updated" (only changed partitions were transformed) or "rebuilt".
+    """
+    if logger is None:
+        logger = NullLogger()
+    partitions = compacted_partitions(compacted_dir)
+    inputs = {}
+    for partition, f in partitions.items():
+        stat = f.stat()
+        inputs[partition] = [stat.st_size, stat.st_mtime_ns]
+
+    state_file = _state_file(output_file)
+    state = {}
+    if not overwrite and state_file.exists() and output_file.exists():
+        try:
+            state = json.loads(state_file.read_text())
+        except ValueError:
+            state = {}
+    if state and state == inputs:
+        logger.info(f"Silver {description} are up to date ({len(inputs)} partitions), skipping.")
+        return "unchanged"
+
+    changed = [p for p in inputs if state.get(p) != inputs[p]]
+    replaced = changed + [p for p in state if p not in inputs]
+    query, status, read = None, "rebuilt", list(partitions.values())
+    if state:
+        existing = pl.scan_parquet(output_file).filter(_partition_filter(replaced))
+        if changed:
+            update = build_query([partitions[p] for p in changed])
+            if update.collect_schema() == existing.collect_schema():
+                query = pl.concat([existing, update])
+            else:
+                logger.info(f"The schema of silver {description} changed, rebuilding it.")
+        else:
+            query = existing
+        if query is not None:
+            status, read = "updated", [partitions[p] for p in changed]
+            logger.info(
+                f"Updating silver {description}: {len(changed)} changed and "
+                f"{len(replaced) - len(changed)} removed of {len(inputs)} partitions."
+            )
+    if query is None:
+        query = build_query(compacted_dir)
+        logger.info(f"Building silver {description} from {len(inputs)} partitions.")
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output_file.with_suffix(".parquet.tmp")
+    with measure_file(read, output_file):
+        query.sink_parquet(tmp_file, compression="zstd", row_group_size=row_group_size)
+        os.replace(tmp_file, output_file)
+    state_file.write_text(json.dumps(inputs, indent=1, sort_keys=True))
+    return status
@@ -0,0 +1,135 @@
+"""
+Silver lineups for the StatsBomb open data: one row per player and match.
+
+The per-match bronze lineups files are read in one lazy scan; the match id is
+taken from each file's path and the ``lineup`` array is exploded into player
+rows that keep their positions and cards as typed list columns. The result is
+streamed to ``lineups_by_match.parquet``.
+
+The build is incremental: ``_lineups_state.json`` records the size/mtime of
+the bronze files behind the output. When files were only added, the new
+matches are appended to the existing rows; a changed or removed file triggers
+a full rebuild.
+"""
+
+import json
+from pathlib import Path
+
+import polars as pl
+
+from football_pipeline.utils.constants import BRONZE_OPEN_DATA_LINEUPS_DIR, SILVER_OPEN_DATA_LINEUPS_DIR
+from football_pipeline.utils.logging import NullLogger
+from football_pipeline.utils.metrics import measure_file
+
+SILVER_LINEUPS_FILENAME = "lineups_by_match.parquet"
+STATE_FILENAME = "_lineups_state.json"
+
+MATCH_ID_PATTERN = r"lineups_(\d+)\.parquet$"
+
+# Output columns in order; positions and cards stay list[struct]
+LINEUP_COLUMNS = [
+    "match_id",
+    "team_id",
+    "team_name",
+    "player_id",
+    "player_name",
+    "player_nickname",
+    "jersey_number",
+    "country_id",
+    "country_name",
+    "positions",
+    "cards",
+]
+
+
+def build_silver_lineups_query(files: list[Path]) -> pl.LazyFrame:
+    """
+    Build the lazy query that turns bronze lineups files into player rows.
+
+    Args:
+        files (list[Path]): Per-match bronze lineups files (lineups_<match_id>.parquet).
+
+    Returns:
+        pl.LazyFrame: One row per player per match, columns LINEUP_COLUMNS.
+    """
+    return (
+        pl.scan_parquet(files, include_file_paths="source_file", missing_columns="insert", extra_columns="ignore")
+        .select(
+            pl.col("source_file").str.extract(MATCH_ID_PATTERN).cast(pl.Int64).alias("match_id"),
+            "team_id",
+            "team_name",
+            "lineup",
+        )
+        .explode("lineup")
+        .filter(pl.col("lineup").is_not_null())
+        .unnest("lineup")
+        .with_columns(
+            pl.col("country").struct.field("id").alias("country_id"),
+            pl.col("country").struct.field("name").alias("country_name"),
+        )
+        .select(LINEUP_COLUMNS)
+        .unique(["match_id", "team_id", "player_id"], maintain_order=True)
+    )
+
+
+def _file_inputs(files: list[Path]) -> dict[str, list[int]]:
+    """Stat-based fingerprint of the bronze files behind the output."""
+    inputs = {}
+    for f in sorted(files):
+        stat = f.stat()
+        inputs[f.name] = [stat.st_size, stat.st_mtime_ns]
+    return inputs
+
+
+def build_silver_lineups(
+    logger=None,
+    bronze_dir: Path = BRONZE_OPEN_DATA_LINEUPS_DIR,
+    output_dir: Path = SILVER_OPEN_DATA_LINEUPS_DIR,
+    overwrite: bool = False,
+) -> Path | None:
+    """
+    Build (or extend) the silver lineups table.
+
+    Args:
+        logger (Logger, optional): The logger to use. Defaults to None.
+        bronze_dir (Path, optional): The bronze lineups directory.
+        output_dir (Path, optional): The silver lineups directory.
+        overwrite (bool, optional): Rebuild from every bronze file. Defaults to False.
+
+    Returns:
+        Path | None: The output file, or None when there are no bronze lineups.
+    """
+    if logger is None:
+        logger = NullLogger()
+    files = sorted(bronze_dir.glob("lineups_*.parquet"))
+    if not files:
+        logger.warning(f"No bronze lineups in {bronze_dir}, skipping silver lineups.")
+        return None
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_dir / SILVER_LINEUPS_FILENAME
+    state_file = output_dir / STATE_FILENAME
+
+    inputs = _file_inputs(files)
+    state = json.loads(state_file.read_text()) if state_file.exists() and output_file.exists() else {}
+    unchanged = not overwrite and all(inputs.get(name) == fingerprint for name, fingerprint in state.items())
+    if state and unchanged and set(inputs) == set(state):
+        logger.info(f"Silver lineups are up to date ({len(state)} matches), skipping.")
+        return output_file
+
+    if state and unchanged:
+        # Only new matches: append their rows to the existing output
+        new_files = [f for f in files if f.name not in state]
+        query = pl.concat([pl.scan_parquet(output_file), build_silver_lineups_query(new_files)])
+        logger.info(f"Adding {len(new_files)} new matches to silver lineups.")
+    else:
+        query = build_silver_lineups_query(files)
+        logger.info(f"Building silver lineups from {len(files)} matches.")
+
+    tmp_file = output_file.with_suffix(".parquet.tmp")
+    with measure_file(files, output_file):
+        query.sink_parquet(tmp_file, compression="zstd")
+        tmp_file.replace(output_file)
+    state_file.write_text(json.dumps(inputs, indent=1, sort_keys=True))
+    n_rows = pl.scan_parquet(output_file).select(pl.len()).collect().item()
+    logger.info(f"Successfully wrote {n_rows} silver lineup rows to {output_file}")
+    return output_file
@@ -0,0 +1,285 @@
+"""
+SPADL actions for the StatsBomb open data (the input of VAEP valuation).
+
+Every match is converted with socceraction in a worker process and cached as
+``spadl/matches/actions_<match_id>.parquet``. The cache directory keeps an
+ingest manifest (utils/manifest.py) keyed by the fingerprint of the match's
+events file, the socceraction version and a digest of the match context read
+from the bronze matches tables (home team, fidelity versions), so reruns only
+convert new or changed matches. The per-match files are then compacted into one
+competition/season partitioned dataset:
+
+    silver/open_data/spadl/actions/competition_id=<id>/season_id=<id>/part-0.parquet
+
+Conversion reads the landing events JSON through socceraction's StatsBomb
+loader: SPADL needs the nested type-specific objects exactly as StatsBomb
+publishes them, which the flattened bronze tables no longer carry. The events
+are found like bronze finds them, so gzip-compressed landing files and the
+snapshot given with ``--archive`` (utils/archive.py) are converted too.
+"""
+
+import hashlib
+import json
+import tempfile
+import warnings
+from pathlib import Path
+
+import polars as pl
+
+from football_pipeline.bronze.open_data.compact import compact_dataset, load_match_partitions
+from football_pipeline.bronze.open_data.ingest import _get_paths
+from football_pipeline.config import PipelineConfig
+from football_pipeline.utils.archive import (
+    ArchiveDir,
+    find_sources,
+    is_plain_file,
+    read_source,
+    source_stem,
+    without_data,
+)
+from football_pipeline.utils.constants import (
+    BRONZE_OPEN_DATA_MATCHES_DIR,
+    SILVER_OPEN_DATA_SPADL_DIR,
+)
+from football_pipeline.utils.dataframe import run_incremental_batch
+from football_pipeline.utils.logging import NullLogger, worker_logger
+from football_pipeline.utils.parallel import resolve_workers
+
+# Bump when the conversion below changes what gets written
+SPADL_STAGE_VERSION = 1
+
+ACTIONS_PREFIX = "actions"
+
+
+def spadl_version() -> str:
+    """Version tag recorded in the cache manifest (includes the socceraction version)."""
+    import socceraction
+
+    return f"spadl-{socceraction.__version__}-v{SPADL_STAGE_VERSION}"
+
+
+def match_version(match_context: dict) -> str:
+    """
+    Version tag of one match: spadl_version plus a digest of its conversion inputs.
+
+    The actions depend on the home team and fidelity versions as much as on the
+    events, so a corrected matches table reconverts the match.
+
+    Args:
+        match_context (dict): The match's entry of load_match_context.
+
+    Returns:
+        str: The version recorded in the cache manifest.
+    """
+    digest = hashlib.blake2b(json.dumps(match_context, sort_keys=True).encode(), digest_size=8).hexdigest()
+    return f"{spadl_version()}-{digest}"
+
+
+def _fidelity(value) -> int | None:
+    """StatsBomb publishes fidelity versions as strings ("2"); socceraction wants ints."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_match_context(matches_dir: Path) -> dict[int, dict]:
+    """
+    Per-match conversion inputs from the bronze matches tables.
+
+    Args:
+        matches_dir (Path): The bronze matches directory.
+
+    Returns:
+        dict: match_id -> {home_team_id, xy_fidelity_version, shot_fidelity_version}.
+    """
+    files = sorted(matches_dir.glob("matches_*.parquet"))
+    if not files:
+        return {}
+    matches = pl.scan_parquet(files, missing_columns="insert", extra_columns="ignore").select(
+        "match_id",
+        pl.col("home_team_home_team_id").alias("home_team_id"),
+        pl.col("metadata_xy_fidelity_version").alias("xy_fidelity_version"),
+        pl.col("metadata_shot_fidelity_version").alias("shot_fidelity_version"),
+    ).unique("match_id").collect()
+    return {
+        row["match_id"]: {
+            "home_team_id": row["home_team_id"],
+            "xy_fidelity_version": _fidelity(row["xy_fidelity_version"]),
+            "shot_fidelity_version": _fidelity(row["shot_fidelity_version"]),
+        }
+        for row in matches.iter_rows(named=True)
+    }
+
+
+def convert_match_to_spadl(
+    events_source,
+    match_id: int,
+    home_team_id: int,
+    output_file: Path,
+    xy_fidelity_version: int | None = None,
+    shot_fidelity_version: int | None = None,
+) -> int:
+    """
+    Convert one match's StatsBomb events to SPADL actions and write them to Parquet.
+
+    Args:
+        events_source (Path | ArchiveMember): The match's events JSON: a landing file
+            (plain or gzip-compressed) or a member of an archive.
+        match_id (int): The match to convert.
+        home_team_id (int): The match's home team (SPADL plays left to right for it).
+        output_file (Path): The per-match actions file.
+        xy_fidelity_version (int, optional): StatsBomb location fidelity. Defaults to None.
+        shot_fidelity_version (int, optional): StatsBomb shot location fidelity. Defaults to None.
+
+    Returns:
+        int: The number of actions written.
+    """
+    import socceraction.spadl as spadl
+    from socceraction.data.statsbomb import StatsBombLoader
+    from socceraction.spadl.statsbomb import convert_to_actions
+
+    if is_plain_file(events_source) and events_source.name == f"{match_id}.json":
+        events = StatsBombLoader(getter="local", root=str(events_source.parent.parent)).events(match_id)
+    else:
+        # The loader only reads <root>/events/<match_id>.json: hand it the decompressed bytes there
+        with tempfile.TemporaryDirectory(prefix="spadl-") as root:
+            (Path(root) / "events").mkdir()
+            (Path(root) / "events" / f"{match_id}.json").write_bytes(read_source(events_source))
+            events = StatsBombLoader(getter="local", root=root).events(match_id)
+    actions = convert_to_actions(
+        events,
+        home_team_id=home_team_id,
+        xy_fidelity_version=xy_fidelity_version,
+        shot_fidelity_version=shot_fidelity_version,
+    )
+    actions = spadl.add_names(actions)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output_file.with_suffix(".parquet.tmp")
+    pl.from_pandas(actions).write_parquet(tmp_file, compression="zstd")
+    tmp_file.replace(output_file)
+    return len(actions)
+
+
+def _convert_match_task(task: dict):
+    """
+    Worker entry point: convert one match and report the outcome to the parent.
+
+    socceraction emits the same pandas FutureWarnings for every match; its warnings
+    are kept out of the console and logged at debug level instead.
+
+    Args:
+        task (dict): Keyword arguments for convert_match_to_spadl plus "input_file" and "logger".
+
+    Returns:
+        tuple: (input_file, status, error) where status is "processed" or "error".
+    """
+    input_file = task.pop("input_file")
+    logger = task.pop("logger", None) or NullLogger()
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("default")
+            convert_match_to_spadl(**task)
+        for message in dict.fromkeys(f"{w.category.__name__}: {w.message}" for w in caught):
+            logger.debug("SPADL conversion of %s warned: %s", input_file, message)
+        return without_data(input_file), "processed", None
+    except Exception as e:
+        # The parent only logs the message; keep the traceback in the run log
+        logger.debug("SPADL conversion of %s failed", input_file, exc_info=True)
+        return without_data(input_file), "error", f"{type(e).__name__}: {e}"
+
+
+def build_spadl_actions(
+    logger=None,
+    config: PipelineConfig | None = None,
+    landing_dir: Path | ArchiveDir | None = None,
+    matches_dir: Path = BRONZE_OPEN_DATA_MATCHES_DIR,
+    output_dir: Path = SILVER_OPEN_DATA_SPADL_DIR,
+):
+    """
+    Convert every open_data match to SPADL actions and compact them into one dataset.
+
+    With ``config.shard`` set, only the shard's matches are converted and the
+    compaction is left to the finalize run.
+
+    Args:
+        logger (Logger, optional): The logger to use. Defaults to None.
+        config (PipelineConfig, optional): Run options (workers, force, shard). Defaults to None.
+        landing_dir (Path | ArchiveDir, optional): The landing open_data root. Defaults to
+            data/landing, or the snapshot of ``config.open_data_archive``.
+        matches_dir (Path, optional): The bronze matches directory.
+        output_dir (Path, optional): The silver SPADL directory.
+
+    Returns:
+        tuple: (converted_count, cached_count, error_count) matches.
+    """
+    if logger is None:
+        logger = NullLogger()
+    config = config or PipelineConfig()
+    if landing_dir is None:
+        landing_dir = _get_paths(config)["landing_competitions"]
+    events_dir = landing_dir / "events"
+    context = load_match_context(matches_dir)
+    cache_dir = output_dir / "matches"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    items = []
+    for key, events_source in find_sources(events_dir, "*.json"):
+        stem = source_stem(events_source)
+        if not stem.isdigit():
+            continue
+        if config.shard is not None and not config.shard.owns(key):
+            continue
+        if int(stem) not in context:
+            if config.shard is not None:
+                # Its matches table may belong to a shard that has not run yet; finalize converts it
+                logger.debug("Match %s is not in the matches tables yet, leaving it to finalize.", stem)
+            else:
+                logger.warning("Match %s is not in the matches tables, skipping SPADL conversion.", stem)
+            continue
+        items.append((key, events_source, cache_dir / f"{ACTIONS_PREFIX}_{stem}.parquet"))
+    if not items:
+        logger.warning(f"No events in {events_dir}, skipping SPADL conversion.")
+        return 0, 0, 0
+
+    def build_task(events_source, output_file: Path) -> dict:
+        match_id = int(source_stem(events_source))
+        return {
+            "input_file": events_source,
+            "events_source": events_source,
+            "match_id": match_id,
+            "output_file": output_file,
+            "logger": worker_logger(logger),
+            **context[match_id],
+        }
+
+    versions = {key: match_version(context[int(source_stem(source))]) for key, source, _ in items}
+    workers = resolve_workers(config.workers)
+    converted_count, cached_count, error_count = run_incremental_batch(
+        items, build_task, _convert_match_task, versions,
+        cache_dir, logger, "SPADL matches", 50, workers, config.force, config.shard,
+    )
+    if config.shard is not None:
+        # The partitions mix matches of every shard, so they are built by finalize
+        logger.info(
+            f"SPADL conversion of shard {config.shard} complete: {converted_count} matches converted, "
+            f"{cached_count} cached, {error_count} errors"
+        )
+        return converted_count, cached_count, error_count
+    _, _, compaction_errors = compact_dataset(
+        "SPADL actions",
+        cache_dir,
+        ACTIONS_PREFIX,
+        output_dir / "actions",
+        load_match_partitions(matches_dir),
+        logger=logger,
+        overwrite=config.force,
+    )
+    if compaction_errors:
+        # The failed partitions still hold their previous actions
+        raise RuntimeError(f"Compaction of {compaction_errors} SPADL actions partitions failed")
+    logger.info(
+        f"SPADL conversion complete: {converted_count} matches converted, "
+        f"{cached_count} cached, {error_count} errors"
+    )
+    return converted_count, cached_count, error_count
@@ -0,0 +1,443 @@
+"""
+Star schema over the silver StatsBomb open data.
+
+Silver events and lineups repeat names on every row (team_name, player_name,
+type_name, ...). This module splits them into dimension tables with integer
+surrogate keys and fact tables that hold keys, numbers and categoricals:
+
+    dim_player       player_key     player_id, player_name, player_nickname, country_name
+    dim_team         team_key       team_id, team_name
+    dim_competition  competition_key competition_id, competition_name, country_name, ...
+    dim_season       season_key     season_id, season_name
+    dim_event_type   event_type_key type_id, type_name
+    dim_position     position_key   position_id, position_name
+    fact_events      silver events with *_key columns in place of the id/name pairs above
+    fact_lineups     silver lineups with team/player/position keys
+
+Every other ``<x>_id``/``<x>_name`` pair of the events (play pattern, pass
+height, outcomes, ...) becomes one categorical ``<x>_name`` column, which
+Parquet and Polars store as a dictionary of the few distinct names plus
+integer codes. The nested tactics lineups and shot freeze frames keep
+player_key/position_key instead of id/name structs, and floats are stored as
+Float32, so every fact row is made of integers, categoricals and small floats.
+
+Event uuids are not kept: an event is identified by its match_id and index
+(its position in the match), and the references between events
+(related_events, pass_assisted_shot_id, shot_key_pass_id) become the indexes
+of the referenced events of the same match. The uuids do not compress, and a
+table mapping them to keys would be almost as large as the facts themselves;
+silver events still hold them for joins to the 360 frames and SPADL actions.
+
+Dimensions are updated, not rebuilt: ids seen before keep their key, new ids
+get the next keys and names are refreshed from the latest data, so keys stay
+stable across runs and fact tables of different runs can be compared. Facts
+are rebuilt from silver in one streamed query per table. Nothing is written
+when silver events, lineups and bronze competitions are unchanged since the
+last build (see ``_star_state.json``).
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import polars as pl
+
+from football_pipeline.utils.constants import (
+    BRONZE_OPEN_DATA_DIR,
+    SILVER_OPEN_DATA_EVENTS_DIR,
+    SILVER_OPEN_DATA_LINEUPS_DIR,
+    SILVER_OPEN_DATA_STAR_DIR,
+)
+from football_pipeline.utils.logging import NullLogger
+from football_pipeline.utils.metrics import measure_file
+
+FACT_EVENTS_FILENAME = "fact_events.parquet"
+FACT_LINEUPS_FILENAME = "fact_lineups.parquet"
+STATE_FILENAME = "_star_state.json"
+# Bump when the layout of the tables changes, so existing star schemas are rebuilt
+STAR_FORMAT = 3
+# Tables of earlier formats, removed on the next build
+RETIRED_FILENAMES = ["dim_event.parquet"]
+
+
+@dataclass(frozen=True)
+class Dimension:
+    """A dimension table: surrogate key, natural id, and the attributes kept per id."""
+    name: str
+    key: str
+    natural_key: str
+    attributes: tuple[str, ...]
+    key_dtype: type[pl.DataType] = pl.Int32
+
+    @property
+    def filename(self) -> str:
+        return f"dim_{self.name}.parquet"
+
+
+DIMENSIONS = {
+    "player": Dimension("player", "player_key", "player_id", ("player_name", "player_nickname", "country_name")),
+    "team": Dimension("team", "team_key", "team_id", ("team_name",)),
+    "competition": Dimension(
+        "competition", "competition_key", "competition_id",
+        ("competition_name", "country_name", "competition_gender", "competition_youth", "competition_international"),
+        pl.Int16,
+    ),
+    "season": Dimension("season", "season_key", "season_id", ("season_name",), pl.Int16),
+    "event_type": Dimension("event_type", "event_type_key", "type_id", ("type_name",), pl.Int16),
+    "position": Dimension("position", "position_key", "position_id", ("position_name",), pl.Int16),
+}
+
+# Event id/name column prefixes -> the dimension they are keyed by
+EVENT_DIMENSION_COLUMNS = {
+    "player": "player",
+    "pass_recipient": "player",
+    "substitution_replacement": "player",
+    "team": "team",
+    "possession_team": "team",
+    "type": "event_type",
+    "position": "position",
+}
+
+# Event uuid columns -> the column holding the referenced event's index in the fact table
+EVENT_REFERENCES = {
+    "pass_assisted_shot_id": "pass_assisted_shot_index",
+    "shot_key_pass_id": "shot_key_pass_index",
+}
+# List columns of nested {"player": {id, name}, "position": {id, name}, ...} structs
+NESTED_PLAYER_COLUMNS = ["tactics_lineup", "shot_freeze_frame"]
+
+
+def update_dimension(dimension: Dimension, existing: pl.DataFrame | None, candidates: pl.DataFrame) -> pl.DataFrame:
+    """
+    Merge newly seen ids into a dimension table without changing existing keys.
+
+    Args:
+        dimension (Dimension): The dimension.
+        existing (pl.DataFrame | None): The current table, None on the first run.
+        candidates (pl.DataFrame): The natural key and attribute columns seen in this run.
+
+    Returns:
+        pl.DataFrame: The key, natural key and attributes, ordered by key.
+    """
+    columns = [dimension.natural_key, *dimension.attributes]
+    candidates = (
+        candidates.select(pl.col(c) if c in candidates.columns else pl.lit(None).alias(c) for c in columns)
+        .filter(pl.col(dimension.natural_key).is_not_null())
+        # The latest non-null value of each attribute
+        .group_by(dimension.natural_key, maintain_order=True)
+        .agg(pl.col(c).drop_nulls().last() for c in dimension.attributes)
+    )
+    if existing is None or existing.is_empty():
+        merged = candidates.sort(dimension.natural_key).with_row_index(dimension.key, offset=1)
+    else:
+        existing = existing.select(dimension.key, *columns)
+        known = candidates.join(existing.select(dimension.key, dimension.natural_key), on=dimension.natural_key)
+        new = (
+            candidates.join(existing, on=dimension.natural_key, how="anti")
+            .sort(dimension.natural_key)
+            .with_row_index(dimension.key, offset=existing[dimension.key].max() + 1)
+        )
+        # Ids missing from this run keep their row; names are refreshed where seen
+        refreshed = existing.join(known, on=dimension.natural_key, how="left", suffix="_new").select(
+            dimension.key,
+            dimension.natural_key,
+            *[pl.coalesce(f"{c}_new", c).alias(c) for c in dimension.attributes],
+        )
+        merged = pl.concat([refreshed, new.select(refreshed.columns)], how="vertical_relaxed")
+    return merged.select(pl.col(dimension.key).cast(dimension.key_dtype), *columns).sort(dimension.key)
+
+
+def _pairs(lf: pl.LazyFrame, prefix: str, dimension: Dimension) -> pl.LazyFrame:
+    """The <prefix>_id/<prefix>_name columns of the events renamed to the dimension's columns."""
+    return lf.select(
+        pl.col(f"{prefix}_id").cast(pl.Int64).alias(dimension.natural_key),
+        pl.col(f"{prefix}_name").alias(dimension.attributes[0]),
+    ).unique()
+
+
+def dimension_candidates(events: pl.LazyFrame, lineups: pl.LazyFrame | None, competitions: pl.LazyFrame | None) -> dict[str, pl.DataFrame]:
+    """
+    Collect the ids and names each dimension can be updated from.
+
+    Args:
+        events (pl.LazyFrame): Silver events.
+        lineups (pl.LazyFrame | None): Silver lineups.
+        competitions (pl.LazyFrame | None): Bronze competitions.
+
+    Returns:
+        dict[str, pl.DataFrame]: Dimension name -> candidate rows.
+    """
+    names = set(events.collect_schema().names())
+    queries = {name: [] for name in DIMENSIONS}
+    for prefix, name in EVENT_DIMENSION_COLUMNS.items():
+        if {f"{prefix}_id", f"{prefix}_name"} <= names:
+            queries[name].append(_pairs(events, prefix, DIMENSIONS[name]))
+    if lineups is not None:
+        # Lineups come after the events, so their richer player attributes win
+        queries["team"].append(lineups.select(pl.col("team_id").cast(pl.Int64), "team_name").unique())
+        queries["player"].append(
+            lineups.select(pl.col("player_id").cast(pl.Int64), "player_name", "player_nickname", "country_name")
+            .unique("player_id", keep="last")
+        )
+        queries["position"].append(
+            lineups.select(pl.col("positions").explode().struct.unnest())
+            .select(pl.col("position_id").cast(pl.Int64), pl.col("position").alias("position_name"))
+            .drop_nulls("position_id")
+            .unique()
+        )
+    if competitions is not None:
+        queries["competition"].append(
+            competitions.select(pl.col("competition_id").cast(pl.Int64), *DIMENSIONS["competition"].attributes)
+            .unique("competition_id", keep="last")
+        )
+        queries["season"].append(
+            competitions.select(pl.col("season_id").cast(pl.Int64), "season_name").unique("season_id", keep="last")
+        )
+    for key, dimension in [("competition_id", "competition"), ("season_id", "season")]:
+        if key in names:
+            queries[dimension].append(events.select(pl.col(key).cast(pl.Int64)).unique())
+    for column in NESTED_PLAYER_COLUMNS:
+        if column not in names:
+            continue
+        nested = events.select(pl.col(column).explode().struct.field("player", "position")).drop_nulls("player")
+        queries["player"].append(
+            nested.select(
+                pl.col("player").struct.field("id").cast(pl.Int64).alias("player_id"),
+                pl.col("player").struct.field("name").alias("player_name"),
+            ).unique()
+        )
+        queries["position"].append(
+            nested.select(
+                pl.col("position").struct.field("id").cast(pl.Int64).alias("position_id"),
+                pl.col("position").struct.field("name").alias("position_name"),
+            ).drop_nulls("position_id").unique()
+        )
+    flat = [(name, query) for name, parts in queries.items() for query in parts]
+    frames = pl.collect_all([query for _, query in flat])
+    candidates = {}
+    for (name, _), frame in zip(flat, frames):
+        candidates.setdefault(name, []).append(frame)
+    return {name: pl.concat(parts, how="diagonal_relaxed") for name, parts in candidates.items()}
+
+
+def _key_expr(expr: pl.Expr, dimension: Dimension, table: pl.DataFrame) -> pl.Expr:
+    """Map natural ids to the dimension's surrogate keys (None for unknown ids)."""
+    return expr.replace_strict(
+        table[dimension.natural_key], table[dimension.key], default=None, return_dtype=dimension.key_dtype
+    )
+
+
+def _key_column(column: str, dimension: Dimension, table: pl.DataFrame, alias: str) -> pl.Expr:
+    """Replace a natural id column with the dimension's surrogate key."""
+    return _key_expr(pl.col(column), dimension, table).alias(alias)
+
+
+def _key_nested(column: str, fields: list[str], tables: dict[str, pl.DataFrame]) -> pl.Expr:
+    """Replace the player/position structs of a nested list column with their keys, keeping the other fields."""
+    element = pl.element().struct
+    keyed = [
+        _key_expr(element.field("player").struct.field("id"), DIMENSIONS["player"], tables["player"]).alias("player_key"),
+        _key_expr(element.field("position").struct.field("id"), DIMENSIONS["position"], tables["position"]).alias("position_key"),
+    ]
+    for field in fields:
+        if field == "location":
+            keyed.append(element.field("location").cast(pl.List(pl.Float32)))
+        elif field == "jersey_number":
+            keyed.append(element.field("jersey_number").cast(pl.Int16))
+        elif field not in ("player", "position"):
+            keyed.append(element.field(field))
+    return pl.col(column).list.eval(pl.struct(keyed))
+
+
+def event_indexes(events: pl.LazyFrame) -> pl.DataFrame | None:
+    """
+    The index of every event uuid, to resolve references between events.
+
+    Args:
+        events (pl.LazyFrame): Silver events.
+
+    Returns:
+        pl.DataFrame | None: id and index, or None when the events have no uuids or indexes.
+    """
+    if not {"id", "index"} <= set(events.collect_schema().names()):
+        return None
+    return events.select("id", pl.col("index").cast(pl.Int32)).collect()
+
+
+def build_fact_events_query(
+    events: pl.LazyFrame, tables: dict[str, pl.DataFrame], indexes: pl.DataFrame | None = None
+) -> pl.LazyFrame:
+    """
+    Build the lazy query that turns silver events into the events fact table.
+
+    Args:
+        events (pl.LazyFrame): Silver events.
+        tables (dict[str, pl.DataFrame]): The updated dimension tables.
+        indexes (pl.DataFrame, optional): The event_indexes of the events. Without them the
+            references between events are dropped. Defaults to None.
+
+    Returns:
+        pl.LazyFrame: Events keyed by the dimensions, with categorical names.
+    """
+    schema = events.collect_schema()
+    replaced, selection = set(), []
+    keys = {"competition_id": "competition", "season_id": "season"}
+    keys.update({f"{prefix}_id": name for prefix, name in EVENT_DIMENSION_COLUMNS.items()})
+    for column, name in keys.items():
+        if column not in schema:
+            continue
+        dimension = DIMENSIONS[name]
+        prefix = column.removesuffix("_id")
+        alias = dimension.key if prefix == dimension.natural_key.removesuffix("_id") else f"{prefix}_key"
+        replaced |= {column, f"{prefix}_name"}
+        selection.append((column, _key_column(column, dimension, tables[name], alias)))
+
+    # Uuids are unique across matches, so one lookup serves every match
+    replaced |= {"id", "related_events", *EVENT_REFERENCES}
+    if indexes is not None:
+        def to_index(expr: pl.Expr) -> pl.Expr:
+            return expr.replace_strict(indexes["id"], indexes["index"], default=None, return_dtype=pl.Int32)
+
+        for column, alias in EVENT_REFERENCES.items():
+            if column in schema:
+                selection.append((column, to_index(pl.col(column)).alias(alias)))
+        if "related_events" in schema:
+            selection.append((
+                "related_events",
+                pl.col("related_events").list.eval(to_index(pl.element())).alias("related_event_indexes"),
+            ))
+    for column in NESTED_PLAYER_COLUMNS:
+        if column in schema:
+            fields = [f.name for f in schema[column].inner.fields]
+            selection.append((column, _key_nested(column, fields, tables)))
+
+    for column, dtype in schema.items():
+        if column in replaced:
+            continue
+        if dtype == pl.Float64:
+            selection.append((column, pl.col(column).cast(pl.Float32)))
+        elif dtype == pl.List(pl.Float64):
+            selection.append((column, pl.col(column).cast(pl.List(pl.Float32))))
+        elif dtype == pl.String:
+            # <x>_id/<x>_name pairs keep just the name, as a dictionary-encoded categorical
+            if column.endswith("_name") and f"{column.removesuffix('_name')}_id" in schema:
+                replaced.add(f"{column.removesuffix('_name')}_id")
+            selection.append((column, pl.col(column).cast(pl.Categorical)))
+
+    by_column = dict(selection)
+    by_column["match_id"] = pl.col("match_id").cast(pl.Int32)
+    return events.select(
+        by_column.get(column, pl.col(column)) for column in schema.names() if column in by_column or column not in replaced
+    )
+
+
+def build_fact_lineups_query(lineups: pl.LazyFrame, tables: dict[str, pl.DataFrame]) -> pl.LazyFrame:
+    """
+    Build the lazy query that turns silver lineups into the lineups fact table.
+
+    Args:
+        lineups (pl.LazyFrame): Silver lineups.
+        tables (dict[str, pl.DataFrame]): The updated dimension tables.
+
+    Returns:
+        pl.LazyFrame: match_id, team_key, player_key, jersey_number, positions (with
+            position_key) and cards.
+    """
+    position = DIMENSIONS["position"]
+    positions = tables["position"]
+    return lineups.select(
+        pl.col("match_id").cast(pl.Int32),
+        _key_column("team_id", DIMENSIONS["team"], tables["team"], "team_key"),
+        _key_column("player_id", DIMENSIONS["player"], tables["player"], "player_key"),
+        pl.col("jersey_number").cast(pl.Int16),
+        pl.col("positions").list.eval(
+            pl.struct(
+                pl.element().struct.field("position_id").replace_strict(
+                    positions[position.natural_key], positions[position.key],
+                    default=None, return_dtype=position.key_dtype,
+                ).alias("position_key"),
+                pl.element().struct.field("from", "to", "from_period", "to_period", "start_reason", "end_reason"),
+            )
+        ),
+        "cards",
+    )
+
+
+def build_star_schema(
+    logger=None,
+    events_file: Path = SILVER_OPEN_DATA_EVENTS_DIR / "events.parquet",
+    lineups_file: Path = SILVER_OPEN_DATA_LINEUPS_DIR / "lineups_by_match.parquet",
+    competitions_file: Path = BRONZE_OPEN_DATA_DIR / "competitions.parquet",
+    output_dir: Path = SILVER_OPEN_DATA_STAR_DIR,
+    overwrite: bool = False,
+) -> Path | None:
+    """
+    Update the dimension tables and rebuild the fact tables from silver events and lineups.
+
+    Args:
+        logger (Logger, optional): The logger to use. Defaults to None.
+        events_file (Path, optional): The silver events file.
+        lineups_file (Path, optional): The silver lineups file (optional input).
+        competitions_file (Path, optional): The bronze competitions file (optional input).
+        output_dir (Path, optional): The directory of the star schema tables.
+        overwrite (bool, optional): Rebuild even when the inputs are unchanged. Defaults to False.
+
+    Returns:
+        Path | None: The events fact table, or None when there are no silver events.
+    """
+    if logger is None:
+        logger = NullLogger()
+    if not events_file.exists():
+        logger.warning(f"No silver events at {events_file}, skipping the star schema.")
+        return None
+    inputs = {"format": STAR_FORMAT}
+    for name, f in [("events", events_file), ("lineups", lineups_file), ("competitions", competitions_file)]:
+        stat = f.stat() if f.exists() else None
+        inputs[name] = [stat.st_size, stat.st_mtime_ns] if stat else None
+    state_file = output_dir / STATE_FILENAME
+    outputs = [output_dir / d.filename for d in DIMENSIONS.values()] + [output_dir / FACT_EVENTS_FILENAME]
+    if not overwrite and state_file.exists() and all(f.exists() for f in outputs):
+        try:
+            state = json.loads(state_file.read_text())
+        except ValueError:
+            state = None
+        if state == inputs:
+            logger.info(f"Star schema in {output_dir} is up to date, skipping.")
+            return output_dir / FACT_EVENTS_FILENAME
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Forget the previous build until this one completes
+    state_file.unlink(missing_ok=True)
+    events = pl.scan_parquet(events_file)
+    lineups = pl.scan_parquet(lineups_file) if lineups_file.exists() else None
+    competitions = pl.scan_parquet(competitions_file) if competitions_file.exists() else None
+
+    candidates = dimension_candidates(events, lineups, competitions)
+    tables = {}
+    for name, dimension in DIMENSIONS.items():
+        output_file = output_dir / dimension.filename
+        existing = pl.read_parquet(output_file) if output_file.exists() else None
+        table = update_dimension(dimension, existing, candidates.get(name, pl.DataFrame()))
+        added = table.height - (existing.height if existing is not None else 0)
+        tmp_file = output_file.with_suffix(".parquet.tmp")
+        table.write_parquet(tmp_file, compression="zstd")
+        tmp_file.replace(output_file)
+        tables[name] = table
+        logger.debug("dim_%s: %d rows, %d new", name, table.height, added)
+
+    for filename in RETIRED_FILENAMES:
+        (output_dir / filename).unlink(missing_ok=True)
+
+    facts = [(build_fact_events_query(events, tables, event_indexes(events)), events_file, FACT_EVENTS_FILENAME)]
+    if lineups is not None:
+        facts.append((build_fact_lineups_query(lineups, tables), lineups_file, FACT_LINEUPS_FILENAME))
+    for query, source, filename in facts:
+        output_file = output_dir / filename
+        tmp_file = output_file.with_suffix(".parquet.tmp")
+        with measure_file(source, output_file):
+            query.sink_parquet(tmp_file, compression="zstd")
+            tmp_file.replace(output_file)
+
+    state_file.write_text(json.dumps(inputs, indent=1))
+    sizes = ", ".join(f"dim_{name} {table.height}" for name, table in tables.items())
+    logger.info(f"Successfully wrote the star schema to {output_dir} ({sizes} rows)")
+    return output_dir / FACT_EVENTS_FILENAME
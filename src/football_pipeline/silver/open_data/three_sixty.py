@@ -0,0 +1,121 @@
+"""
+Silver three-sixty (360) data for the StatsBomb open data.
+
+Bronze keeps one row per event with the freeze frame as a list of player
+structs. Silver explodes it into a long table with one row per visible player:
+
+    match_id, competition_id, season_id, event_uuid, teammate, actor, keeper, x, y
+
+``event_uuid`` joins to ``id`` in silver events; rows are ordered by match so
+match and competition filters skip most row groups. The visible area polygons
+are written to a separate table (event_uuid, visible_area). Spatial queries
+over these tables live in utils/spatial.py. Reruns only transform the partitions
+that changed since the last build (see silver/open_data/incremental.py).
+"""
+
+from pathlib import Path
+
+import polars as pl
+
+from football_pipeline.silver.open_data.incremental import sink_incremental
+from football_pipeline.utils.constants import BRONZE_OPEN_DATA_360_COMPACTED, SILVER_OPEN_DATA_360_DIR
+from football_pipeline.utils.logging import NullLogger
+
+FREEZE_FRAMES_FILENAME = "freeze_frames.parquet"
+VISIBLE_AREAS_FILENAME = "visible_areas.parquet"
+
+KEY_COLUMNS = ["match_id", "competition_id", "season_id", "event_uuid"]
+
+ROW_GROUP_SIZE = 250_000
+
+
+def _scan_compacted(compacted_dir: Path | list[Path]) -> pl.LazyFrame:
+    return pl.scan_parquet(
+        compacted_dir,
+        hive_partitioning=True,
+        missing_columns="insert",
+        extra_columns="ignore",
+    ).with_columns(pl.col(["match_id", "competition_id", "season_id"]).cast(pl.Int64))
+
+
+def build_freeze_frames_query(compacted_dir: Path | list[Path] = BRONZE_OPEN_DATA_360_COMPACTED) -> pl.LazyFrame:
+    """
+    Build the lazy query that explodes 360 freeze frames into one row per player.
+
+    Args:
+        compacted_dir (Path | list[Path], optional): The compacted bronze three-sixty dataset,
+            or some of its partition files. Defaults to BRONZE_OPEN_DATA_360_COMPACTED.
+
+    Returns:
+        pl.LazyFrame: Columns KEY_COLUMNS + teammate, actor, keeper, x, y.
+    """
+    return (
+        _scan_compacted(compacted_dir)
+        .select(KEY_COLUMNS + ["freeze_frame"])
+        .explode("freeze_frame")
+        .filter(pl.col("freeze_frame").is_not_null())
+        .unnest("freeze_frame")
+        .select(
+            *KEY_COLUMNS,
+            pl.col("teammate").fill_null(False),
+            pl.col("actor").fill_null(False),
+            pl.col("keeper").fill_null(False),
+            pl.col("location").list.get(0, null_on_oob=True).cast(pl.Float64).alias("x"),
+            pl.col("location").list.get(1, null_on_oob=True).cast(pl.Float64).alias("y"),
+        )
+    )
+
+
+def build_visible_areas_query(compacted_dir: Path | list[Path] = BRONZE_OPEN_DATA_360_COMPACTED) -> pl.LazyFrame:
+    """
+    Build the lazy query for the per-event visible area polygons.
+
+    Args:
+        compacted_dir (Path | list[Path], optional): The compacted bronze three-sixty dataset,
+            or some of its partition files.
+
+    Returns:
+        pl.LazyFrame: Columns KEY_COLUMNS + visible_area (list[f64] of x, y pairs).
+    """
+    return _scan_compacted(compacted_dir).select(KEY_COLUMNS + ["visible_area"])
+
+
+def build_silver_three_sixty(
+    logger=None,
+    compacted_dir: Path = BRONZE_OPEN_DATA_360_COMPACTED,
+    output_dir: Path = SILVER_OPEN_DATA_360_DIR,
+    overwrite: bool = False,
+) -> Path | None:
+    """
+    Build (or update) the silver freeze frame and visible area tables and stream them to Parquet.
+
+    Args:
+        logger (Logger, optional): The logger to use. Defaults to None.
+        compacted_dir (Path, optional): The compacted bronze three-sixty dataset.
+        output_dir (Path, optional): The silver three-sixty directory.
+        overwrite (bool, optional): Rebuild from every partition. Defaults to False.
+
+    Returns:
+        Path | None: The freeze frames file, or None when there is no bronze 360 data.
+    """
+    if logger is None:
+        logger = NullLogger()
+    if not any(compacted_dir.glob("**/*.parquet")):
+        logger.warning(f"No compacted bronze three-sixty data in {compacted_dir}, skipping silver three-sixty.")
+        return None
+    statuses = [
+        sink_incremental(
+            build_query, compacted_dir, output_dir / filename, logger, description,
+            overwrite=overwrite, row_group_size=ROW_GROUP_SIZE,
+        )
+        for build_query, filename, description in [
+            (build_freeze_frames_query, FREEZE_FRAMES_FILENAME, "freeze frames"),
+            (build_visible_areas_query, VISIBLE_AREAS_FILENAME, "visible areas"),
+        ]
+    ]
+    freeze_frames_file = output_dir / FREEZE_FRAMES_FILENAME
+    if all(status == "unchanged" for status in statuses):
+        return freeze_frames_file
+    n_rows = pl.scan_parquet(freeze_frames_file).select(pl.len()).collect().item()
+    logger.info(f"Successfully wrote {n_rows} silver freeze frame rows to {freeze_frames_file}")
+    return freeze_frames_file
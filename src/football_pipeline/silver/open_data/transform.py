@@ -0,0 +1,20 @@
+from football_pipeline.config import PipelineConfig
+
+def open_data_transform(logger=None, *, config: PipelineConfig | None = None):
+    """
+    Build all open_data silver layer tables from the bronze layer.
+
+    The silver stages and their dependencies are declared once, in
+    football_pipeline.pipeline; this runs them for open_data.
+
+    Args:
+        logger: Accepted for existing callers and not used: the stages log to the
+            pipeline's own logs (logs/open_data/pipeline.log and the per-stage logs).
+        config: Optional run options (force, ...). If None, uses defaults.
+    """
+    from football_pipeline.pipeline import run_silver_layer
+
+    return run_silver_layer("open_data", config=config)
+
+if __name__ == "__main__":
+    open_data_transform()
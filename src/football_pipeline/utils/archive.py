@@ -0,0 +1,342 @@
+"""
+Read landing JSON straight out of compressed archives.
+
+StatsBomb open-data arrives as a repository snapshot (``open-data-master.zip``
+or a ``.tar.gz`` tarball) of tens of thousands of JSON files. Instead of
+extracting it, the bronze readers take their sources from:
+
+- an ArchiveDir, a directory inside a ``.zip``/``.tar``/``.tar.gz`` archive,
+  whose files are ArchiveMember sources, or
+- a plain directory, whose files may also be gzip-compressed (``<name>.json.gz``).
+
+``open_source`` opens any of them as a binary stream. Zip members carry a
+CRC-32 in the archive index, so fingerprinting them reads nothing. Tar archives
+have no index and no content checksums: their members are listed in one
+sequential pass, identified by size and mtime, and ``stream_sources`` reads
+the members a batch needs in a second pass, in archive order, so they can be
+handed to worker processes without random access into the compressed stream.
+"""
+
+import gzip
+import io
+import tarfile
+import threading
+import zipfile
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from types import SimpleNamespace
+
+ZIP_SUFFIXES = (".zip",)
+GZIP_SUFFIX = ".gz"
+
+
+def _is_zip(path: Path) -> bool:
+    return Path(path).name.lower().endswith(ZIP_SUFFIXES)
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """
+    A file inside an archive, usable where the ingest code expects a source Path.
+
+    ``data`` holds the member's bytes once stream_sources has read them (tar
+    archives); it is not part of the member's identity.
+    """
+    archive: Path
+    member: str
+    size: int
+    mtime_ns: int
+    crc: int | None = None
+    data: bytes | None = field(default=None, compare=False, repr=False)
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name
+
+    @property
+    def stem(self) -> str:
+        return PurePosixPath(self.member).stem
+
+    def exists(self) -> bool:
+        return True
+
+    def stat(self):
+        """Size and mtime in the attributes of os.stat_result that the manifests read."""
+        return SimpleNamespace(st_size=self.size, st_mtime_ns=self.mtime_ns)
+
+    def __str__(self) -> str:
+        return f"{self.archive}!{self.member}"
+
+
+@dataclass(frozen=True)
+class ArchiveDir:
+    """A directory inside an archive (``prefix`` is the member path of the directory)."""
+    archive: Path
+    prefix: str = ""
+
+    def __truediv__(self, name: str) -> "ArchiveDir":
+        return ArchiveDir(self.archive, str(PurePosixPath(self.prefix, name)) if self.prefix else name)
+
+    def exists(self) -> bool:
+        return Path(self.archive).exists()
+
+    def __str__(self) -> str:
+        return f"{self.archive}!{self.prefix}"
+
+
+# Archive path -> (size, mtime) it was listed at, and its members
+_LISTINGS: dict[Path, tuple[tuple[int, int], list[ArchiveMember]]] = {}
+# Concurrent stages wait for one listing instead of each decompressing a tarball
+_LISTINGS_LOCK = threading.Lock()
+
+
+def _zip_mtime_ns(info: zipfile.ZipInfo) -> int:
+    return int(datetime(*info.date_time).timestamp() * 1e9)
+
+
+def list_members(archive: Path) -> list[ArchiveMember]:
+    """
+    List the files of an archive (cached until the archive changes).
+
+    Args:
+        archive (Path): A .zip, .tar, .tar.gz or .tgz file.
+
+    Returns:
+        list[ArchiveMember]: Every regular file, in archive order.
+    """
+    archive = Path(archive)
+    with _LISTINGS_LOCK:
+        stat = archive.stat()
+        cached = _LISTINGS.get(archive)
+        if cached is not None and cached[0] == (stat.st_size, stat.st_mtime_ns):
+            return cached[1]
+        members = _read_listing(archive)
+        _LISTINGS[archive] = ((stat.st_size, stat.st_mtime_ns), members)
+        return members
+
+
+def _read_listing(archive: Path) -> list[ArchiveMember]:
+    if _is_zip(archive):
+        with zipfile.ZipFile(archive) as zf:
+            members = [
+                ArchiveMember(archive, info.filename, info.file_size, _zip_mtime_ns(info), info.CRC)
+                for info in zf.infolist()
+                if not info.is_dir()
+            ]
+    else:
+        with tarfile.open(archive, "r:*") as tf:
+            members = [
+                ArchiveMember(archive, info.name, info.size, int(info.mtime) * 1_000_000_000)
+                for info in tf
+                if info.isfile()
+            ]
+    return members
+
+
+def find_archive_root(archive: Path, marker: str) -> ArchiveDir:
+    """
+    Find the directory of an archive that holds a marker file.
+
+    Repository snapshots nest their content under a top-level directory
+    (``open-data-master/data/competitions.json``), so the root is located by
+    the shallowest member ending in ``marker``.
+
+    Args:
+        archive (Path): The archive.
+        marker (str): Relative path of a file in the wanted directory, e.g. "data/competitions.json".
+
+    Returns:
+        ArchiveDir: The directory that contains ``marker``.
+    """
+    matches = [m.member for m in list_members(archive) if m.member == marker or m.member.endswith("/" + marker)]
+    if not matches:
+        raise FileNotFoundError(f"No {marker} in {archive}")
+    member = min(matches, key=lambda name: name.count("/"))
+    return ArchiveDir(Path(archive), member[: -len(marker)].rstrip("/"))
+
+
+def find_sources(input_dir, pattern: str) -> list[tuple[str, object]]:
+    """
+    Find the JSON sources of a dataset in a directory or an archive directory.
+
+    In a plain directory, gzip-compressed files match the pattern with ".gz"
+    appended. Keys are the posix paths relative to ``input_dir`` without a ".gz"
+    suffix, so a dataset keeps its manifest keys whichever form it arrives in.
+
+    Args:
+        input_dir (Path | ArchiveDir): The dataset's landing directory.
+        pattern (str): Glob pattern relative to the directory, e.g. "*/*.json".
+
+    Returns:
+        list[tuple[str, Path | ArchiveMember]]: (key, source), ordered by key.
+    """
+    if isinstance(input_dir, ArchiveDir):
+        prefix = input_dir.prefix + "/" if input_dir.prefix else ""
+        sources = {}
+        for member in list_members(input_dir.archive):
+            if not member.member.startswith(prefix):
+                continue
+            relative = PurePosixPath(member.member[len(prefix):])
+            compressed = relative.suffix == GZIP_SUFFIX
+            key = relative.with_suffix("") if compressed else relative
+            if key.match(pattern) and len(key.parts) == len(PurePosixPath(pattern).parts):
+                # As in a directory, an uncompressed member wins over its compressed copy
+                if compressed:
+                    sources.setdefault(key.as_posix(), member)
+                else:
+                    sources[key.as_posix()] = member
+        return sorted(sources.items())
+    sources = {}
+    for path in list(input_dir.glob(pattern)) + list(input_dir.glob(pattern + GZIP_SUFFIX)):
+        key = path.relative_to(input_dir).as_posix()
+        # An extracted file wins over its compressed copy
+        sources.setdefault(key.removesuffix(GZIP_SUFFIX), path)
+        if not key.endswith(GZIP_SUFFIX):
+            sources[key] = path
+    return sorted(sources.items())
+
+
+def landing_file(directory, name: str):
+    """
+    A single landing file (e.g. competitions.json) of a directory or an archive directory.
+
+    Args:
+        directory (Path | ArchiveDir): The landing directory.
+        name (str): The file name.
+
+    Returns:
+        Path | ArchiveMember: The file, or its gzip-compressed copy when only that exists.
+            A missing file is returned as the plain path.
+    """
+    for key, source in find_sources(directory, name):
+        if key == name:
+            return source
+    return directory / name if isinstance(directory, Path) else Path(str(directory / name))
+
+
+def source_stem(source) -> str:
+    """The file name of a source without its ".json"/".json.gz" suffixes."""
+    name = source.name.removesuffix(GZIP_SUFFIX)
+    return PurePosixPath(name).stem
+
+
+def open_source(source):
+    """
+    Open a JSON source as a binary stream.
+
+    Args:
+        source (Path | ArchiveMember): A plain or gzip-compressed file, or an archive member.
+
+    Returns:
+        A binary file object (use as a context manager).
+    """
+    if isinstance(source, ArchiveMember):
+        if source.data is not None:
+            stream = io.BytesIO(source.data)
+        elif _is_zip(source.archive):
+            zf = zipfile.ZipFile(source.archive)
+            stream = _Closing(zf.open(source.member), zf)
+        else:
+            # Random access into a tar: only for single files, batches use stream_sources
+            tf = tarfile.open(source.archive, "r:*")
+            stream = _Closing(tf.extractfile(source.member), tf)
+        if source.member.endswith(GZIP_SUFFIX):
+            return gzip.GzipFile(fileobj=stream)
+        return stream
+    if str(source).endswith(GZIP_SUFFIX):
+        return gzip.open(source, "rb")
+    return open(source, "rb")
+
+
+def read_source(source) -> bytes:
+    """Read a whole JSON source (decompressed)."""
+    with open_source(source) as f:
+        return f.read()
+
+
+def is_plain_file(source) -> bool:
+    """Whether a source can be handed to readers as a path (not compressed, not in an archive)."""
+    return isinstance(source, Path) and not source.name.endswith(GZIP_SUFFIX)
+
+
+class _Closing(io.BufferedIOBase):
+    """A member stream that also closes the archive it was opened from."""
+
+    def __init__(self, stream, owner):
+        super().__init__()
+        self._stream = stream
+        self._owner = owner
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        return self._stream.read(size)
+
+    def read1(self, size: int = -1) -> bytes:
+        return self._stream.read(size)
+
+    def close(self):
+        if not self.closed:
+            self._stream.close()
+            self._owner.close()
+        super().close()
+
+
+def fingerprint_member(member: ArchiveMember) -> dict:
+    """
+    Fingerprint an archive member without reading it.
+
+    Zip members are identified by their stored CRC-32; tar members only have
+    their size and mtime, so a touched tar member counts as changed.
+
+    Args:
+        member (ArchiveMember): The member.
+
+    Returns:
+        dict: {"size": int, "mtime_ns": int, "digest": str}
+    """
+    if member.crc is not None:
+        digest = f"crc32:{member.crc:08x}"
+    else:
+        digest = f"tar:{member.size}:{member.mtime_ns}"
+    return {"size": member.size, "mtime_ns": member.mtime_ns, "digest": digest}
+
+
+def stream_sources(sources: list):
+    """
+    Yield sources ready to be read in another process, reading tar members in one pass.
+
+    Plain files and zip members are yielded as they are (workers open them
+    themselves). Members of tar archives are read sequentially, in archive
+    order, and yielded with their bytes attached, so only the members a
+    consumer has not yet taken are held in memory.
+
+    Args:
+        sources (list[Path | ArchiveMember]): The sources to read.
+
+    Yields:
+        Path | ArchiveMember: Every source once; tar members in archive order, after the others.
+    """
+    by_archive: dict[Path, dict[str, ArchiveMember]] = {}
+    for source in sources:
+        if isinstance(source, ArchiveMember) and not _is_zip(source.archive) and source.data is None:
+            by_archive.setdefault(source.archive, {})[source.member] = source
+        else:
+            yield source
+    for archive, wanted in by_archive.items():
+        with tarfile.open(archive, "r|*") as tf:
+            for info in tf:
+                member = wanted.pop(info.name, None)
+                if member is not None:
+                    yield replace(member, data=tf.extractfile(info).read())
+                if not wanted:
+                    break
+
+
+def without_data(source):
+    """The source without attached member bytes (to send results back cheaply)."""
+    if isinstance(source, ArchiveMember) and source.data is not None:
+        return replace(source, data=None)
+    return source
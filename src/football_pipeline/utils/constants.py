@@ -2,21 +2,53 @@
 Simple constants and path utilities for the football pipeline.
 """
 
+import os
+from functools import cache
 from pathlib import Path
 
+# Environment overrides, e.g. to keep the data on a fast local volume:
+#   FOOTBALL_PIPELINE_DATA_DIR=/mnt/nvme/football football_pipeline --bronze
+ROOT_ENV_VAR = "FOOTBALL_PIPELINE_ROOT"
+DATA_DIR_ENV_VAR = "FOOTBALL_PIPELINE_DATA_DIR"
+LOGS_DIR_ENV_VAR = "FOOTBALL_PIPELINE_LOGS_DIR"
+
+@cache
 def find_project_root() -> Path:
-    """Find project root by looking for pyproject.toml."""
-    current = Path(__file__).parent
+    """
+    Find the project root: $FOOTBALL_PIPELINE_ROOT, else the checkout this package
+    lives in (src/football_pipeline/utils -> three levels up), else the nearest
+    parent directory holding a pyproject.toml.
+    """
+    if os.environ.get(ROOT_ENV_VAR):
+        return Path(os.environ[ROOT_ENV_VAR]).expanduser()
+    here = Path(__file__).parent
+    # The usual src layout: one stat instead of walking every parent directory
+    checkout = here.parents[2]
+    if (checkout / "pyproject.toml").exists():
+        return checkout
+    current = here
     while current != current.parent:
         if (current / "pyproject.toml").exists():
             return current
         current = current.parent
-    raise FileNotFoundError("Could not find project root")
+    raise FileNotFoundError(f"Could not find project root, set {ROOT_ENV_VAR} or {DATA_DIR_ENV_VAR}")
+
+def _env_dir(name: str, default: str) -> Path:
+    """A directory from an environment variable, defaulting to <project root>/<default>."""
+    value = os.environ.get(name)
+    if value:
+        return Path(value).expanduser()
+    return find_project_root() / default
+
+# Project structure (the root is only looked up when a directory is not set explicitly)
+DATA_DIR = _env_dir(DATA_DIR_ENV_VAR, "data")
+LOGS_DIR = _env_dir(LOGS_DIR_ENV_VAR, "logs")
 
-# Project structure
-PROJECT_ROOT = find_project_root()
-DATA_DIR = PROJECT_ROOT / "data"
-LOGS_DIR = PROJECT_ROOT / "logs"
+def __getattr__(name: str):
+    # PROJECT_ROOT is resolved on first use rather than at import
+    if name == "PROJECT_ROOT":
+        return find_project_root()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Supported values
 SUPPORTED_LAYERS = ["landing", "bronze", "silver", "gold"]
@@ -26,6 +58,20 @@ SUPPORTED_DATA_TYPES = {
     "j1_league": ["matches", "events", "physical", "mappings"]
 }
 
+# JSON ingestion engines: "pandas" (json_normalize) or "native" (Polars JSON reader)
+SUPPORTED_JSON_ENGINES = ["pandas", "native"]
+DEFAULT_JSON_ENGINE = "pandas"
+
+# Memory ceiling for streaming ingestion of the large single-file J1 League datasets
+DEFAULT_STREAM_MEMORY_MB = 512
+
+# Watch mode (football_pipeline watch): how often landing is polled, how long a file's
+# size and mtime must stay put before it counts as fully written, and how long a
+# batch may wait for files that are still being written
+DEFAULT_WATCH_POLL_SECONDS = 2.0
+DEFAULT_WATCH_SETTLE_SECONDS = 3.0
+DEFAULT_WATCH_MAX_WAIT_SECONDS = 30.0
+
 # =============================================================================
 # PREDEFINED PATHS FOR EASY NOTEBOOK USAGE
 # =============================================================================
@@ -54,6 +100,13 @@ BRONZE_OPEN_DATA_MATCHES_DIR = BRONZE_OPEN_DATA_DIR / "matches"
 BRONZE_OPEN_DATA_LINEUPS_DIR = BRONZE_OPEN_DATA_DIR / "lineups"
 BRONZE_OPEN_DATA_EVENTS_DIR = BRONZE_OPEN_DATA_DIR / "events"
 BRONZE_OPEN_DATA_360_DIR = BRONZE_OPEN_DATA_DIR / "three-sixty"
+# Competition/season partitioned copies of the per-match datasets
+BRONZE_OPEN_DATA_COMPACTED_DIR = DATA_DIR / "bronze" / "open_data" / "compacted"
+BRONZE_OPEN_DATA_EVENTS_COMPACTED = BRONZE_OPEN_DATA_COMPACTED_DIR / "events"
+BRONZE_OPEN_DATA_LINEUPS_COMPACTED = BRONZE_OPEN_DATA_COMPACTED_DIR / "lineups"
+BRONZE_OPEN_DATA_360_COMPACTED = BRONZE_OPEN_DATA_COMPACTED_DIR / "three-sixty"
+# match_id -> file/row group index of the datasets above (see bronze/open_data/index.py)
+BRONZE_OPEN_DATA_MATCH_INDEX = DATA_DIR / "bronze" / "open_data" / "_match_index.parquet"
 
 # J1 League
 BRONZE_J1_DIR = DATA_DIR / "bronze" / "j1_league"
@@ -70,6 +123,9 @@ SILVER_OPEN_DATA_MATCHES_DIR = SILVER_OPEN_DATA_DIR / "matches"
 SILVER_OPEN_DATA_LINEUPS_DIR = SILVER_OPEN_DATA_DIR / "lineups"
 SILVER_OPEN_DATA_EVENTS_DIR = SILVER_OPEN_DATA_DIR / "events"
 SILVER_OPEN_DATA_360_DIR = SILVER_OPEN_DATA_DIR / "three-sixty"
+SILVER_OPEN_DATA_SPADL_DIR = SILVER_OPEN_DATA_DIR / "spadl"
+# Dimension and fact tables keyed by integer surrogate keys (silver/open_data/star.py)
+SILVER_OPEN_DATA_STAR_DIR = SILVER_OPEN_DATA_DIR / "star"
 
 # J1 League
 SILVER_J1_DIR = DATA_DIR / "silver" / "j1_league"
@@ -86,6 +142,7 @@ GOLD_OPEN_DATA_MATCHES_DIR = GOLD_OPEN_DATA_DIR / "matches"
 GOLD_OPEN_DATA_LINEUPS_DIR = GOLD_OPEN_DATA_DIR / "lineups"
 GOLD_OPEN_DATA_EVENTS_DIR = GOLD_OPEN_DATA_DIR / "events"
 GOLD_OPEN_DATA_360_DIR = GOLD_OPEN_DATA_DIR / "three-sixty"
+GOLD_OPEN_DATA_XG_DIR = GOLD_OPEN_DATA_DIR / "xg"
 
 # J1 League
 GOLD_J1_DIR = DATA_DIR / "gold" / "j1_league"
@@ -94,6 +151,13 @@ GOLD_J1_EVENTS = GOLD_J1_DIR / "events"
 GOLD_J1_PHYSICAL = GOLD_J1_DIR / "physical"
 GOLD_J1_MAPPINGS = GOLD_J1_DIR / "mappings"
 
+# Completion markers of sharded runs (utils/sharding.py), next to the data the shards share
+SHARDS_DIR = DATA_DIR / "_shards"
+
+# Memoized notebook results (football_pipeline/cache.py) and the size they may grow to
+CACHE_DIR = DATA_DIR / "_cache"
+DEFAULT_CACHE_MAX_MB = 2048
+
 # LOG PATHS
 # Open Data Logs
 LOGS_OPEN_DATA_DIR = LOGS_DIR / "open_data"
@@ -108,4 +172,58 @@ LOGS_J1_SILVER = LOGS_J1_DIR / "silver.log"
 LOGS_J1_GOLD = LOGS_J1_DIR / "gold.log"
 
 # Pipeline Logs
-LOGS_PIPELINE_MAIN = LOGS_DIR / "pipeline.log"
\ No newline at end of file
+LOGS_PIPELINE_MAIN = LOGS_DIR / "pipeline.log"
+
+# Run reports (utils/metrics.py): one subdirectory per pipeline run
+LOGS_RUNS_DIR = LOGS_DIR / "runs"
+
+# =============================================================================
+# DATASET LOOKUP
+# =============================================================================
+
+# (layer, source, dataset) -> the Parquet file or directory holding it
+DATA_PATHS = {
+    ("bronze", "open_data", "competitions"): BRONZE_OPEN_DATA_DIR / "competitions.parquet",
+    ("bronze", "open_data", "matches"): BRONZE_OPEN_DATA_MATCHES_DIR,
+    ("bronze", "open_data", "lineups"): BRONZE_OPEN_DATA_LINEUPS_DIR,
+    ("bronze", "open_data", "events"): BRONZE_OPEN_DATA_EVENTS_DIR,
+    ("bronze", "open_data", "three-sixty"): BRONZE_OPEN_DATA_360_DIR,
+    ("bronze", "j1_league", "matches"): BRONZE_J1_MATCHES / "sb_matches.parquet",
+    ("bronze", "j1_league", "events"): BRONZE_J1_EVENTS / "sb_events.parquet",
+    ("bronze", "j1_league", "physical"): BRONZE_J1_PHYSICAL / "hudl_physical.parquet",
+    ("bronze", "j1_league", "mappings"): BRONZE_J1_MAPPINGS,
+    ("silver", "open_data", "events"): SILVER_OPEN_DATA_EVENTS_DIR / "events.parquet",
+    ("silver", "open_data", "lineups"): SILVER_OPEN_DATA_LINEUPS_DIR / "lineups_by_match.parquet",
+    ("silver", "open_data", "freeze_frames"): SILVER_OPEN_DATA_360_DIR / "freeze_frames.parquet",
+    ("silver", "open_data", "visible_areas"): SILVER_OPEN_DATA_360_DIR / "visible_areas.parquet",
+    ("silver", "open_data", "spadl_actions"): SILVER_OPEN_DATA_SPADL_DIR / "actions",
+    ("silver", "open_data", "fact_events"): SILVER_OPEN_DATA_STAR_DIR / "fact_events.parquet",
+    ("silver", "open_data", "fact_lineups"): SILVER_OPEN_DATA_STAR_DIR / "fact_lineups.parquet",
+    **{
+        ("silver", "open_data", f"dim_{name}"): SILVER_OPEN_DATA_STAR_DIR / f"dim_{name}.parquet"
+        for name in ["player", "team", "competition", "season", "event_type", "position", "event"]
+    },
+    ("silver", "j1_league", "physical"): SILVER_J1_PHYSICAL / "physical.parquet",
+    ("silver", "j1_league", "physical_player_match"): SILVER_J1_PHYSICAL / "player_match.parquet",
+    ("silver", "j1_league", "physical_player_season"): SILVER_J1_PHYSICAL / "player_season.parquet",
+    ("gold", "open_data", "shots_xg"): GOLD_OPEN_DATA_XG_DIR / "shots_xg.parquet",
+}
+
+
+def get_data_path(layer: str, source: str, dataset: str) -> Path:
+    """
+    Get the Parquet file (or directory of files) of a dataset.
+
+    Args:
+        layer (str): The layer, e.g. "bronze".
+        source (str): The source, e.g. "open_data".
+        dataset (str): The dataset, e.g. "events".
+
+    Returns:
+        Path: The dataset's file or directory (it may not exist until the layer has run).
+    """
+    key = (layer, source, dataset)
+    if key not in DATA_PATHS:
+        known = ", ".join("/".join(k) for k in DATA_PATHS)
+        raise ValueError(f"Unknown dataset {'/'.join(key)}. Known datasets: {known}")
+    return DATA_PATHS[key]
@@ -1,10 +1,57 @@
 import polars as pl
-import pandas as pd
-from pathlib import Path
+from pathlib import Path, PurePosixPath
+import csv
+import io
 import json
+import os
+import shutil
+import tempfile
 
-from football_pipeline.utils.io import is_source_newer
-from football_pipeline.utils.logging import NullLogger
+from football_pipeline.utils.archive import (
+    find_sources,
+    is_plain_file,
+    open_source,
+    read_source,
+    source_stem,
+    stream_sources,
+    without_data,
+)
+from football_pipeline.utils.constants import DEFAULT_JSON_ENGINE, SUPPORTED_JSON_ENGINES
+from football_pipeline.utils.logging import NullLogger, ProgressReporter, worker_logger
+from football_pipeline.utils.manifest import IngestManifest, plan_incremental, version_of
+from football_pipeline.utils.metrics import measure_file, measured_batch, profiling_enabled, record_task
+from football_pipeline.utils.parallel import map_tasks, resolve_workers
+from football_pipeline.utils.planning import PlanOnly, cost_model, dry_run_active, iter_batches, plan_work
+from football_pipeline.utils.schemas import SCHEMA_VERSION, field_names, get_schema
+
+# Streaming ingestion: rough in-memory size of a parsed chunk relative to its JSON
+# text (Python objects plus one DataFrame copy), used to turn a memory ceiling into
+# a chunk size, and the row-group size of the final Parquet file.
+STREAM_MEMORY_EXPANSION = 25
+STREAM_ROW_GROUP_SIZE = 100_000
+
+# Bump when a change to the ingest code changes what gets written for the same
+# input, so the per-dataset manifests rebuild existing outputs.
+INGEST_VERSION = 1
+
+# CSV column types are inferred once per file (over every row) and cached next to
+# the outputs in <output_dir>/_schemas/<csv stem>.json, so ids keep their type
+# across runs even when a new export would infer differently. Delete a cached
+# schema to infer it again.
+CSV_SCHEMA_DIR = "_schemas"
+# An object key in JSON text: a string followed by a colon (string values never are)
+JSON_KEY_PATTERN = r'"[^"\\]+"\s*:'
+CSV_DTYPES = {"Int64": pl.Int64, "Float64": pl.Float64, "String": pl.String, "Boolean": pl.Boolean}
+
+def json_ingest_version(engine: str, serialize_lists: bool, schema: str | None = None) -> str:
+    """Version tag recorded in manifests for JSON outputs."""
+    if schema is not None and get_schema(schema) is not None:
+        return f"json-schema-{schema}-v{INGEST_VERSION}.{SCHEMA_VERSION}"
+    return f"json-{engine}-{'lists' if serialize_lists else 'nested'}-v{INGEST_VERSION}"
+
+def csv_ingest_version() -> str:
+    """Version tag recorded in manifests for CSV outputs."""
+    return f"csv-native-v{INGEST_VERSION}"
 
 def serialize_all_lists(data, logger=None, log_every=100000, description=""):
     """
@@ -24,7 +71,7 @@ def serialize_all_lists(data, logger=None, log_every=100000, description=""):
             if isinstance(v, list):
                 event[k] = json.dumps(v, ensure_ascii=False)
         if logger and (i + 1) % log_every == 0:
-            logger.info(f"Serialized lists for {i + 1} {description}...")
+            logger.info("Serialized lists for %d %s...", i + 1, description)
     return data
 
 def normalize_column_names(df: pl.DataFrame) -> pl.DataFrame:
@@ -41,6 +88,345 @@ def normalize_column_names(df: pl.DataFrame) -> pl.DataFrame:
     rename_map = {col: col.replace('.', '_') for col in df.columns}
     return df.rename(rename_map)
 
+def flatten_struct_columns(df: pl.DataFrame, separator: str = "_") -> pl.DataFrame:
+    """
+    Recursively unnest struct columns into flat columns, keeping their position.
+    Produces the same names as json_normalize + normalize_column_names.
+    Example: struct 'pass' with field 'end_location' -> 'pass_end_location'
+
+    Args:
+        df (pl.DataFrame): The dataframe to flatten.
+        separator (str, optional): Joins parent and field names. Defaults to "_".
+
+    Returns:
+        pl.DataFrame: The dataframe without struct columns.
+    """
+    while any(isinstance(dtype, pl.Struct) for dtype in df.schema.values()):
+        df = df.select([
+            pl.col(col).struct.unnest().name.prefix(f"{col}{separator}")
+            if isinstance(dtype, pl.Struct) else pl.col(col)
+            for col, dtype in df.schema.items()
+        ])
+    return df
+
+def encode_list_columns(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Encode every list column as a JSON string, the columnar equivalent of serialize_all_lists.
+
+    Args:
+        df (pl.DataFrame): The dataframe whose list columns should be encoded.
+
+    Returns:
+        pl.DataFrame: The dataframe with list columns replaced by JSON strings.
+    """
+    list_cols = [col for col, dtype in df.schema.items() if isinstance(dtype, pl.List)]
+    if not list_cols:
+        return df
+    return df.with_columns([
+        pl.when(pl.col(col).is_null())
+        .then(None)
+        .otherwise(
+            # Wrap in a one-field struct to reuse the struct JSON encoder, then unwrap
+            pl.struct(pl.col(col).alias("v")).struct.json_encode()
+            .str.strip_prefix('{"v":').str.strip_suffix("}")
+        )
+        .alias(col)
+        for col in list_cols
+    ])
+
+def _read_json_pandas(input_file: Path, logger, description: str, serialize_lists: bool) -> pl.DataFrame:
+    """Read a JSON file via json.load + pd.json_normalize (the original engine)."""
+    # pandas is only needed by this engine; importing it costs more than Polars itself
+    import pandas as pd
+
+    with open_source(input_file) as f:
+        data = json.load(f)
+    # Make sure data is a list of records
+    if isinstance(data, dict):
+        data = [data]
+    if serialize_lists:
+        data = serialize_all_lists(data, logger=logger, description=description)
+    df_pd = pd.json_normalize(data)
+    df = pl.from_pandas(df_pd)
+    return normalize_column_names(df)
+
+def _read_json_native(input_file: Path, serialize_lists: bool) -> pl.DataFrame:
+    """Read a JSON file with the Polars JSON reader, without building Python records."""
+    # Scan every record so fields that only appear late in a match are not dropped
+    df = pl.read_json(_json_input(input_file), infer_schema_length=None)
+    if serialize_lists:
+        # Only top-level lists, mirroring serialize_all_lists (nested lists stay native)
+        df = encode_list_columns(df)
+    return flatten_struct_columns(df)
+
+def _read_json_typed(input_file: Path, record_schema: pl.Schema, logger=None) -> pl.DataFrame:
+    """Read a JSON file against a registered record schema (see utils/schemas.py)."""
+    return _typed_frame(read_source(input_file), record_schema, logger, str(without_data(input_file)))
+
+def _unregistered_fields(raw: bytes, record_schema: pl.Schema) -> set[str]:
+    """The object keys of a JSON text that appear nowhere in a record schema."""
+    keys = (
+        pl.Series([raw]).cast(pl.String)
+        .str.extract_all(JSON_KEY_PATTERN).explode().drop_nulls().unique()
+        .str.extract(r'^"([^"\\]+)"', 1)
+    )
+    return set(keys.to_list()) - field_names(record_schema)
+
+def _typed_frame(raw: bytes, record_schema: pl.Schema, logger, source: str) -> pl.DataFrame:
+    """
+    Parse JSON records against a record schema without losing the fields it does not know.
+
+    The keys of the text are checked against the schema first, which is much
+    cheaper than inferring a schema; only a file with unknown keys is parsed
+    twice. Unknown top-level fields are appended with their inferred dtypes,
+    unknown fields inside registered objects are reported and not written.
+    """
+    unknown = _unregistered_fields(raw, record_schema)
+    if unknown:
+        if logger is None:
+            logger = NullLogger()
+        try:
+            inferred = pl.read_json(io.BytesIO(raw), infer_schema_length=None).schema
+        except pl.exceptions.PolarsError:
+            inferred = {}
+        extra = {name: dtype for name, dtype in inferred.items() if name not in record_schema}
+        dropped = unknown - set(extra) - field_names(pl.Schema(extra))
+        if extra:
+            logger.warning(
+                "%s: fields not in the schema registry, kept with inferred dtypes: %s", source, ", ".join(sorted(extra))
+            )
+        if dropped:
+            logger.warning(
+                "%s: nested fields not in the schema registry, not written: %s", source, ", ".join(sorted(dropped))
+            )
+        record_schema = pl.Schema({**record_schema, **extra})
+    return flatten_struct_columns(pl.read_json(io.BytesIO(raw), schema=record_schema))
+
+def _json_input(input_file):
+    """What pl.read_json reads: plain files by path, compressed files and archive members as bytes."""
+    return input_file if is_plain_file(input_file) else read_source(input_file)
+
+## STREAMING JSON INGESTION ##
+
+def iter_json_array(input_file: Path, block_size: int = 1 << 20):
+    """
+    Incrementally parse a file holding a top-level JSON array of objects.
+
+    Only one block of text plus the record being decoded is held in memory at a
+    time. A file holding a single top-level object yields that object.
+
+    Args:
+        input_file (Path): The path to the JSON file.
+        block_size (int, optional): Characters read per block. Defaults to 1 Mi.
+
+    Yields:
+        tuple: (record, text) - the decoded record and its raw JSON text.
+    """
+    decoder = json.JSONDecoder()
+    with open_source(input_file) as raw, io.TextIOWrapper(raw, encoding="utf-8") as f:
+        buffer = f.read(block_size)
+        eof = not buffer
+        pos = 0
+
+        def skip(chars: str):
+            nonlocal buffer, pos, eof
+            while True:
+                while pos < len(buffer) and buffer[pos] in chars:
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return
+                buffer, pos = f.read(block_size), 0
+                eof = not buffer
+
+        skip(" \t\r\n")
+        if pos < len(buffer) and buffer[pos] == "{":
+            text = buffer[pos:] + f.read()
+            yield json.loads(text), text
+            return
+        if pos >= len(buffer) or buffer[pos] != "[":
+            raise json.JSONDecodeError("Expected a top-level JSON array", buffer, pos)
+        pos += 1
+        while True:
+            skip(" \t\r\n,")
+            if pos >= len(buffer):
+                raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+            if buffer[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Most likely the record continues in the next block
+                if eof:
+                    raise
+                block = f.read(block_size)
+                eof = not block
+                buffer, pos = buffer[pos:] + block, 0
+                continue
+            yield record, buffer[pos:end]
+            pos = end
+
+def iter_json_array_chunks(input_file: Path, max_chunk_bytes: int):
+    """
+    Group the records of a top-level JSON array into chunks of bounded text size.
+
+    Args:
+        input_file (Path): The path to the JSON file.
+        max_chunk_bytes (int): Approximate maximum JSON text per chunk.
+
+    Yields:
+        tuple: (records, texts) - the decoded records of a chunk and their raw JSON text.
+    """
+    records, texts, size = [], [], 0
+    for record, text in iter_json_array(input_file):
+        records.append(record)
+        texts.append(text)
+        size += len(text)
+        if size >= max_chunk_bytes:
+            yield records, texts
+            records, texts, size = [], [], 0
+    if records:
+        yield records, texts
+
+def _chunk_to_frame(
+    records: list,
+    texts: list,
+    engine: str,
+    serialize_lists: bool,
+    logger,
+    description: str,
+    record_schema: pl.Schema | None = None,
+    source: str = "",
+) -> pl.DataFrame:
+    """Turn one streamed chunk into a flat frame with the registered schema or the selected engine."""
+    if record_schema is not None:
+        raw = ("[" + ",".join(texts) + "]").encode("utf-8")
+        return _typed_frame(raw, record_schema, logger, source)
+    if engine == "native":
+        raw = ("[" + ",".join(texts) + "]").encode("utf-8")
+        df = pl.read_json(io.BytesIO(raw), infer_schema_length=None)
+        if serialize_lists:
+            df = encode_list_columns(df)
+        return flatten_struct_columns(df)
+    import pandas as pd
+
+    if serialize_lists:
+        records = serialize_all_lists(records, logger=logger, description=description)
+    return normalize_column_names(pl.from_pandas(pd.json_normalize(records)))
+
+def _merge_parts(parts: list[Path], template: pl.DataFrame, output_file: Path, max_memory_mb: int):
+    """
+    Concatenate Parquet parts into one file, conforming each part to ``template``'s schema.
+
+    Parts are read one at a time and buffered until a full row group is ready, so
+    memory is bounded by the row-group buffer rather than the output size.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    max_buffer_bytes = max_memory_mb * 1024 * 1024 // 4
+    writer = None
+    buffer, buffer_rows, buffer_bytes = [], 0, 0
+
+    def flush():
+        nonlocal writer, buffer, buffer_rows, buffer_bytes
+        table = pa.concat_tables(buffer)
+        if writer is None:
+            writer = pq.ParquetWriter(output_file, table.schema, compression="snappy")
+        writer.write_table(table, row_group_size=STREAM_ROW_GROUP_SIZE)
+        buffer, buffer_rows, buffer_bytes = [], 0, 0
+
+    try:
+        for part in parts:
+            # Relaxed concat with the empty template adds missing columns and casts to the common types
+            table = pl.concat([template, pl.read_parquet(part)], how="diagonal_relaxed").to_arrow()
+            buffer.append(table)
+            buffer_rows += table.num_rows
+            buffer_bytes += table.nbytes
+            if buffer_rows >= STREAM_ROW_GROUP_SIZE or buffer_bytes >= max_buffer_bytes:
+                flush()
+        if buffer:
+            flush()
+    finally:
+        if writer is not None:
+            writer.close()
+
+def _write_json_streaming(
+    input_file: Path,
+    output_file: Path,
+    engine: str,
+    serialize_lists: bool,
+    max_memory_mb: int,
+    logger,
+    description: str,
+    record_schema: pl.Schema | None = None,
+) -> int:
+    """
+    Write a large JSON array to Parquet in bounded-memory chunks.
+
+    Each chunk is normalized on its own and spilled to a temporary Parquet part;
+    the parts are then merged into row groups one at a time. Columns are aligned
+    by name in first-appearance order and dtypes are relaxed to a common supertype,
+    which gives the same columns and types as normalizing the whole file at once.
+    With a registered schema every chunk already has the final columns and types.
+
+    Returns:
+        int: The number of records written.
+    """
+    max_chunk_bytes = max(1, max_memory_mb * 1024 * 1024 // STREAM_MEMORY_EXPANSION)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{output_file.stem}.", dir=output_file.parent))
+    try:
+        parts = []
+        columns_per_part = []
+        total_rows = 0
+        for i, (records, texts) in enumerate(iter_json_array_chunks(input_file, max_chunk_bytes)):
+            df = _chunk_to_frame(
+                records, texts, engine, serialize_lists, logger, description, record_schema, str(without_data(input_file))
+            )
+            del records, texts
+            part = tmp_dir / f"part-{i:05d}.parquet"
+            df.write_parquet(part, compression="snappy")
+            parts.append(part)
+            columns_per_part.append(set(df.columns))
+            total_rows += len(df)
+            logger.debug("Streamed %d %s records so far", total_rows, description)
+        if not parts:
+            pl.DataFrame().write_parquet(output_file, compression="snappy")
+            return 0
+
+        # Common schema of all parts: columns in first-appearance order, dtypes relaxed
+        schema = pl.concat([pl.scan_parquet(part) for part in parts], how="diagonal_relaxed").collect_schema()
+        if engine == "pandas" and record_schema is None:
+            # pandas turns integer columns with missing values into floats; a column
+            # missing from a whole chunk is missing values too
+            all_columns = set().union(*columns_per_part)
+            partial = {col for col in all_columns if any(col not in cols for cols in columns_per_part)}
+            schema = {
+                col: pl.Float64 if col in partial and dtype.is_integer() else dtype
+                for col, dtype in schema.items()
+            }
+        _merge_parts(parts, pl.DataFrame(schema=schema), tmp_dir / output_file.name, max_memory_mb)
+        shutil.move(tmp_dir / output_file.name, output_file)
+        return total_rows
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def _check_manifest(input_file: Path, output_file: Path, version: str, overwrite: bool):
+    """
+    Check a single source against its output directory's manifest.
+
+    Returns:
+        tuple: (manifest, fingerprint); fingerprint is None when the output is up to date.
+    """
+    manifest = IngestManifest.load(output_file.parent)
+    [(_, _, _, status, fingerprint)] = plan_incremental(
+        manifest, [(input_file.name, input_file, output_file)], version, overwrite=overwrite
+    )
+    if status == "unchanged":
+        # The manifest may have picked up a new mtime for an unchanged file
+        manifest.save()
+        return manifest, None
+    return manifest, fingerprint
+
 ## PARQUET INGESTION FUNCTIONS ##
 
 def ingest_json_to_parquet(
@@ -50,47 +436,212 @@ def ingest_json_to_parquet(
     description: str = "",
     serialize_lists: bool = True,
     overwrite: bool = False,
+    engine: str = DEFAULT_JSON_ENGINE,
+    use_manifest: bool = True,
+    max_memory_mb: int | None = None,
+    schema: str | None = None,
 ):
     """
     Ingest a single JSON file (list or dict) to Parquet.
 
+    The file is skipped when the output directory's manifest shows that neither
+    its content nor the ingest version changed since the output was written.
+
+    With ``max_memory_mb`` set, the top-level array is parsed incrementally and
+    written in bounded chunks, so peak memory does not grow with the file size.
+
+    With ``schema`` naming a registered dataset, the file is read against that
+    dataset's schema: list fields stay typed list columns and every output of the
+    dataset has the same columns in the same order.
+
     Args:
-        input_file (Path): The path to the input JSON file.
+        input_file (Path | ArchiveMember): The input JSON file (plain or gzip-compressed),
+            or a member of an archive (see utils/archive.py).
         output_file (Path): The path to the output Parquet file.
         logger (Logger, optional): The logger to use. Defaults to None.
         description (str, optional): The description of the data. Defaults to "".
         serialize_lists (bool, optional): Whether to serialize lists to JSON strings. Defaults to True.
         overwrite (bool, optional): Whether to overwrite the output file if it already exists. Defaults to False.
+        engine (str, optional): "pandas" (json_normalize) or "native" (Polars JSON reader). Defaults to DEFAULT_JSON_ENGINE.
+        use_manifest (bool, optional): Whether to consult and update the output directory's manifest.
+            Batch ingestion turns this off and manages the manifest itself. Defaults to True.
+        max_memory_mb (int, optional): Stream the file with roughly this memory ceiling.
+            None loads the whole file at once. Defaults to None.
+        schema (str, optional): Registered dataset to read the file as (see utils/schemas.py);
+            overrides engine and serialize_lists. None infers the schema from the file. Defaults to None.
+
+    Returns:
+        bool: True if the output file was written, False if it was skipped.
     """
     if logger is None:
         logger = NullLogger()
+    if engine not in SUPPORTED_JSON_ENGINES:
+        raise ValueError(f"Unknown JSON engine: {engine}. Options: {', '.join(SUPPORTED_JSON_ENGINES)}")
+    record_schema = get_schema(schema) if schema is not None else None
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    if output_file.exists() and not is_source_newer(input_file, output_file) and not overwrite:
-        logger.info(f"{description.title()} file {output_file} is up to date, skipping.")
-        return
     if not input_file.exists():
         logger.warning(f"{description.title()} file {input_file} not found, skipping.")
-        return
+        return False
+    version = json_ingest_version(engine, serialize_lists, schema)
+    manifest, fingerprint = None, None
+    if use_manifest:
+        manifest, fingerprint = _check_manifest(input_file, output_file, version, overwrite)
+        if fingerprint is None:
+            logger.info("%s file %s is up to date, skipping.", description.title(), output_file)
+            return False
     try:
-        with open(input_file, "r") as f:
-            data = json.load(f)
-        # Make sure data is a list of records
-        if isinstance(data, dict):
-            data = [data]
-        if serialize_lists:
-            data = serialize_all_lists(data, logger=logger, description=description)
-        df_pd = pd.json_normalize(data)
-        df = pl.from_pandas(df_pd)
-        df = normalize_column_names(df)
-        df.write_parquet(output_file, compression="snappy")
-        logger.info(f"Successfully processed {len(df)} {description} records to {output_file}")
-    except json.JSONDecodeError as e:
+        with measure_file(input_file, output_file):
+            if max_memory_mb is not None:
+                n_rows = _write_json_streaming(
+                    input_file, output_file, engine, serialize_lists, max_memory_mb, logger, description, record_schema
+                )
+            else:
+                if record_schema is not None:
+                    df = _read_json_typed(input_file, record_schema, logger)
+                elif engine == "native":
+                    df = _read_json_native(input_file, serialize_lists)
+                else:
+                    df = _read_json_pandas(input_file, logger, description, serialize_lists)
+                df.write_parquet(output_file, compression="snappy")
+                n_rows = len(df)
+        if manifest is not None:
+            manifest.record(input_file.name, output_file, version, fingerprint)
+            manifest.save()
+        logger.info("Successfully processed %d %s records to %s", n_rows, description, output_file)
+        return True
+    except (json.JSONDecodeError, pl.exceptions.ComputeError) as e:
         logger.error(f"JSON decode error in {description} file: {e}")
         raise
     except Exception as e:
         logger.error(f"Error processing {description} data: {e}")
         raise
 
+def _ingest_json_task(task: dict):
+    """
+    Worker entry point: ingest one JSON file and report the outcome to the parent.
+
+    Args:
+        task (dict): Keyword arguments for ingest_json_to_parquet.
+
+    Returns:
+        tuple: (input_file, status, error) where status is "processed", "skipped" or "error".
+    """
+    try:
+        written = ingest_json_to_parquet(**task)
+        return without_data(task["input_file"]), "processed" if written else "skipped", None
+    except Exception as e:
+        return without_data(task["input_file"]), "error", str(e)
+
+def run_incremental_batch(
+    items: list[tuple[str, Path, Path]],
+    build_task,
+    task_fn,
+    version: str | dict[str, str],
+    output_dir: Path,
+    logger,
+    description: str,
+    log_frequency: int,
+    workers: int,
+    overwrite: bool,
+    shard=None,
+):
+    """
+    Shared driver for incremental per-file stages (the batch ingests, SPADL
+    conversion): plan against the output directory's manifest, fan new/changed
+    files out to the workers, and record every output that was written.
+
+    With a shard (utils/sharding.py) only the sources it owns are considered,
+    against the shard's own manifest.
+
+    The pending files are sent to the workers largest first, with the small
+    ones packed into shared tasks (utils/planning.py). In a dry run the plan is
+    raised as PlanOnly instead.
+
+    Args:
+        items (list[tuple]): (key, source, output) for every candidate source.
+        build_task (callable): Builds the worker task for (source, output).
+        task_fn (callable): Module-level worker entry point returning (input_file, status, error).
+        version (str | dict): The current ingest version, or a key -> version mapping
+            (see plan_incremental).
+        output_dir (Path): The dataset's output directory (holds the manifest).
+        logger (Logger): The logger to report to.
+        description (str): The description of the data.
+        log_frequency (int): Log progress every this many files (rate-limited, see ProgressReporter).
+        workers (int): Number of worker processes.
+        overwrite (bool): Rebuild every output regardless of the manifest.
+        shard (Shard, optional): Only process the sources of this shard. Defaults to None.
+
+    Returns:
+        tuple: (processed_count, skipped_count, error_count)
+    """
+    if shard is not None:
+        items = [item for item in items if shard.owns(item[0])]
+    manifest = IngestManifest.load(output_dir, shard)
+    plan = plan_incremental(manifest, items, version, workers=workers, overwrite=overwrite)
+    pending = {
+        source: (key, output, fingerprint)
+        for key, source, output, status, fingerprint in plan
+        if status != "unchanged"
+    }
+    new_count = sum(1 for *_, status, _ in plan if status == "new")
+    skipped_count = len(plan) - len(pending)
+    logger.info(
+        f"{description.title()}: {new_count} new, {len(pending) - new_count} changed, "
+        f"{skipped_count} unchanged."
+    )
+
+    workers = resolve_workers(workers)
+    work = plan_work(description, list(pending), workers, cost_model(output_dir), skipped_count)
+    if dry_run_active():
+        raise PlanOnly(work)
+    if pending:
+        logger.info(work.summary())
+
+    # Members of tar archives are read in one sequential pass while the workers convert them
+    batches = iter_batches(work, stream_sources(work.sources()))
+    # In-process tasks are covered by the stage's own profiler
+    profile = profiling_enabled() and workers > 1 and len(pending) > 1
+    measured = (
+        [(task_fn, build_task(source, pending[source][1]), profile) for source in batch]
+        for batch in batches
+    )
+    results = (
+        outcome
+        for batch_results in map_tasks(measured_batch, measured, workers, total=len(work.batches))
+        for outcome in batch_results
+    )
+    processed_count = 0
+    error_count = 0
+    replaced_outputs = set()
+    progress = ProgressReporter(logger, description, len(pending), every=log_frequency)
+    try:
+        for i, (result, record, stats) in enumerate(results, 1):
+            input_file, status, error = result
+            record_task(record, status, stats)
+            key, output, fingerprint = pending[input_file]
+            if status == "processed":
+                processed_count += 1
+                previous_output = manifest.entries.get(key, {}).get("output")
+                if previous_output and previous_output != output.name:
+                    replaced_outputs.add(previous_output)
+                manifest.record(key, output, version_of(version, key), fingerprint)
+            elif status == "skipped":
+                skipped_count += 1
+            else:
+                logger.error("Failed to process %s: %s", input_file, error)
+                error_count += 1
+            progress.update(i)
+    finally:
+        # Keep whatever finished, so an interrupted run resumes where it stopped
+        manifest.save()
+
+    # Outputs that were renamed (e.g. by a naming change) would otherwise linger
+    current_outputs = {entry["output"] for entry in manifest.entries.values()}
+    for stale_output in replaced_outputs - current_outputs:
+        (output_dir / stale_output).unlink(missing_ok=True)
+        logger.debug("Removed stale output %s", stale_output)
+    return processed_count, skipped_count, error_count
+
 def ingest_json_batch_to_parquet(
     input_dir: Path,
     output_dir: Path,
@@ -99,13 +650,22 @@ def ingest_json_batch_to_parquet(
     file_pattern: str = "*.json",
     serialize_lists: bool = True,
     output_prefix: str = "",
-    log_frequency: int = 50
+    log_frequency: int = 50,
+    workers: int | None = 1,
+    engine: str = DEFAULT_JSON_ENGINE,
+    overwrite: bool = False,
+    schema: str | None = None,
+    shard=None,
 ):
     """
     Ingest all JSON files in a directory to Parquet files (one per input).
 
+    Only files that are new, or whose content or ingest version changed since the
+    last run, are ingested; see utils/manifest.py.
+
     Args:
-        input_dir (Path): The path to the input directory.
+        input_dir (Path | ArchiveDir): The input directory, or a directory inside an archive
+            (see utils/archive.py). Gzip-compressed files (``*.json.gz``) are read as well.
         output_dir (Path): The path to the output directory.
         logger (Logger, optional): The logger to use. Defaults to None.
         description (str, optional): The description of the data. Defaults to "".
@@ -113,80 +673,178 @@ def ingest_json_batch_to_parquet(
         serialize_lists (bool, optional): Whether to serialize lists to JSON strings. Defaults to True.
         output_prefix (str, optional): The prefix to add to the output filename. Defaults to "".
         log_frequency (int, optional): The frequency of logging. Defaults to 50.
+        workers (int, optional): Number of worker processes. None means one per CPU. Defaults to 1.
+        engine (str, optional): "pandas" or "native", see ingest_json_to_parquet. Defaults to DEFAULT_JSON_ENGINE.
+        overwrite (bool, optional): Rebuild every output regardless of the manifest. Defaults to False.
+        schema (str, optional): Registered dataset to read every file as, see ingest_json_to_parquet. Defaults to None.
+        shard (Shard, optional): Only ingest the files of this shard (see utils/sharding.py). Defaults to None.
+
+    Returns:
+        tuple: (processed_count, skipped_count, error_count)
     """
     if logger is None:
         logger = NullLogger()
     output_dir.mkdir(parents=True, exist_ok=True)
-    json_files = list(input_dir.glob(file_pattern))
-    logger.info(f"Found {len(json_files)} {description} files to process.")
-    processed_count = 0
-    skipped_count = 0
-    error_count = 0
-    for json_file in json_files:
-        # Construct output filename
+    sources = find_sources(input_dir, file_pattern)
+    workers = resolve_workers(workers)
+    if shard is not None:
+        sources = [(key, source) for key, source in sources if shard.owns(key)]
+        logger.info(f"Shard {shard} owns {len(sources)} {description} files, processing them with {workers} worker(s).")
+    else:
+        logger.info(f"Found {len(sources)} {description} files to process with {workers} worker(s).")
+
+    items = []
+    for key, json_file in sources:
+        # Construct output filename. Nested inputs (matches/<competition_id>/<season_id>.json)
+        # keep their sub-directories in the name so that equal season ids of different
+        # competitions do not overwrite each other.
+        stem = "_".join(PurePosixPath(key).with_suffix("").parts)
         if output_prefix:
-            output_filename = f"{output_prefix}_{json_file.stem}.parquet"
+            output_filename = f"{output_prefix}_{stem}.parquet"
         else:
-            output_filename = f"{json_file.stem}.parquet"
-        output_file = output_dir / output_filename
+            output_filename = f"{stem}.parquet"
+        items.append((key, json_file, output_dir / output_filename))
 
-        try:
-            ingest_json_to_parquet(
-                input_file=json_file,
-                output_file=output_file,
-                logger=NullLogger(),
-                description=f"{description} {json_file.stem}",
-                serialize_lists=serialize_lists,
-            )
-            processed_count += 1
-            if processed_count % log_frequency == 0:
-                logger.info(f"Processed {processed_count} {description} files so far.")
-        except Exception as e:
-            logger.error(f"Failed to process {json_file}: {e}")
-            error_count += 1
-
-    summary_msg = f"{description.title()} batch ingest complete: {processed_count} processed, {error_count} errors"
+    def build_task(json_file: Path, output_file: Path) -> dict:
+        return {
+            "input_file": json_file,
+            "output_file": output_file,
+            "description": f"{description} {source_stem(json_file)}",
+            "serialize_lists": serialize_lists,
+            "engine": engine,
+            "overwrite": True,
+            "use_manifest": False,
+            "schema": schema,
+            "logger": worker_logger(logger),
+        }
+
+    processed_count, skipped_count, error_count = run_incremental_batch(
+        items, build_task, _ingest_json_task, json_ingest_version(engine, serialize_lists, schema),
+        output_dir, logger, description, log_frequency, workers, overwrite, shard,
+    )
+
+    summary_msg = (
+        f"{description.title()} batch ingest complete: {processed_count} processed, "
+        f"{skipped_count} skipped, {error_count} errors"
+    )
     logger.info(summary_msg)
     return processed_count, skipped_count, error_count
 
 ## CSV INGESTION FUNCTIONS ##
 
+def csv_schema(input_file: Path, schema_file: Path, logger=None) -> dict:
+    """
+    The column types to read a CSV file with, cached after the first inference.
+
+    The cached schema is used as long as the file's header is unchanged; when
+    columns were added, removed or renamed the schema is inferred again.
+
+    Args:
+        input_file (Path): The CSV file.
+        schema_file (Path): Where its schema is cached.
+        logger (Logger, optional): The logger to use. Defaults to None.
+
+    Returns:
+        dict: Column name -> Polars dtype, in file order.
+    """
+    if logger is None:
+        logger = NullLogger()
+    with open(input_file, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), [])
+    if schema_file.exists():
+        cached = json.loads(schema_file.read_text())
+        if list(cached) == header:
+            return {col: CSV_DTYPES.get(dtype, pl.String) for col, dtype in cached.items()}
+        logger.warning("Columns of %s changed since its schema was cached, inferring it again.", input_file.name)
+
+    # Inferring over every row means a non-numeric id late in the file cannot
+    # make a later read fail; anything that is not a plain scalar type stays a string
+    inferred = pl.scan_csv(input_file, infer_schema_length=None).collect_schema()
+    names = {col: str(dtype) if str(dtype) in CSV_DTYPES else "String" for col, dtype in inferred.items()}
+    schema_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = schema_file.with_suffix(".json.tmp")
+    tmp_file.write_text(json.dumps(names, indent=1))
+    os.replace(tmp_file, schema_file)
+    logger.debug("Cached the schema of %s: %s", input_file.name, names)
+    return {col: CSV_DTYPES[dtype] for col, dtype in names.items()}
+
 def ingest_csv_to_parquet(
     input_file: Path,
     output_file: Path,
     logger=None,
     description: str = "",
     overwrite: bool = False,
+    use_manifest: bool = True,
 ):
     """
     Ingest a single CSV file and write it to Parquet.
 
+    Like ingest_json_to_parquet, the file is skipped when the output directory's
+    manifest shows it is unchanged.
+
+    The file is scanned with Polars' multithreaded CSV reader using the cached
+    schema (see csv_schema) and streamed to Parquet, so it is never loaded whole.
+
     Args:
         input_file (Path): The path to the input CSV file.
         output_file (Path): The path to the output Parquet file.
         logger (Logger, optional): The logger to use. Defaults to None.
         description (str, optional): The description of the data. Defaults to "".
         overwrite (bool, optional): Whether to overwrite the output file if it already exists. Defaults to False.
+        use_manifest (bool, optional): Whether to consult and update the output directory's manifest. Defaults to True.
+
+    Returns:
+        bool: True if the output file was written, False if it was skipped.
     """
     if logger is None:
         logger = NullLogger()
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    if output_file.exists() and not is_source_newer(input_file, output_file) and not overwrite:
-        logger.info(f"{description.title()} file {output_file} is up to date, skipping.")
-        return
     if not input_file.exists():
         logger.warning(f"{description.title()} file {input_file} not found, skipping.")
-        return
+        return False
+    version = csv_ingest_version()
+    manifest, fingerprint = None, None
+    if use_manifest:
+        manifest, fingerprint = _check_manifest(input_file, output_file, version, overwrite)
+        if fingerprint is None:
+            logger.info("%s file %s is up to date, skipping.", description.title(), output_file)
+            return False
     try:
-        df_pd = pd.read_csv(input_file)
-        df = pl.from_pandas(df_pd)
-        df = df.rename({col: col.replace('.', '_') for col in df.columns})
-        df.write_parquet(output_file, compression="snappy")
-        logger.info(f"Successfully processed {len(df)} {description} records to {output_file}")
+        schema = csv_schema(input_file, output_file.parent / CSV_SCHEMA_DIR / f"{input_file.stem}.json", logger)
+        tmp_file = output_file.with_suffix(".parquet.tmp")
+        with measure_file(input_file, output_file):
+            (
+                pl.scan_csv(input_file, schema=schema)
+                .rename({col: col.replace('.', '_') for col in schema})
+                .sink_parquet(tmp_file, compression="snappy")
+            )
+            tmp_file.replace(output_file)
+        if manifest is not None:
+            manifest.record(input_file.name, output_file, version, fingerprint)
+            manifest.save()
+        n_rows = pl.scan_parquet(output_file).select(pl.len()).collect().item()
+        logger.info("Successfully processed %d %s records to %s", n_rows, description, output_file)
+        return True
     except Exception as e:
         logger.error(f"Error processing {description} data: {e}")
         raise
 
+def _ingest_csv_task(task: dict):
+    """
+    Worker entry point: ingest one CSV file and report the outcome to the parent.
+
+    Args:
+        task (dict): Keyword arguments for ingest_csv_to_parquet.
+
+    Returns:
+        tuple: (input_file, status, error) where status is "processed", "skipped" or "error".
+    """
+    try:
+        written = ingest_csv_to_parquet(**task)
+        return task["input_file"], "processed" if written else "skipped", None
+    except Exception as e:
+        return task["input_file"], "error", str(e)
+
 def ingest_csv_batch_to_parquet(
     input_dir: Path,
     output_dir: Path,
@@ -195,10 +853,13 @@ def ingest_csv_batch_to_parquet(
     file_pattern: str = "*.csv",
     overwrite: bool = False,
     log_frequency: int = 10,
+    workers: int | None = 1,
 ):
     """
     Ingest all CSV files in a directory to Parquet files (one per CSV).
 
+    Only new or changed files are ingested, as in ingest_json_batch_to_parquet.
+
     Args:
         input_dir (Path): The path to the input directory.
         output_dir (Path): The path to the output directory.
@@ -207,6 +868,10 @@ def ingest_csv_batch_to_parquet(
         file_pattern (str, optional): The pattern to match the input files. Defaults to "*.csv".
         overwrite (bool, optional): Whether to overwrite the output file if it already exists. Defaults to False.
         log_frequency (int, optional): The frequency of logging. Defaults to 10.
+        workers (int, optional): Number of worker processes. None means one per CPU. Defaults to 1.
+
+    Returns:
+        tuple: (processed_count, skipped_count, error_count)
     """
     if logger is None:
         logger = NullLogger()
@@ -214,24 +879,30 @@ def ingest_csv_batch_to_parquet(
     csv_files = list(input_dir.glob(file_pattern))
     if not csv_files:
         logger.warning(f"No CSV files found in {input_dir}")
-        return
-    processed_count = 0
-    error_count = 0
-    for i, csv_file in enumerate(csv_files, 1):
-        output_file = output_dir / csv_file.with_suffix('.parquet').name
-        try:
-            ingest_csv_to_parquet(
-                input_file=csv_file,
-                output_file=output_file,
-                logger=logger,
-                description=f"{description} {csv_file.stem}",
-                overwrite=overwrite,
-            )
-            processed_count += 1
-            if processed_count % log_frequency == 0:
-                logger.info(f"Processed {processed_count} CSV files so far.")
-        except Exception as e:
-            logger.error(f"Error processing {csv_file}: {e}")
-            error_count += 1
-
-    logger.info(f"{description.title()} batch ingest complete: {processed_count} CSV files processed, {error_count} errors")
+        return 0, 0, 0
+
+    items = [
+        (csv_file.relative_to(input_dir).as_posix(), csv_file, output_dir / csv_file.with_suffix('.parquet').name)
+        for csv_file in csv_files
+    ]
+
+    def build_task(csv_file: Path, output_file: Path) -> dict:
+        return {
+            "input_file": csv_file,
+            "output_file": output_file,
+            "description": f"{description} {csv_file.stem}",
+            "overwrite": True,
+            "use_manifest": False,
+            "logger": worker_logger(logger),
+        }
+
+    processed_count, skipped_count, error_count = run_incremental_batch(
+        items, build_task, _ingest_csv_task, csv_ingest_version(),
+        output_dir, logger, description, log_frequency, workers, overwrite,
+    )
+
+    logger.info(
+        f"{description.title()} batch ingest complete: {processed_count} CSV files processed, "
+        f"{skipped_count} skipped, {error_count} errors"
+    )
+    return processed_count, skipped_count, error_count
@@ -1,5 +1,8 @@
+import hashlib
 from pathlib import Path
 
+from football_pipeline.utils.archive import ArchiveMember, fingerprint_member
+
 
 def is_source_newer(source_path: Path, output_path: Path) -> bool:
     """
@@ -14,4 +17,38 @@ def is_source_newer(source_path: Path, output_path: Path) -> bool:
     """
     if not output_path.exists():
         return True
-    return source_path.stat().st_mtime > output_path.stat().st_mtime
\ No newline at end of file
+    return source_path.stat().st_mtime > output_path.stat().st_mtime
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Compute a content hash of a file, reading it in chunks.
+    
+    Args:
+        path (Path): Path to the file
+        chunk_size (int): Bytes read per chunk (default 1 MiB)
+        
+    Returns:
+        str: Hex BLAKE2b digest of the file contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_file(path: Path) -> dict:
+    """
+    Fingerprint a file by size, modification time and content hash.
+    
+    Args:
+        path (Path | ArchiveMember): Path to the file, or a member of an archive
+            (fingerprinted from the archive index, see utils/archive.py)
+        
+    Returns:
+        dict: {"size": int, "mtime_ns": int, "digest": str}
+    """
+    if isinstance(path, ArchiveMember):
+        return fingerprint_member(path)
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "digest": file_digest(path)}
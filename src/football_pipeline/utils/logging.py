@@ -1,76 +1,326 @@
+"""
+Queue-based logging for the pipeline.
+
+Loggers created by ``setup_logger`` only put records on a queue; a single
+listener thread formats them and writes the log files and the console. The
+calling thread (e.g. a stage running under cProfile) therefore never formats
+or writes log output, and worker processes of the shared pools
+(utils/parallel.py) send their records over a multiprocessing queue to the
+same listener, so everything a run logs ends up in one place.
+
+Records from workers use a ``<logger>.worker`` child logger (see
+``worker_logger``): they go to the log files but not to the console, where the
+parent already reports each file's outcome.
+
+Per-file loops should pass arguments lazily (``logger.debug("Wrote %s", path)``)
+so filtered records cost nothing, and report progress with ProgressReporter.
+"""
+
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import multiprocessing
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
-def setup_logger(log_path, logger_name, console_level=logging.INFO, file_level=logging.DEBUG):
+WORKER_LOGGER_SUFFIX = "worker"
+# Progress messages of per-file loops are at least this many seconds apart
+PROGRESS_MIN_INTERVAL = 5.0
+
+FILE_FORMAT = "%(asctime)s | %(name)s | %(levelname)-8s | %(funcName)s:%(lineno)d | %(message)s"
+CONSOLE_FORMAT = "%(asctime)s | %(levelname)-7s | %(message)s"
+
+# Attributes every LogRecord has; anything else was passed with extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_LOCK = threading.Lock()
+_QUEUE: queue.SimpleQueue | None = None
+_WORKER_QUEUE = None
+_LISTENERS: list[logging.handlers.QueueListener] = []
+# Logger name -> the setup_logger arguments it was configured with
+_CONFIGURED: dict[str, tuple] = {}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line.
+
+    Fields: time, level, logger, message, function, line, process, thread, plus
+    anything passed with ``extra={...}`` and the traceback under "exception".
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "function": record.funcName,
+            "line": record.lineno,
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _Router(logging.Handler):
+    """Runs in the listener thread: hands each record to the handlers of its top-level logger."""
+
+    def __init__(self):
+        super().__init__()
+        self.routes: dict[str, list[logging.Handler]] = {}
+
+    def emit(self, record: logging.LogRecord):
+        for handler in self.routes.get(record.name.split(".", 1)[0], ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records as they are: formatting happens in the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _WorkerQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue picklable records: the message is merged and a traceback kept as text."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _is_worker_record(record: logging.LogRecord) -> bool:
+    return record.name.endswith("." + WORKER_LOGGER_SUFFIX)
+
+
+_ROUTER = _Router()
+
+
+def _start_listener(log_queue):
+    listener = logging.handlers.QueueListener(log_queue, _ROUTER)
+    listener.start()
+    if not _LISTENERS:
+        atexit.register(shutdown_logging)
+    _LISTENERS.append(listener)
+
+
+def _log_queue() -> queue.SimpleQueue:
+    """The queue of this process's loggers (started with its listener on first use)."""
+    global _QUEUE
+    with _LOCK:
+        if _QUEUE is None:
+            _QUEUE = queue.SimpleQueue()
+            _start_listener(_QUEUE)
+        return _QUEUE
+
+
+def worker_log_queue():
+    """
+    The multiprocessing queue worker processes log to (started with its listener on first use).
+
+    Returns:
+        multiprocessing.Queue: Pass to init_worker_logging in the workers.
+    """
+    global _WORKER_QUEUE
+    with _LOCK:
+        if _WORKER_QUEUE is None:
+            _WORKER_QUEUE = multiprocessing.get_context("spawn").Queue()
+            _start_listener(_WORKER_QUEUE)
+        return _WORKER_QUEUE
+
+
+def worker_log_level() -> int:
+    """The lowest level any configured logger writes; workers drop records below it."""
+    with _LOCK:
+        levels = [handler.level for handlers in _ROUTER.routes.values() for handler in handlers]
+    return min(levels) if levels else logging.WARNING
+
+
+def init_worker_logging(log_queue, level: int):
     """
-    Setup a logger with both file and console handlers following best practices.
-    
+    Pool initializer: send this worker's log records to the parent's listener.
+
+    Args:
+        log_queue (multiprocessing.Queue): The queue from worker_log_queue.
+        level (int): Records below this level are dropped in the worker.
+    """
+    root = logging.getLogger()
+    root.handlers = [_WorkerQueueHandler(log_queue)]
+    root.setLevel(level)
+
+
+def worker_logger(logger):
+    """
+    The logger to hand to per-file work that may run in a worker process.
+
+    Its records reach the parent's log files but not the console.
+
+    Args:
+        logger (Logger | NullLogger): The stage's logger.
+
+    Returns:
+        The ``<name>.worker`` child of a logging.Logger, anything else unchanged.
+    """
+    if isinstance(logger, logging.Logger):
+        return logger.getChild(WORKER_LOGGER_SUFFIX)
+    return logger
+
+
+def shutdown_logging():
+    """Stop the listeners after writing every queued record, and close the log files."""
+    global _QUEUE, _WORKER_QUEUE
+    with _LOCK:
+        listeners = list(_LISTENERS)
+        _LISTENERS.clear()
+        # The next setup_logger starts over
+        _QUEUE = _WORKER_QUEUE = None
+        _CONFIGURED.clear()
+    for listener in listeners:
+        listener.stop()
+    for handlers in _ROUTER.routes.values():
+        for handler in handlers:
+            handler.close()
+
+
+def _remove_old_logs(log_path: Path, suffix: str):
+    for existing_log in log_path.parent.glob(f"{log_path.stem}_*{suffix}"):
+        try:
+            existing_log.unlink()
+        except OSError:
+            pass  # Ignore if file is in use or doesn't exist
+
+
+def setup_logger(log_path, logger_name, console_level=logging.INFO, file_level=logging.DEBUG, json_lines=False):
+    """
+    Setup a logger with both file and console output following best practices.
+
     - Detailed logs to files with timestamps
     - Concise progress/info to terminal
-    - Replaces log files on each run for clean logs
-    
+    - Replaces log files of earlier runs for clean logs
+    - Optionally a JSON lines file (``<name>_<timestamp>.jsonl``) for machine reading
+
+    The logger only enqueues records, see the module docstring. Calling it again
+    with the same arguments (e.g. once per layer) returns the configured logger.
+
     Args:
         log_path (str|Path): The path to the log file.
         logger_name (str): The name of the logger.
         console_level: Logging level for console output (default: INFO)
         file_level: Logging level for file output (default: DEBUG)
-        
+        json_lines (bool): Also write structured JSON lines (default: False)
+
     Returns:
         logging.Logger: The configured logger.
     """
-    # Ensure log directory exists
     log_path = Path(log_path)
-    os.makedirs(log_path.parent, exist_ok=True)
-    
-    # Add timestamp to log filename but remove old timestamped files first
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file_with_timestamp = log_path.parent / f"{log_path.stem}_{timestamp}.log"
-    
-    # Remove existing log files with the same base name to prevent accumulation
-    if log_path.parent.exists():
-        for existing_log in log_path.parent.glob(f"{log_path.stem}_*.log"):
-            try:
-                existing_log.unlink()
-            except OSError:
-                pass  # Ignore if file is in use or doesn't exist
-    
-    # Get or create logger
+    settings = (log_path, console_level, file_level, json_lines)
     logger = logging.getLogger(logger_name)
-    logger.setLevel(logging.DEBUG)  # Set to lowest level, handlers will filter
-    
-    # Remove existing handlers to prevent duplicates
+    with _LOCK:
+        if _CONFIGURED.get(logger_name) == settings:
+            return logger
+
+        # Ensure log directory exists
+        os.makedirs(log_path.parent, exist_ok=True)
+        # Add timestamp to log filename but remove old timestamped files first
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_file_with_timestamp = log_path.parent / f"{log_path.stem}_{timestamp}.log"
+        _remove_old_logs(log_path, ".log")
+
+        # File handler - detailed logs with timestamps
+        file_handler = logging.FileHandler(log_file_with_timestamp, mode="w", encoding="utf-8")
+        file_handler.setLevel(file_level)
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT, datefmt="%Y-%m-%d %H:%M:%S"))
+        handlers = [file_handler]
+
+        # Console handler - concise progress info, without the per-file worker records
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(console_level)
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT, datefmt="%H:%M:%S"))
+        console_handler.addFilter(lambda record: not _is_worker_record(record))
+        handlers.append(console_handler)
+
+        if json_lines:
+            _remove_old_logs(log_path, ".jsonl")
+            json_handler = logging.FileHandler(log_file_with_timestamp.with_suffix(".jsonl"), mode="w", encoding="utf-8")
+            json_handler.setLevel(file_level)
+            json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(json_handler)
+
+        for handler in _ROUTER.routes.pop(logger_name, []):
+            handler.close()
+        _ROUTER.routes[logger_name] = handlers
+        _CONFIGURED[logger_name] = settings
+
+    # Records below every handler's level are dropped before a record is even created
+    logger.setLevel(min(console_level, file_level))
     logger.handlers.clear()
-    
-    # File handler - detailed logs with timestamps
-    file_formatter = logging.Formatter(
-        "%(asctime)s | %(name)s | %(levelname)-8s | %(funcName)s:%(lineno)d | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    file_handler = logging.FileHandler(log_file_with_timestamp, mode="w", encoding="utf-8")
-    file_handler.setLevel(file_level)
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-    
-    # Console handler - concise progress info
-    console_formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)-7s | %(message)s",
-        datefmt="%H:%M:%S"
-    )
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(console_level)
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
+    logger.addHandler(_DeferredQueueHandler(_log_queue()))
+
     # Log the setup info
-    logger.info(f"Logger '{logger_name}' initialized")
-    logger.debug(f"Log file: {log_file_with_timestamp}")
-    logger.debug(f"Console level: {logging.getLevelName(console_level)}, File level: {logging.getLevelName(file_level)}")
-    
+    logger.info("Logger '%s' initialized", logger_name)
+    logger.debug("Log file: %s", log_file_with_timestamp)
+    logger.debug(
+        "Console level: %s, File level: %s",
+        logging.getLevelName(console_level), logging.getLevelName(file_level),
+    )
     return logger
 
 
+class ProgressReporter:
+    """
+    Rate-limited progress messages for per-file loops.
+
+    A message is logged every ``every`` items, but no more often than every
+    ``min_interval`` seconds, so fast loops over many small files do not flood
+    the log; the last item is always reported once progress was shown.
+    """
+
+    def __init__(self, logger, description: str, total: int, every: int = 1, min_interval: float = PROGRESS_MIN_INTERVAL):
+        self.logger = logger
+        self.description = description
+        self.total = total
+        self.every = max(1, every)
+        self.min_interval = min_interval
+        self.start = self.last = time.monotonic()
+        self.reported = False
+
+    def update(self, done: int):
+        """
+        Report that ``done`` of ``total`` items are handled.
+
+        Args:
+            done (int): Items handled so far.
+        """
+        now = time.monotonic()
+        final = done >= self.total and self.reported
+        if not final and (done % self.every or now - self.last < self.min_interval):
+            return
+        self.last = now
+        self.reported = True
+        elapsed = now - self.start
+        self.logger.info(
+            "Handled %d/%d %s files so far (%.1f files/s).",
+            done, self.total, self.description, done / elapsed if elapsed > 0 else 0.0,
+        )
+
 
 class NullLogger:
     """
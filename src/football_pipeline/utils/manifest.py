@@ -0,0 +1,202 @@
+"""
+Per-dataset ingest manifests for content-based incremental ingestion.
+
+Each bronze output directory keeps a ``_manifest.json`` recording, for every
+source file, its size, mtime, content hash, the ingest version that produced
+the output and the output path. A source is rebuilt only when its content or
+the ingest version changed; a touched mtime (git pull, rsync) costs one hash
+and no rewrite.
+
+A sharded run (utils/sharding.py) keeps the entries of the sources it owns in
+its own ``_manifest.shard-<i>-of-<N>.json``, so shards running on different
+machines never write the same manifest; ``merge_shard_manifests`` folds them
+back into ``_manifest.json`` when the round is finalized.
+"""
+
+import json
+import os
+from pathlib import Path
+
+from football_pipeline.utils.io import fingerprint_file
+from football_pipeline.utils.parallel import map_tasks
+
+MANIFEST_FILENAME = "_manifest.json"
+MANIFEST_FORMAT = 1
+SHARD_MANIFEST_PATTERN = "_manifest.shard-*-of-*.json"
+
+
+class IngestManifest:
+    """
+    Fingerprints of the sources behind one output directory, keyed by source name.
+    """
+
+    def __init__(self, path: Path, entries: dict | None = None):
+        self.path = Path(path)
+        self.entries = entries or {}
+
+    @classmethod
+    def load(cls, output_dir: Path, shard=None) -> "IngestManifest":
+        """
+        Load the manifest of an output directory (empty if there is none yet).
+
+        Args:
+            output_dir (Path): The dataset's output directory.
+            shard (Shard, optional): Load the shard's own manifest, holding only the
+                sources it owns. A shard without one starts from the dataset's
+                manifest. Defaults to None.
+
+        Returns:
+            IngestManifest: The loaded manifest.
+        """
+        path = Path(output_dir) / MANIFEST_FILENAME
+        if shard is None:
+            return cls(path, _read_entries(path))
+        shard_path = Path(output_dir) / f"_manifest.{shard.name}.json"
+        entries = _read_entries(shard_path) if shard_path.exists() else _read_entries(path)
+        return cls(shard_path, {key: entry for key, entry in entries.items() if shard.owns(key)})
+
+    def quick_status(self, key: str, source: Path, output: Path, version: str) -> str:
+        """
+        Classify a source using only stat() calls.
+
+        Args:
+            key (str): The source's key in the manifest.
+            source (Path): The source file.
+            output (Path): The expected output file.
+            version (str): The current ingest version.
+
+        Returns:
+            str: "new", "changed", "unchanged", or "verify" when only the mtime moved
+                and the content hash has to decide.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return "new"
+        if entry.get("version") != version or entry.get("output") != output.name or not output.exists():
+            return "changed"
+        stat = source.stat()
+        if stat.st_size != entry.get("size"):
+            return "changed"
+        if stat.st_mtime_ns == entry.get("mtime_ns"):
+            return "unchanged"
+        return "verify"
+
+    def record(self, key: str, output: Path, version: str, fingerprint: dict):
+        """
+        Record a successfully written output.
+
+        Args:
+            key (str): The source's key in the manifest.
+            output (Path): The output file that was written.
+            version (str): The ingest version that wrote it.
+            fingerprint (dict): The source fingerprint from fingerprint_file.
+        """
+        self.entries[key] = {**fingerprint, "version": version, "output": output.name}
+
+    def save(self):
+        """Atomically write the manifest next to the outputs."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(
+            {"format": MANIFEST_FORMAT, "entries": dict(sorted(self.entries.items()))},
+            indent=1,
+        ))
+        os.replace(tmp_path, self.path)
+
+
+def _read_entries(path: Path) -> dict:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        # A corrupt manifest only costs a rebuild
+        return {}
+    return data.get("entries", {}) if data.get("format") == MANIFEST_FORMAT else {}
+
+
+def merge_shard_manifests(root: Path) -> int:
+    """
+    Fold the shard manifests under a directory into their datasets' manifests.
+
+    A shard's entries replace the dataset's entries of the same sources (the
+    shard owns them); the shard manifests are removed afterwards.
+
+    Args:
+        root (Path): Directory searched recursively, e.g. the data directory.
+
+    Returns:
+        int: The number of shard manifests merged.
+    """
+    merged = 0
+    shard_paths = sorted(Path(root).rglob(SHARD_MANIFEST_PATTERN))
+    for output_dir in sorted({path.parent for path in shard_paths}):
+        manifest = IngestManifest.load(output_dir)
+        paths = [path for path in shard_paths if path.parent == output_dir]
+        for path in paths:
+            manifest.entries.update(_read_entries(path))
+        manifest.save()
+        for path in paths:
+            path.unlink()
+        merged += len(paths)
+    return merged
+
+
+def version_of(version: str | dict[str, str], key: str) -> str:
+    """The ingest version of one source: the stage's version, or its entry in a per-source mapping."""
+    return version if isinstance(version, str) else version[key]
+
+
+def plan_incremental(
+    manifest: IngestManifest,
+    items: list[tuple[str, Path, Path]],
+    version: str | dict[str, str],
+    workers: int | None = 1,
+    overwrite: bool = False,
+) -> list[tuple[str, Path, Path, str, dict]]:
+    """
+    Decide which sources need ingesting and fingerprint them.
+
+    Sources whose size and mtime match the manifest are not read at all. Every
+    other source is hashed (in worker processes when ``workers`` > 1); a source
+    whose hash still matches is reported as unchanged.
+
+    Args:
+        manifest (IngestManifest): The output directory's manifest.
+        items (list[tuple]): (key, source, output) for every candidate source.
+        version (str | dict): The current ingest version, or a key -> version mapping for
+            stages whose outputs also depend on per-source inputs other than the file.
+        workers (int, optional): Number of worker processes for hashing. Defaults to 1.
+        overwrite (bool, optional): Treat every source as changed. Defaults to False.
+
+    Returns:
+        list[tuple]: (key, source, output, status, fingerprint) with status one of
+            "new", "changed" or "unchanged". Fingerprint is None for unchanged sources
+            that were not hashed.
+    """
+    statuses = {}
+    for key, source, output in items:
+        status = manifest.quick_status(key, source, output, version_of(version, key))
+        if overwrite and status in ("unchanged", "verify"):
+            status = "changed"
+        statuses[key] = status
+
+    to_hash = [(key, source) for key, source, _ in items if statuses[key] != "unchanged"]
+    fingerprints = dict(zip(
+        (key for key, _ in to_hash),
+        map_tasks(fingerprint_file, [source for _, source in to_hash], workers),
+    ))
+
+    plan = []
+    for key, source, output in items:
+        status = statuses[key]
+        fingerprint = fingerprints.get(key)
+        if status == "verify":
+            if fingerprint["digest"] == manifest.entries[key].get("digest"):
+                # Only the mtime moved: remember it so the next run skips the hash
+                manifest.record(key, output, version_of(version, key), fingerprint)
+                status = "unchanged"
+            else:
+                status = "changed"
+        plan.append((key, source, output, status, fingerprint))
+    return plan
@@ -0,0 +1,432 @@
+"""
+Structured performance metrics for pipeline runs.
+
+While a run is active (``start_run`` .. ``finish_run``, done by run_pipeline),
+every pipeline stage and every file it writes is measured:
+
+- per file: wall time, CPU time, input/output bytes, output rows, rows/sec and
+  worker_peak_rss_mb, the peak RSS the writing process reached over its whole
+  life so far (not the file's own footprint; a worker's peak carries over to
+  the files it handles later), plus match_id when the input is a per-match
+  file, to join with the match index
+- per stage: wall time, CPU time (the stage thread plus its worker processes),
+  summed bytes/rows, rows/sec and peak RSS
+
+The run report is written to ``logs/runs/<run_id>/`` (the start time, plus a
+counter when another run took that second): ``report.json`` (run and
+stage metrics), ``stages.parquet`` and ``files.parquet``. Reports of earlier
+runs stay next to it, so ``pl.scan_parquet("logs/runs/*/stages.parquet")``
+tracks a stage across runs.
+
+With profiling on (``--profile``), every stage also runs under cProfile, merged
+with the profiles of its worker processes, and stages that take at least
+PROFILE_MIN_SECONDS are dumped to ``profiles/<stage>.prof`` (plus a ``.txt``
+summary sorted by cumulative time).
+
+Outside a run (e.g. calling an ingest function from a notebook) nothing is
+recorded.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from football_pipeline.utils.archive import ArchiveMember, source_stem
+from football_pipeline.utils.constants import LOGS_RUNS_DIR
+
+REPORT_FILENAME = "report.json"
+STAGES_FILENAME = "stages.parquet"
+FILES_FILENAME = "files.parquet"
+
+# Stages faster than this are not worth a profile dump
+PROFILE_MIN_SECONDS = 0.5
+PROFILE_SUMMARY_LINES = 40
+
+# Current stage, file measurement and worker sink of the running thread
+_LOCAL = threading.local()
+_RUN: "RunMetrics | None" = None
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident memory of this process so far, in MiB (None where unsupported)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _size(paths) -> int | None:
+    """Total bytes of a file, a directory tree or a list of either."""
+    if paths is None:
+        return None
+    total = 0
+    for path in paths if isinstance(paths, (list, tuple)) else [paths]:
+        if isinstance(path, ArchiveMember):
+            total += path.size
+            continue
+        path = Path(path)
+        if path.is_dir():
+            total += sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+        elif path.exists():
+            total += path.stat().st_size
+    return total
+
+
+def _parquet_rows(path) -> int | None:
+    """Row count from a Parquet footer (None for anything else)."""
+    if path is None or Path(path).suffix != ".parquet" or not Path(path).is_file():
+        return None
+    import pyarrow.parquet as pq
+
+    try:
+        return pq.read_metadata(path).num_rows
+    except Exception:
+        return None
+
+
+def _describe(paths) -> str | None:
+    if paths is None:
+        return None
+    if isinstance(paths, (list, tuple)):
+        return os.path.commonpath([str(p) for p in paths]) if paths else None
+    return str(paths)
+
+
+def _file_record(input_file, output_file, wall: float, cpu: float) -> dict:
+    rows = _parquet_rows(output_file)
+    if isinstance(input_file, str):
+        input_file = Path(input_file)
+    stem = source_stem(input_file) if isinstance(input_file, (Path, ArchiveMember)) else ""
+    return {
+        "input_file": _describe(input_file),
+        "output_file": _describe(output_file),
+        "match_id": int(stem) if stem.isdigit() else None,
+        "status": None,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "input_bytes": _size(input_file),
+        "output_bytes": _size(output_file),
+        "rows": rows,
+        "rows_per_sec": rows / wall if rows is not None and wall > 0 else None,
+        "worker_peak_rss_mb": peak_rss_mb(),
+        "pid": os.getpid(),
+    }
+
+
+def _record_file(record: dict):
+    sink = getattr(_LOCAL, "sink", None)
+    if sink is not None:
+        sink.append(record)
+    elif _RUN is not None:
+        _RUN.add_file(getattr(_LOCAL, "stage", None), record)
+
+
+@contextmanager
+def measure_file(input_file, output_file):
+    """
+    Measure writing one output (a no-op inside another measurement).
+
+    CPU time is the process's CPU time, which includes concurrently running
+    stages when the work happens in the main process.
+
+    Args:
+        input_file (Path | list[Path]): The input file(s) or directory.
+        output_file (Path): The output written.
+    """
+    if getattr(_LOCAL, "measuring", False):
+        yield
+        return
+    _LOCAL.measuring = True
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        _LOCAL.measuring = False
+        _record_file(_file_record(input_file, output_file, time.perf_counter() - wall, time.process_time() - cpu))
+
+
+def profiling_enabled() -> bool:
+    """Whether the active run profiles its stages."""
+    return _RUN is not None and _RUN.profile
+
+
+def measured_task(args: tuple):
+    """
+    Worker entry point wrapping a per-file task with measurement (and profiling).
+
+    Args:
+        args (tuple): (task_fn, task, profile); the task dict holds input_file and output_file.
+
+    Returns:
+        tuple: (task_fn's result, file metrics record, cProfile stats dict or None)
+    """
+    task_fn, task, profile = args
+    input_file, output_file = task.get("input_file"), task.get("output_file")
+    records = []
+    _LOCAL.sink = records
+    profiler = cProfile.Profile() if profile else None
+    try:
+        if profiler is not None:
+            profiler.enable()
+        with measure_file(input_file, output_file):
+            result = task_fn(task)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        _LOCAL.sink = None
+    stats = None
+    if profiler is not None:
+        profiler.create_stats()
+        stats = profiler.stats
+    return result, (records[0] if records else None), stats
+
+
+def measured_batch(tasks: list) -> list:
+    """
+    Worker entry point running several measured_task arguments back to back
+    (the small files packed into one task, see utils/planning.py).
+
+    Args:
+        tasks (list[tuple]): measured_task arguments.
+
+    Returns:
+        list[tuple]: measured_task's result for every task, in order.
+    """
+    return [measured_task(args) for args in tasks]
+
+
+def record_task(record: dict | None, status: str, stats: dict | None = None):
+    """
+    Record the outcome of a measured_task in the current stage.
+
+    Args:
+        record (dict): The file metrics record returned by measured_task.
+        status (str): The task status ("processed", "skipped" or "error").
+        stats (dict, optional): The worker's cProfile stats. Defaults to None.
+    """
+    if _RUN is None:
+        return
+    stage = getattr(_LOCAL, "stage", None)
+    if record is not None:
+        _RUN.add_file(stage, {**record, "status": status})
+    if stats:
+        _RUN.add_profile(stage, stats)
+
+
+class _WorkerStats:
+    """Adapter letting pstats.Stats load a stats dict returned by a worker."""
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+@contextmanager
+def stage_scope(name: str):
+    """
+    Measure (and, in profile mode, profile) one stage running in this thread.
+
+    Args:
+        name (str): The stage name.
+    """
+    _LOCAL.stage = name
+    wall, cpu = time.perf_counter(), time.thread_time()
+    profiler = None
+    if profiling_enabled():
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler at a time
+            profiler = None
+    status = "failed"
+    try:
+        yield
+        status = "done"
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        _LOCAL.stage = None
+        if _RUN is not None:
+            _RUN.finish_stage(name, status, time.perf_counter() - wall, time.thread_time() - cpu, profiler)
+
+
+class RunMetrics:
+    """
+    Metrics collected during one pipeline run.
+    """
+
+    def __init__(self, run_dir: Path, profile: bool = False):
+        self.run_dir = Path(run_dir)
+        self.profile = profile
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.files: list[dict] = []
+        self.stages: list[dict] = []
+        self.profiles: dict[str, pstats.Stats] = {}
+        self._lock = threading.Lock()
+
+    def add_file(self, stage: str | None, record: dict):
+        with self._lock:
+            self.files.append({"stage": stage, **record})
+
+    def add_profile(self, stage: str | None, stats):
+        """Merge a profile (cProfile.Profile or worker stats dict) into the stage's profile."""
+        source = _WorkerStats(stats) if isinstance(stats, dict) else stats
+        try:
+            loaded = pstats.Stats(source)
+        except TypeError:
+            # Nothing was recorded
+            return
+        with self._lock:
+            if stage in self.profiles:
+                self.profiles[stage].add(loaded)
+            else:
+                self.profiles[stage] = loaded
+
+    def finish_stage(self, name: str, status: str, wall: float, thread_cpu: float, profiler=None):
+        if profiler is not None:
+            self.add_profile(name, profiler)
+        pid = os.getpid()
+        with self._lock:
+            files = [f for f in self.files if f["stage"] == name]
+        written = [f for f in files if f["status"] in (None, "processed")]
+        rows = [f["rows"] for f in written if f["rows"] is not None]
+        peaks = [p for p in [peak_rss_mb()] + [f["worker_peak_rss_mb"] for f in files] if p is not None]
+
+        def total(key):
+            values = [f[key] for f in written if f[key] is not None]
+            return sum(values) if values else None
+
+        with self._lock:
+            self.stages.append({
+                "stage": name,
+                "status": status,
+                "wall_s": wall,
+                # Work done in worker processes is not part of this thread's CPU time
+                "cpu_s": thread_cpu + sum(f["cpu_s"] for f in files if f["pid"] != pid),
+                "files": len(written),
+                "input_bytes": total("input_bytes"),
+                "output_bytes": total("output_bytes"),
+                "rows": sum(rows) if rows else None,
+                "rows_per_sec": sum(rows) / wall if rows and wall > 0 else None,
+                "peak_rss_mb": max(peaks) if peaks else None,
+            })
+
+    def write(self, extra: dict | None = None) -> Path:
+        """
+        Write the run report (and profiles) to the run directory.
+
+        Args:
+            extra (dict, optional): Additional run-level fields (e.g. the config). Defaults to None.
+
+        Returns:
+            Path: The report.json file.
+        """
+        # Imported here so that loading the scheduler (and the CLI) stays cheap
+        import polars as pl
+
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        report = {
+            "run_id": self.run_dir.name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_s": time.perf_counter() - self.start,
+            "peak_rss_mb": peak_rss_mb(),
+            "profile": self.profile,
+            **(extra or {}),
+            "files": len(self.files),
+            "stages": self.stages,
+        }
+        report_file = self.run_dir / REPORT_FILENAME
+        report_file.write_text(json.dumps(report, indent=2, default=str))
+        run = {"run_id": report["run_id"], "started_at": self.started_at}
+        if self.stages:
+            pl.DataFrame([{**run, **s} for s in self.stages], infer_schema_length=None).write_parquet(
+                self.run_dir / STAGES_FILENAME
+            )
+        if self.files:
+            pl.DataFrame([{**run, **f} for f in self.files], infer_schema_length=None).write_parquet(
+                self.run_dir / FILES_FILENAME
+            )
+        self._write_profiles()
+        return report_file
+
+    def _write_profiles(self):
+        hot = {s["stage"] for s in self.stages if s["wall_s"] >= PROFILE_MIN_SECONDS}
+        profiles_dir = self.run_dir / "profiles"
+        for stage, stats in self.profiles.items():
+            if stage not in hot:
+                continue
+            profiles_dir.mkdir(parents=True, exist_ok=True)
+            name = stage.replace("/", "__")
+            stats.dump_stats(profiles_dir / f"{name}.prof")
+            summary = io.StringIO()
+            stats.stream = summary
+            stats.sort_stats("cumulative").print_stats(PROFILE_SUMMARY_LINES)
+            (profiles_dir / f"{name}.txt").write_text(summary.getvalue())
+
+
+def start_run(profile: bool = False, runs_dir: Path = LOGS_RUNS_DIR, label: str | None = None) -> RunMetrics:
+    """
+    Start collecting metrics for a pipeline run.
+
+    The run directory is created here, so two runs started in the same second
+    get distinct ids (the second one gets a ``_2`` suffix, and so on).
+
+    Args:
+        profile (bool, optional): Profile every stage with cProfile. Defaults to False.
+        runs_dir (Path, optional): Directory holding one subdirectory per run.
+        label (str, optional): Appended to the run id, e.g. the shard of a sharded run,
+            so runs started in the same second on several machines do not collide.
+
+    Returns:
+        RunMetrics: The active run.
+    """
+    global _RUN
+    base_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if label:
+        base_id = f"{base_id}_{label}"
+    Path(runs_dir).mkdir(parents=True, exist_ok=True)
+    run_id, attempt = base_id, 1
+    while True:
+        try:
+            (Path(runs_dir) / run_id).mkdir()
+            break
+        except FileExistsError:
+            attempt += 1
+            run_id = f"{base_id}_{attempt}"
+    _RUN = RunMetrics(Path(runs_dir) / run_id, profile)
+    return _RUN
+
+
+def finish_run(extra: dict | None = None) -> Path | None:
+    """
+    Stop collecting metrics and write the run report.
+
+    Args:
+        extra (dict, optional): Additional run-level fields. Defaults to None.
+
+    Returns:
+        Path | None: The report.json file, or None when no run was active.
+    """
+    global _RUN
+    run, _RUN = _RUN, None
+    if run is None:
+        return None
+    return run.write(extra)
@@ -0,0 +1,124 @@
+"""
+Process-pool helpers for fanning per-file work out across CPU cores.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from football_pipeline.utils.logging import init_worker_logging, worker_log_level, worker_log_queue
+
+# Pools are expensive to start (fresh interpreters importing polars), so one pool
+# per worker count is kept alive for the lifetime of the process and reused by
+# every batch in a run.
+_EXECUTORS: dict[int, ProcessPoolExecutor] = {}
+# Pipeline stages run concurrently in threads (utils/scheduler.py) and share the pools
+_EXECUTORS_LOCK = threading.Lock()
+# Tasks submitted ahead per worker when tasks come from a generator
+TASKS_IN_FLIGHT_PER_WORKER = 4
+
+
+def resolve_workers(workers: int | None = None) -> int:
+    """
+    Resolve a requested worker count to a concrete number of processes.
+
+    Args:
+        workers (int, optional): Requested number of workers. None means one per CPU.
+
+    Returns:
+        int: The number of worker processes to use (always >= 1).
+    """
+    if workers is None:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Get (or start) the shared process pool with the given number of workers.
+
+    Args:
+        workers (int): Number of worker processes.
+
+    Returns:
+        ProcessPoolExecutor: A pool that is shut down automatically at interpreter exit.
+    """
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(workers)
+        if executor is None:
+            # Polars and pyarrow are not fork-safe, so always start fresh interpreters
+            context = multiprocessing.get_context("spawn")
+            # Workers log through the parent's listener (utils/logging.py)
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=init_worker_logging,
+                initargs=(worker_log_queue(), worker_log_level()),
+            )
+            _EXECUTORS[workers] = executor
+        return executor
+
+
+def shutdown_executors():
+    """Shut down every shared process pool."""
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for executor in executors:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_executors)
+
+
+def map_tasks(fn, tasks, workers: int | None = None, total: int | None = None):
+    """
+    Apply ``fn`` to every task, in worker processes when more than one worker is requested.
+
+    ``fn`` must be a module-level function and tasks must be picklable. Results are
+    yielded in task order. With a single worker (or a single task) everything runs
+    in-process, which keeps tracebacks simple and avoids pool start-up cost.
+
+    A list of tasks is submitted at once in chunks. A generator is consumed as
+    results are taken, with only a few tasks per worker submitted ahead, so tasks
+    that carry data (e.g. archive members, see utils/archive.py) are not all held
+    in memory.
+
+    Args:
+        fn (callable): The function to apply to each task.
+        tasks (list | Iterable): The task arguments.
+        workers (int, optional): Number of worker processes. None means one per CPU.
+        total (int, optional): The number of tasks, required when tasks is not a list or tuple.
+
+    Yields:
+        The result of ``fn(task)`` for each task.
+
+    Raises:
+        ValueError: If tasks is streamed and total is not given.
+    """
+    workers = resolve_workers(workers)
+    streamed = not isinstance(tasks, (list, tuple))
+    if total is None:
+        if streamed:
+            raise ValueError("map_tasks needs total= when tasks is a generator or other iterator")
+        total = len(tasks)
+    if workers <= 1 or total <= 1:
+        for task in tasks:
+            yield fn(task)
+        return
+
+    executor = get_executor(workers)
+    if not streamed:
+        chunksize = max(1, total // (workers * 4))
+        yield from executor.map(fn, tasks, chunksize=chunksize)
+        return
+    in_flight = deque()
+    for task in tasks:
+        in_flight.append(executor.submit(fn, task))
+        if len(in_flight) >= workers * TASKS_IN_FLIGHT_PER_WORKER:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
@@ -0,0 +1,346 @@
+"""
+Size-aware planning of the per-file work of a batch stage.
+
+Per-match files range from a few kilobytes (lineups, match lists) to several
+megabytes (360 matches). Sending them to the workers one by one in name order
+leaves one worker grinding on the last big file while the others idle, and
+spends a round trip to a worker process on every tiny file. Before the
+workers start, run_incremental_batch (utils/dataframe.py) therefore plans the
+files it has to process:
+
+- each file's cost is estimated from its size with a per-dataset CostModel
+  (fixed per-file overhead plus seconds per megabyte), fitted on the per-file
+  metrics of earlier run reports (utils/metrics.py) and falling back to
+  defaults without history
+- files are scheduled largest first and the small ones are packed into
+  batches of about BATCH_TARGET_SECONDS, so one task carries many of them
+- the wall time is estimated by assigning the tasks in that order to the
+  first free worker
+
+``football_pipeline --plan`` prints the plans of the per-file stages and the
+estimated wall time without running anything (see ``dry_run``).
+"""
+
+import heapq
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from football_pipeline.utils.archive import ArchiveMember
+from football_pipeline.utils.constants import LOGS_RUNS_DIR
+
+# Cost model used without (enough) history: seconds per file and per megabyte
+DEFAULT_FILE_SECONDS = 0.01
+DEFAULT_SECONDS_PER_MB = 0.05
+# Processed files of earlier runs needed to fit a dataset's model, and how many runs are read
+MIN_HISTORY_FILES = 5
+HISTORY_RUNS = 10
+# Small files are packed into tasks of about this many (estimated) seconds ...
+BATCH_TARGET_SECONDS = 0.25
+# ... and at most this many files, so progress and failures stay fine-grained
+MAX_BATCH_FILES = 64
+# Round trip of one task to a worker process, added per task to the estimate
+TASK_DISPATCH_SECONDS = 0.002
+
+_DRY_RUN = threading.Event()
+
+
+class PlanOnly(Exception):
+    """
+    Raised by run_incremental_batch in a dry run, carrying its plan instead of running it.
+    """
+
+    def __init__(self, plan: "WorkPlan"):
+        super().__init__(plan.description)
+        self.plan = plan
+
+
+@contextmanager
+def dry_run():
+    """Plan the per-file stages run inside this block without processing any file (raises PlanOnly)."""
+    _DRY_RUN.set()
+    try:
+        yield
+    finally:
+        _DRY_RUN.clear()
+
+
+def dry_run_active() -> bool:
+    """Whether the running stages only plan their work."""
+    return _DRY_RUN.is_set()
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """
+    Estimated seconds to process one file: ``file_seconds + seconds_per_mb * size``.
+
+    Attributes:
+        file_seconds: Fixed cost of every file (opening, schema handling, writing).
+        seconds_per_mb: Cost of every megabyte of input.
+        history_files: The processed files of earlier runs the model was fitted on (0 for defaults).
+    """
+    file_seconds: float = DEFAULT_FILE_SECONDS
+    seconds_per_mb: float = DEFAULT_SECONDS_PER_MB
+    history_files: int = 0
+
+    def estimate(self, size_bytes: int) -> float:
+        return self.file_seconds + self.seconds_per_mb * size_bytes / (1 << 20)
+
+    def __str__(self) -> str:
+        basis = f"fitted on {self.history_files} files" if self.history_files else "defaults, no history"
+        return f"{self.file_seconds * 1000:.1f}ms/file + {self.seconds_per_mb:.3f}s/MB ({basis})"
+
+
+def _history(output_dir: Path, runs_dir: Path) -> list[tuple[float, float]]:
+    """(input_bytes, wall_s) of the files processed into output_dir by the latest runs."""
+    # Imported here so that loading the ingest helpers (and the CLI) stays cheap
+    import polars as pl
+
+    from football_pipeline.utils.metrics import FILES_FILENAME
+
+    reports = sorted(Path(runs_dir).glob(f"*/{FILES_FILENAME}"))[-HISTORY_RUNS:]
+    frames = []
+    for report in reports:
+        try:
+            frames.append(
+                pl.scan_parquet(report)
+                .filter(pl.col("status") == "processed")
+                .filter(pl.col("output_file").str.starts_with(f"{output_dir}/"))
+                .select(pl.col("input_bytes").cast(pl.Float64), pl.col("wall_s").cast(pl.Float64))
+                .drop_nulls()
+                .collect()
+            )
+        except Exception:
+            # Reports of older versions may miss columns; they are only hints
+            continue
+    if not frames:
+        return []
+    return list(pl.concat(frames).iter_rows())
+
+
+def cost_model(output_dir: Path, runs_dir: Path = LOGS_RUNS_DIR) -> CostModel:
+    """
+    Fit the cost model of a dataset on the run reports of earlier runs.
+
+    A least-squares line through (size, wall time) of the files processed into
+    ``output_dir``; without enough history, or when the sizes do not vary, the
+    defaults (or a single average rate) are used.
+
+    Args:
+        output_dir (Path): The dataset's output directory.
+        runs_dir (Path, optional): The run reports directory.
+
+    Returns:
+        CostModel: The dataset's cost model.
+    """
+    history = _history(output_dir, runs_dir)
+    n = len(history)
+    if n < MIN_HISTORY_FILES:
+        return CostModel()
+    sizes = [size / (1 << 20) for size, _ in history]
+    walls = [wall for _, wall in history]
+    mean_size, mean_wall = sum(sizes) / n, sum(walls) / n
+    variance = sum((s - mean_size) ** 2 for s in sizes)
+    slope = sum((s - mean_size) * (w - mean_wall) for s, w in zip(sizes, walls)) / variance if variance else -1.0
+    intercept = mean_wall - slope * mean_size
+    if slope < 0 or intercept < 0:
+        # Noise dominates: fall back to the average rate with the default overhead
+        intercept = min(DEFAULT_FILE_SECONDS, min(walls))
+        slope = max(0.0, sum(walls) - intercept * n) / sum(sizes) if sum(sizes) else DEFAULT_SECONDS_PER_MB
+    return CostModel(intercept, slope, n)
+
+
+def source_size(source) -> int:
+    """The size in bytes of a source file or archive member (0 if it disappeared)."""
+    if isinstance(source, ArchiveMember):
+        return source.size
+    try:
+        return Path(source).stat().st_size
+    except OSError:
+        return 0
+
+
+@dataclass
+class WorkPlan:
+    """
+    The tasks of one batch stage: its pending files, packed into batches, largest first.
+
+    Attributes:
+        description: The description of the data.
+        workers: The number of worker processes.
+        model: The cost model the plan is based on.
+        sizes: Bytes of every pending source.
+        batches: The tasks in submission order, each a list of sources.
+        unchanged: Sources skipped because their outputs are up to date.
+    """
+    description: str
+    workers: int
+    model: CostModel
+    sizes: dict = field(default_factory=dict)
+    batches: list[list] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def files(self) -> int:
+        return len(self.sizes)
+
+    @property
+    def bytes(self) -> int:
+        return sum(self.sizes.values())
+
+    def cost(self, batch: list) -> float:
+        """Estimated seconds of one task."""
+        return sum(self.model.estimate(self.sizes[source]) for source in batch)
+
+    @property
+    def sequential_s(self) -> float:
+        return sum(self.cost(batch) for batch in self.batches)
+
+    @property
+    def estimated_wall_s(self) -> float:
+        """Wall time when every task goes, in order, to the first free worker."""
+        if not self.batches:
+            return 0.0
+        free_at = [0.0] * min(self.workers, len(self.batches))
+        for batch in self.batches:
+            start = heapq.heappop(free_at)
+            heapq.heappush(free_at, start + TASK_DISPATCH_SECONDS + self.cost(batch))
+        return max(free_at)
+
+    def sources(self) -> list:
+        """Every pending source, in the order the tasks are submitted."""
+        return [source for batch in self.batches for source in batch]
+
+    def describe(self) -> list[str]:
+        """The plan as report lines."""
+        if not self.batches:
+            return [f"nothing to do, {self.unchanged} unchanged"]
+        packed = [batch for batch in self.batches if len(batch) > 1]
+        largest = self.batches[0][0]
+        if packed:
+            layout = f"{sum(len(batch) for batch in packed)} small files packed into {len(packed)} of them"
+        else:
+            layout = "one file per task"
+        return [
+            f"{self.files} file(s) to process ({self.bytes / (1 << 20):.1f} MB), {self.unchanged} unchanged",
+            f"{len(self.batches)} task(s) on {self.workers} worker(s), largest file first "
+            f"({getattr(largest, 'name', largest)}, {self.sizes[largest] / (1 << 20):.2f} MB); {layout}",
+            f"cost model: {self.model}",
+            f"estimated {self.estimated_wall_s:.1f}s wall, {self.sequential_s:.1f}s of work",
+        ]
+
+    def summary(self) -> str:
+        """One log line."""
+        return (
+            f"{self.description.title()}: planned {self.files} file(s) in {len(self.batches)} task(s) "
+            f"on {self.workers} worker(s), estimated {self.estimated_wall_s:.1f}s; cost model {self.model}"
+        )
+
+
+def plan_work(
+    description: str,
+    sources: list,
+    workers: int,
+    model: CostModel | None = None,
+    unchanged: int = 0,
+) -> WorkPlan:
+    """
+    Order sources largest first and pack the small ones into batches.
+
+    A file estimated to take at least the batch target is a task of its own;
+    smaller files fill tasks up to the target (and MAX_BATCH_FILES). The target
+    is BATCH_TARGET_SECONDS, lowered for small jobs so that every worker still
+    gets a task.
+
+    Args:
+        description (str): The description of the data.
+        sources (list): The pending sources (Path or ArchiveMember).
+        workers (int): The number of worker processes.
+        model (CostModel, optional): The cost model. Defaults to the default model.
+        unchanged (int, optional): Sources that need no work, for the report. Defaults to 0.
+
+    Returns:
+        WorkPlan: The plan.
+    """
+    model = model or CostModel()
+    sizes = {source: source_size(source) for source in sources}
+    ordered = sorted(sources, key=lambda source: (-sizes[source], str(source)))
+    total = sum(model.estimate(size) for size in sizes.values())
+    target = min(BATCH_TARGET_SECONDS, total / max(1, workers))
+
+    batches, batch, batch_cost = [], [], 0.0
+    for source in ordered:
+        cost = model.estimate(sizes[source])
+        if cost >= target:
+            batches.append([source])
+            continue
+        batch.append(source)
+        batch_cost += cost
+        if batch_cost >= target or len(batch) >= MAX_BATCH_FILES:
+            batches.append(batch)
+            batch, batch_cost = [], 0.0
+    if batch:
+        batches.append(batch)
+    return WorkPlan(description, workers, model, sizes, batches, unchanged)
+
+
+def iter_batches(plan: WorkPlan, sources):
+    """
+    Group streamed sources (see utils/archive.py stream_sources) into the planned batches.
+
+    Plain files arrive in plan order; tar members arrive in archive order, so a
+    batch is yielded once all of its sources have arrived.
+
+    Args:
+        plan (WorkPlan): The plan.
+        sources (Iterable): The plan's sources, possibly with member bytes attached.
+
+    Yields:
+        list: The sources of one task.
+    """
+    batch_of = {source: i for i, batch in enumerate(plan.batches) for source in batch}
+    filled = {}
+    for source in sources:
+        i = batch_of[source]
+        filled.setdefault(i, []).append(source)
+        if len(filled[i]) == len(plan.batches[i]):
+            yield filled.pop(i)
+
+
+def format_plans(plans: list[tuple[str, "WorkPlan | str"]]) -> str:
+    """
+    The report printed by ``--plan``.
+
+    The per-file stages share one worker pool and may overlap, so the run's
+    estimate is given as a range: every stage after the other, and the total
+    work spread over all workers.
+
+    Args:
+        plans (list[tuple]): (stage name, WorkPlan or a message), see pipeline.plan_pipeline.
+
+    Returns:
+        str: The report.
+    """
+    lines = []
+    work_plans = [plan for _, plan in plans if isinstance(plan, WorkPlan)]
+    for name, plan in plans:
+        lines.append(name)
+        details = plan.describe() if isinstance(plan, WorkPlan) else [plan]
+        lines.extend(f"  {line}" for line in details)
+    if work_plans:
+        workers = max(plan.workers for plan in work_plans)
+        serial = sum(plan.estimated_wall_s for plan in work_plans)
+        overlapped = max(
+            sum(plan.sequential_s for plan in work_plans) / workers,
+            max(plan.estimated_wall_s for plan in work_plans),
+        )
+        lines.append(
+            f"Estimated wall time of the per-file stages: {overlapped:.1f}s to {serial:.1f}s "
+            f"({sum(plan.files for plan in work_plans)} files, "
+            f"{sum(plan.bytes for plan in work_plans) / (1 << 20):.1f} MB)"
+        )
+    else:
+        lines.append("No per-file stages to plan")
+    return "\n".join(lines)
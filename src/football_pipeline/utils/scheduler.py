@@ -0,0 +1,239 @@
+"""
+Dependency-aware scheduler for pipeline stages.
+
+A stage is a named callable with the names of the stages whose outputs it
+reads. ``run_stages`` starts every stage as soon as its dependencies have
+finished, running up to ``workers`` stages at once in threads; the stages' own
+per-file work goes through the shared process pools of utils/parallel.py, so
+concurrent stages share one global worker budget instead of each starting
+their own. Wall-clock time is then set by the longest dependency chain rather
+than by the sum of all stages, and the chain is reported at the end.
+
+Dependencies on stages that are not part of the run (e.g. bronze when only
+silver was requested) are treated as already satisfied.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+from football_pipeline.utils.logging import NullLogger
+from football_pipeline.utils.metrics import stage_scope
+from football_pipeline.utils.parallel import resolve_workers
+
+
+@dataclass
+class Stage:
+    """
+    One unit of pipeline work.
+
+    Attributes:
+        name: Unique stage name, e.g. "silver/open_data/lineups".
+        fn: Called with no arguments to run the stage.
+        deps: Names of the stages that must finish first.
+    """
+    name: str
+    fn: Callable[[], object]
+    deps: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StageResult:
+    """
+    Outcome of one stage.
+
+    Attributes:
+        name: The stage name.
+        status: "done", "failed" or "skipped" (a dependency failed or the run stopped).
+        duration: Seconds spent in the stage (None when it did not run).
+        error: The exception raised by a failed stage.
+    """
+    name: str
+    status: str
+    duration: float | None = None
+    error: BaseException | None = None
+
+
+def _topological_order(deps: dict[str, list[str]]) -> list[str]:
+    """Order stage names so that every stage comes after its dependencies (declaration order otherwise)."""
+    order, visiting, visited = [], set(), set()
+
+    def visit(name: str):
+        if name in visited:
+            return
+        if name in visiting:
+            raise ValueError(f"Stage dependency cycle through {name}")
+        visiting.add(name)
+        for dep in deps[name]:
+            visit(dep)
+        visiting.discard(name)
+        visited.add(name)
+        order.append(name)
+
+    for name in deps:
+        visit(name)
+    return order
+
+
+def _run_timed(name: str, fn: Callable[[], object]) -> tuple[float, BaseException | None]:
+    start = time.perf_counter()
+    try:
+        with stage_scope(name):
+            fn()
+        return time.perf_counter() - start, None
+    except Exception as e:
+        return time.perf_counter() - start, e
+
+
+def run_stages(
+    stages: list[Stage],
+    workers: int | None = None,
+    logger=None,
+    fail_fast: bool = True,
+    continue_on_error: bool = False,
+) -> dict[str, StageResult]:
+    """
+    Run stages concurrently, each as soon as its dependencies are done.
+
+    On a failure, fail_fast stops scheduling new stages, waits for the running
+    ones and re-raises the error. Without fail_fast, continue_on_error keeps
+    running every stage that does not depend on the failed one and only logs
+    the failures; otherwise scheduling stops and an exception listing the
+    failed stages is raised at the end.
+
+    Args:
+        stages (list[Stage]): The stages; names must be unique.
+        workers (int, optional): Maximum number of concurrent stages. None means one per CPU.
+        logger (Logger, optional): The logger to use. Defaults to None.
+        fail_fast (bool, optional): Re-raise the first error. Defaults to True.
+        continue_on_error (bool, optional): Keep running independent stages after an error.
+            Defaults to False.
+
+    Returns:
+        dict: Stage name -> StageResult, in dependency order.
+    """
+    if logger is None:
+        logger = NullLogger()
+    by_name = {stage.name: stage for stage in stages}
+    if len(by_name) != len(stages):
+        raise ValueError("Stage names must be unique")
+    deps = {stage.name: [d for d in stage.deps if d in by_name] for stage in stages}
+    order = _topological_order(deps)
+
+    max_concurrent = resolve_workers(workers)
+    results: dict[str, StageResult] = {}
+    pending = list(order)
+    running = {}
+    stopped = False
+
+    with ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="stage") as executor:
+        while pending or running:
+            if not stopped:
+                for name in list(pending):
+                    if len(running) >= max_concurrent:
+                        break
+                    dep_results = [results.get(d) for d in deps[name]]
+                    if any(r is not None and r.status != "done" for r in dep_results):
+                        results[name] = StageResult(name, "skipped")
+                        pending.remove(name)
+                        logger.warning(f"Skipping stage {name}: a dependency did not complete")
+                    elif all(r is not None for r in dep_results):
+                        logger.info(f"▶ Starting stage {name}")
+                        running[executor.submit(_run_timed, name, by_name[name].fn)] = name
+                        pending.remove(name)
+            if not running:
+                # Only reached once the run stopped: whatever is left never starts
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                duration, error = future.result()
+                if error is None:
+                    results[name] = StageResult(name, "done", duration)
+                    logger.info(f"✓ Stage {name} completed in {duration:.1f}s")
+                    continue
+                results[name] = StageResult(name, "failed", duration, error)
+                logger.error(f"✗ Stage {name} failed: {error}")
+                logger.debug("Exception details", exc_info=error)
+                if fail_fast or not continue_on_error:
+                    stopped = True
+
+    for name in pending:
+        results[name] = StageResult(name, "skipped")
+    results = {name: results[name] for name in order}
+
+    failed = [r for r in results.values() if r.status == "failed"]
+    if failed:
+        if fail_fast:
+            raise failed[0].error
+        if not continue_on_error:
+            raise Exception(f"Pipeline stages failed: {[r.name for r in failed]}")
+        logger.warning(f"Pipeline completed with {len(failed)} failed stages: {[r.name for r in failed]}")
+    return results
+
+
+def downstream_stages(stages: list[Stage], seeds) -> list[Stage]:
+    """
+    The given stages plus every stage that (transitively) reads from them.
+
+    Args:
+        stages (list[Stage]): All declared stages.
+        seeds (Iterable[str]): Names of the stages whose inputs changed.
+
+    Returns:
+        list[Stage]: The affected stages, in declaration order.
+    """
+    affected = set(seeds)
+    grew = True
+    while grew:
+        grew = False
+        for stage in stages:
+            if stage.name not in affected and any(dep in affected for dep in stage.deps):
+                affected.add(stage.name)
+                grew = True
+    return [stage for stage in stages if stage.name in affected]
+
+
+def critical_path(stages: list[Stage], results: dict[str, StageResult]) -> tuple[float, list[str]]:
+    """
+    Find the dependency chain of completed stages with the largest total duration.
+
+    Args:
+        stages (list[Stage]): The stages that were scheduled.
+        results (dict): Output of run_stages.
+
+    Returns:
+        tuple: (chain duration in seconds, stage names along the chain)
+    """
+    names = {stage.name for stage in stages}
+    deps = {stage.name: [d for d in stage.deps if d in names] for stage in stages}
+    chains: dict[str, tuple[float, list[str]]] = {}
+    for name in _topological_order(deps):
+        result = results.get(name)
+        if result is None or result.duration is None:
+            continue
+        longest = max((chains[d] for d in deps[name] if d in chains), key=lambda c: c[0], default=(0.0, []))
+        chains[name] = (longest[0] + result.duration, longest[1] + [name])
+    return max(chains.values(), key=lambda c: c[0], default=(0.0, []))
+
+
+def log_critical_path_report(stages: list[Stage], results: dict[str, StageResult], wall_time: float, logger):
+    """
+    Log the critical path of a run next to its wall-clock time and total stage time.
+
+    Args:
+        stages (list[Stage]): The stages that were scheduled.
+        results (dict): Output of run_stages.
+        wall_time (float): Seconds the whole run took.
+        logger (Logger): The logger to use.
+    """
+    length, chain = critical_path(stages, results)
+    total = sum(r.duration for r in results.values() if r.duration is not None)
+    logger.info(
+        f"Critical path: {length:.1f}s of {wall_time:.1f}s wall clock "
+        f"({total:.1f}s of stage time across {len(results)} stages)"
+    )
+    for name in chain:
+        logger.info(f"  {results[name].duration:7.1f}s  {name}")
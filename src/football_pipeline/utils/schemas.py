@@ -0,0 +1,364 @@
+"""
+Schema registry for the bronze JSON datasets.
+
+Each dataset is described by the nested Polars schema of one JSON record,
+following the StatsBomb open data specifications in docs/open_data (events v4,
+matches v3, lineups v2, competitions v2) plus the fields the current releases
+add (360 status, OBV, shot fidelity, ...). Bronze reads every file of a
+dataset against its schema, so all outputs share the same columns, column
+order and dtypes: coordinates are float lists, nested arrays (freeze frames,
+tactics lineups, managers) stay typed list/struct columns, and fields absent
+from a file are null.
+
+Bronze is the raw layer, so a field the registry does not know is not lost:
+top-level fields are appended after the registered columns with the dtypes
+Polars infers for them, and unknown fields inside registered objects (which
+cannot be added without changing the object's type) are logged as a warning.
+Either way the field belongs in the registry.
+
+Bump SCHEMA_VERSION whenever a schema changes so the ingest manifests rebuild
+existing outputs.
+"""
+
+import polars as pl
+
+SCHEMA_VERSION = 2
+
+# Building blocks shared by the StatsBomb formats
+_ID_NAME = pl.Struct({"id": pl.Int64, "name": pl.String})
+_LOCATION = pl.List(pl.Float64)
+_COUNTRY = pl.Struct({"id": pl.Int64, "name": pl.String})
+
+COMPETITIONS_SCHEMA = pl.Schema({
+    "competition_id": pl.Int64,
+    "season_id": pl.Int64,
+    "country_name": pl.String,
+    "competition_name": pl.String,
+    "competition_gender": pl.String,
+    "competition_youth": pl.Boolean,
+    "competition_international": pl.Boolean,
+    "season_name": pl.String,
+    "match_updated": pl.String,
+    "match_updated_360": pl.String,
+    "match_available_360": pl.String,
+    "match_available": pl.String,
+})
+
+_MANAGERS = pl.List(pl.Struct({
+    "id": pl.Int64,
+    "name": pl.String,
+    "nickname": pl.String,
+    "dob": pl.String,
+    "country": _COUNTRY,
+}))
+
+
+def _team_schema(side: str) -> pl.Struct:
+    """Home/away team object of a match; its fields carry the side as a prefix."""
+    return pl.Struct({
+        f"{side}_team_id": pl.Int64,
+        f"{side}_team_name": pl.String,
+        f"{side}_team_gender": pl.String,
+        f"{side}_team_group": pl.String,
+        "country": _COUNTRY,
+        "managers": _MANAGERS,
+    })
+
+
+MATCHES_SCHEMA = pl.Schema({
+    "match_id": pl.Int64,
+    "match_date": pl.String,
+    "kick_off": pl.String,
+    "competition": pl.Struct({
+        "competition_id": pl.Int64,
+        "country_name": pl.String,
+        "competition_name": pl.String,
+    }),
+    "season": pl.Struct({"season_id": pl.Int64, "season_name": pl.String}),
+    "home_team": _team_schema("home"),
+    "away_team": _team_schema("away"),
+    "home_score": pl.Int64,
+    "away_score": pl.Int64,
+    "match_status": pl.String,
+    "match_status_360": pl.String,
+    "last_updated": pl.String,
+    "last_updated_360": pl.String,
+    "metadata": pl.Struct({
+        "data_version": pl.String,
+        "shot_fidelity_version": pl.String,
+        "xy_fidelity_version": pl.String,
+    }),
+    "match_week": pl.Int64,
+    "competition_stage": _ID_NAME,
+    "stadium": pl.Struct({"id": pl.Int64, "name": pl.String, "country": _COUNTRY}),
+    "referee": pl.Struct({"id": pl.Int64, "name": pl.String, "country": _COUNTRY}),
+})
+
+LINEUPS_SCHEMA = pl.Schema({
+    "team_id": pl.Int64,
+    "team_name": pl.String,
+    "lineup": pl.List(pl.Struct({
+        "player_id": pl.Int64,
+        "player_name": pl.String,
+        "player_nickname": pl.String,
+        "jersey_number": pl.Int64,
+        "country": _COUNTRY,
+        "cards": pl.List(pl.Struct({
+            "time": pl.String,
+            "card_type": pl.String,
+            "reason": pl.String,
+            "period": pl.Int64,
+        })),
+        "positions": pl.List(pl.Struct({
+            "position_id": pl.Int64,
+            "position": pl.String,
+            "from": pl.String,
+            "to": pl.String,
+            "from_period": pl.Int64,
+            "to_period": pl.Int64,
+            "start_reason": pl.String,
+            "end_reason": pl.String,
+        })),
+    })),
+})
+
+_FREEZE_FRAME_PLAYER = pl.Struct({
+    "location": _LOCATION,
+    "player": _ID_NAME,
+    "position": _ID_NAME,
+    "teammate": pl.Boolean,
+})
+
+_TACTICS = pl.Struct({
+    "formation": pl.Int64,
+    "lineup": pl.List(pl.Struct({
+        "player": _ID_NAME,
+        "position": _ID_NAME,
+        "jersey_number": pl.Int64,
+    })),
+})
+
+# Event type objects (spec section "Event Type Objects"), keyed as in the JSON
+_EVENT_TYPE_OBJECTS = {
+    "50_50": pl.Struct({"outcome": _ID_NAME, "counterpress": pl.Boolean}),
+    "bad_behaviour": pl.Struct({"card": _ID_NAME}),
+    "ball_receipt": pl.Struct({"outcome": _ID_NAME}),
+    "ball_recovery": pl.Struct({"offensive": pl.Boolean, "recovery_failure": pl.Boolean}),
+    "block": pl.Struct({
+        "deflection": pl.Boolean,
+        "offensive": pl.Boolean,
+        "save_block": pl.Boolean,
+        "counterpress": pl.Boolean,
+    }),
+    "carry": pl.Struct({"end_location": _LOCATION}),
+    "clearance": pl.Struct({
+        "aerial_won": pl.Boolean,
+        "body_part": _ID_NAME,
+        "head": pl.Boolean,
+        "left_foot": pl.Boolean,
+        "right_foot": pl.Boolean,
+        "other": pl.Boolean,
+    }),
+    "dribble": pl.Struct({
+        "overrun": pl.Boolean,
+        "nutmeg": pl.Boolean,
+        "outcome": _ID_NAME,
+        "no_touch": pl.Boolean,
+    }),
+    "dribbled_past": pl.Struct({"counterpress": pl.Boolean}),
+    "duel": pl.Struct({"counterpress": pl.Boolean, "type": _ID_NAME, "outcome": _ID_NAME}),
+    "foul_committed": pl.Struct({
+        "counterpress": pl.Boolean,
+        "offensive": pl.Boolean,
+        "type": _ID_NAME,
+        "advantage": pl.Boolean,
+        "penalty": pl.Boolean,
+        "card": _ID_NAME,
+    }),
+    "foul_won": pl.Struct({"defensive": pl.Boolean, "advantage": pl.Boolean, "penalty": pl.Boolean}),
+    "goalkeeper": pl.Struct({
+        "position": _ID_NAME,
+        "technique": _ID_NAME,
+        "body_part": _ID_NAME,
+        "type": _ID_NAME,
+        "outcome": _ID_NAME,
+        "end_location": _LOCATION,
+        "punched_out": pl.Boolean,
+        "success_in_play": pl.Boolean,
+        "lost_in_play": pl.Boolean,
+        "lost_out": pl.Boolean,
+        "saved_to_post": pl.Boolean,
+        "shot_saved_off_target": pl.Boolean,
+        "shot_saved_to_post": pl.Boolean,
+        "penalty_saved_to_post": pl.Boolean,
+    }),
+    "half_end": pl.Struct({"early_video_end": pl.Boolean, "match_suspended": pl.Boolean}),
+    "half_start": pl.Struct({"late_video_start": pl.Boolean}),
+    "injury_stoppage": pl.Struct({"in_chain": pl.Boolean}),
+    "interception": pl.Struct({"outcome": _ID_NAME}),
+    "miscontrol": pl.Struct({"aerial_won": pl.Boolean}),
+    "pass": pl.Struct({
+        "recipient": _ID_NAME,
+        "length": pl.Float64,
+        "angle": pl.Float64,
+        "height": _ID_NAME,
+        "end_location": _LOCATION,
+        "assisted_shot_id": pl.String,
+        "backheel": pl.Boolean,
+        "deflected": pl.Boolean,
+        "miscommunication": pl.Boolean,
+        "cross": pl.Boolean,
+        "cut_back": pl.Boolean,
+        "switch": pl.Boolean,
+        "shot_assist": pl.Boolean,
+        "goal_assist": pl.Boolean,
+        "body_part": _ID_NAME,
+        "type": _ID_NAME,
+        "outcome": _ID_NAME,
+        "technique": _ID_NAME,
+        "aerial_won": pl.Boolean,
+        "inswinging": pl.Boolean,
+        "outswinging": pl.Boolean,
+        "straight": pl.Boolean,
+        "through_ball": pl.Boolean,
+        "no_touch": pl.Boolean,
+    }),
+    "player_off": pl.Struct({"permanent": pl.Boolean}),
+    "pressure": pl.Struct({"counterpress": pl.Boolean}),
+    "shot": pl.Struct({
+        "key_pass_id": pl.String,
+        "end_location": _LOCATION,
+        "aerial_won": pl.Boolean,
+        "follows_dribble": pl.Boolean,
+        "first_time": pl.Boolean,
+        "freeze_frame": pl.List(_FREEZE_FRAME_PLAYER),
+        "open_goal": pl.Boolean,
+        "statsbomb_xg": pl.Float64,
+        "deflected": pl.Boolean,
+        "technique": _ID_NAME,
+        "body_part": _ID_NAME,
+        "type": _ID_NAME,
+        "outcome": _ID_NAME,
+        "one_on_one": pl.Boolean,
+        "redirect": pl.Boolean,
+        "saved_off_target": pl.Boolean,
+        "saved_to_post": pl.Boolean,
+        "kick_off": pl.Boolean,
+    }),
+    "substitution": pl.Struct({"replacement": _ID_NAME, "outcome": _ID_NAME}),
+}
+
+EVENTS_SCHEMA = pl.Schema({
+    "id": pl.String,
+    "index": pl.Int64,
+    "period": pl.Int64,
+    "timestamp": pl.String,
+    "minute": pl.Int64,
+    "second": pl.Int64,
+    "type": _ID_NAME,
+    "possession": pl.Int64,
+    "possession_team": _ID_NAME,
+    "play_pattern": _ID_NAME,
+    "team": _ID_NAME,
+    "player": _ID_NAME,
+    "position": _ID_NAME,
+    "location": _LOCATION,
+    "duration": pl.Float64,
+    "under_pressure": pl.Boolean,
+    "off_camera": pl.Boolean,
+    "out": pl.Boolean,
+    "counterpress": pl.Boolean,
+    "related_events": pl.List(pl.String),
+    "tactics": _TACTICS,
+    **_EVENT_TYPE_OBJECTS,
+    # On-ball value, present in newer releases
+    "obv_for_after": pl.Float64,
+    "obv_for_before": pl.Float64,
+    "obv_for_net": pl.Float64,
+    "obv_against_after": pl.Float64,
+    "obv_against_before": pl.Float64,
+    "obv_against_net": pl.Float64,
+    "obv_total_net": pl.Float64,
+})
+
+THREE_SIXTY_SCHEMA = pl.Schema({
+    "event_uuid": pl.String,
+    "visible_area": pl.List(pl.Float64),
+    "freeze_frame": pl.List(pl.Struct({
+        "teammate": pl.Boolean,
+        "actor": pl.Boolean,
+        "keeper": pl.Boolean,
+        "location": _LOCATION,
+    })),
+})
+
+# Dataset name -> nested record schema. The J1 League event and match exports
+# follow the StatsBomb API formats. The Hudl physical export is a flat table of
+# per-player metrics without a published field specification; it is registered
+# without a schema and keeps whole-file inference (one file, so one schema).
+SCHEMA_REGISTRY: dict[str, pl.Schema | None] = {
+    "competitions": COMPETITIONS_SCHEMA,
+    "matches": MATCHES_SCHEMA,
+    "lineups": LINEUPS_SCHEMA,
+    "events": EVENTS_SCHEMA,
+    "three-sixty": THREE_SIXTY_SCHEMA,
+    "j1_events": EVENTS_SCHEMA,
+    "j1_matches": MATCHES_SCHEMA,
+    "j1_physical": None,
+}
+
+
+def get_schema(dataset: str) -> pl.Schema | None:
+    """
+    Look up the registered record schema of a dataset.
+
+    Args:
+        dataset (str): The dataset name (a key of SCHEMA_REGISTRY).
+
+    Returns:
+        pl.Schema | None: The nested record schema, or None for datasets registered without one.
+    """
+    if dataset not in SCHEMA_REGISTRY:
+        raise ValueError(f"Unknown dataset schema: {dataset}. Options: {', '.join(SCHEMA_REGISTRY)}")
+    return SCHEMA_REGISTRY[dataset]
+
+
+def flat_schema(schema: pl.Schema, separator: str = "_") -> pl.Schema:
+    """
+    The column schema of a record schema after its structs are flattened.
+    Matches the output of dataframe.flatten_struct_columns.
+
+    Args:
+        schema (pl.Schema): A nested record schema.
+        separator (str, optional): Joins parent and field names. Defaults to "_".
+
+    Returns:
+        pl.Schema: Flat column names and dtypes, in output order.
+    """
+    columns = {}
+    for name, dtype in schema.items():
+        if isinstance(dtype, pl.Struct):
+            nested = flat_schema(pl.Schema({field.name: field.dtype for field in dtype.fields}), separator)
+            columns.update({f"{name}{separator}{col}": sub_dtype for col, sub_dtype in nested.items()})
+        else:
+            columns[name] = dtype
+    return pl.Schema(columns)
+
+
+def field_names(dtype) -> set[str]:
+    """
+    Every field name of a record schema or dtype, at any depth (inside lists too).
+
+    Args:
+        dtype (pl.Schema | pl.DataType): A record schema or a nested dtype.
+
+    Returns:
+        set[str]: The field names.
+    """
+    if isinstance(dtype, pl.Schema):
+        return set(dtype).union(*(field_names(d) for d in dtype.values()))
+    if isinstance(dtype, pl.Struct):
+        return {f.name for f in dtype.fields}.union(*(field_names(f.dtype) for f in dtype.fields))
+    if isinstance(dtype, (pl.List, pl.Array)):
+        return field_names(dtype.inner)
+    return set()
@@ -0,0 +1,169 @@
+"""
+Deterministic sharding of the per-match work across machines.
+
+``--shard i/N`` runs only the per-match stages (see SHARDED_STAGES in
+pipeline.py), and of those only the sources the shard owns: a source belongs
+to shard ``crc32(match key) % N + 1``, where the match key is the source's
+manifest key without its suffix (``events/3788741.json`` -> ``3788741``,
+``matches/11/90.json`` -> ``11/90``). The hash does not depend on the machine,
+the Python hash seed or the file listing order, so every node agrees on the
+split, and a match's events, lineups, 360 data and SPADL actions all belong to
+the same shard.
+
+Shards write disjoint outputs into the shared data directory and keep their
+own manifests (``_manifest.shard-<i>-of-<N>.json``, utils/manifest.py), so
+they never write the same file. A shard that finishes writes a marker to
+``data/_shards/``; ``--finalize`` checks that every shard of the round has
+one, merges the shard manifests into the datasets' manifests and then runs the
+remaining (shared) stages once. Re-running a failed shard only redoes that
+shard's unfinished matches.
+"""
+
+import json
+import os
+import re
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+
+from football_pipeline.utils.constants import SHARDS_DIR
+
+MARKER_PATTERN = re.compile(r"shard-(\d+)-of-(\d+)\.json$")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    One of ``count`` shards (``index`` counts from 1).
+    """
+    index: int
+    count: int
+
+    def __post_init__(self):
+        if self.count < 1 or not 1 <= self.index <= self.count:
+            raise ValueError(f"Invalid shard {self.index}/{self.count}: expected 1 <= i <= N")
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """
+        Parse a shard given as "i/N", e.g. "2/8".
+
+        Args:
+            spec (str): The shard, counting from 1.
+
+        Returns:
+            Shard: The parsed shard.
+        """
+        index, sep, count = spec.partition("/")
+        if not sep or not index.strip().isdigit() or not count.strip().isdigit():
+            raise ValueError(f"Invalid shard {spec!r}: expected i/N, e.g. 2/8")
+        return cls(int(index), int(count))
+
+    @property
+    def name(self) -> str:
+        """The shard in file names, e.g. "shard-2-of-8"."""
+        return f"shard-{self.index}-of-{self.count}"
+
+    def owns(self, key: str) -> bool:
+        """
+        Whether a source belongs to this shard.
+
+        Args:
+            key (str): The source's manifest key, e.g. "3788741.json" or "11/90.json".
+
+        Returns:
+            bool: True when this shard processes the source.
+        """
+        return shard_of(key, self.count) == self.index
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def shard_of(key: str, count: int) -> int:
+    """
+    The shard (1..count) a source belongs to.
+
+    Args:
+        key (str): The source's manifest key.
+        count (int): The number of shards.
+
+    Returns:
+        int: The owning shard.
+    """
+    match_key = PurePosixPath(key).with_suffix("").as_posix()
+    return zlib.crc32(match_key.encode()) % count + 1
+
+
+def _marker_file(shard: Shard, shards_dir: Path) -> Path:
+    return Path(shards_dir) / f"{shard.name}.json"
+
+
+def clear_shard_marker(shard: Shard, shards_dir: Path = SHARDS_DIR):
+    """Forget an earlier completion of a shard (called when the shard starts again)."""
+    _marker_file(shard, shards_dir).unlink(missing_ok=True)
+
+
+def write_shard_marker(shard: Shard, info: dict, shards_dir: Path = SHARDS_DIR) -> Path:
+    """
+    Record that a shard finished.
+
+    Args:
+        shard (Shard): The shard.
+        info (dict): What the shard ran (layers, source, run id, ...).
+        shards_dir (Path, optional): The shared markers directory.
+
+    Returns:
+        Path: The marker file.
+    """
+    marker = _marker_file(shard, shards_dir)
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = marker.with_suffix(".json.tmp")
+    tmp_file.write_text(json.dumps(
+        {"shard": str(shard), "finished_at": datetime.now().isoformat(timespec="seconds"), **info},
+        indent=2,
+        default=str,
+    ))
+    os.replace(tmp_file, marker)
+    return marker
+
+
+def finished_shards(shards_dir: Path = SHARDS_DIR) -> tuple[int, list[dict]]:
+    """
+    The shard count of the current round and the markers of its finished shards.
+
+    Args:
+        shards_dir (Path, optional): The shared markers directory.
+
+    Returns:
+        tuple: (count, markers) with the markers ordered by shard.
+
+    Raises:
+        RuntimeError: When no shard has finished, some shard has not, or the
+            markers are of different shard counts.
+    """
+    found = {}
+    for marker in sorted(Path(shards_dir).glob("shard-*-of-*.json")):
+        match = MARKER_PATTERN.search(marker.name)
+        if match:
+            found[int(match.group(1)), int(match.group(2))] = marker
+    counts = {count for _, count in found}
+    if not counts:
+        raise RuntimeError(f"No finished shards in {shards_dir}, run the shards (--shard i/N) first")
+    if len(counts) > 1:
+        raise RuntimeError(f"Markers of different shard counts in {shards_dir}: {sorted(counts)}")
+    count = counts.pop()
+    missing = [index for index in range(1, count + 1) if (index, count) not in found]
+    if missing:
+        raise RuntimeError(
+            f"Shards {', '.join(f'{i}/{count}' for i in missing)} have not finished; "
+            f"run (or re-run) them before finalizing"
+        )
+    return count, [json.loads(found[index, count].read_text()) for index in range(1, count + 1)]
+
+
+def clear_shard_markers(shards_dir: Path = SHARDS_DIR):
+    """Remove the markers of a finalized round, so the next round starts over."""
+    for marker in Path(shards_dir).glob("shard-*-of-*.json"):
+        marker.unlink(missing_ok=True)
@@ -0,0 +1,170 @@
+"""
+Vectorized spatial queries over 360 freeze frames.
+
+Every helper is a Polars expression or a lazy join, so a query over a whole
+competition is planned and executed by Polars in one pass, with no per-row
+Python. Inputs are the silver tables:
+
+- frames: silver three-sixty freeze frames (event_uuid, teammate, actor, keeper, x, y)
+- events: silver events (id, location_x, location_y, ...)
+
+Coordinates are StatsBomb pitch units (a 120 x 80 pitch, roughly yards), with
+the acting team attacking towards x = 120 in both tables. Distances given in
+metres are converted with METRES_PER_UNIT.
+"""
+
+import polars as pl
+
+METRES_PER_UNIT = 0.9144
+GOAL_X = 120.0
+GOAL_POST_Y = (36.0, 44.0)
+
+
+def _to_expr(value) -> pl.Expr:
+    """Column name -> column, expression -> itself, anything else -> literal."""
+    if isinstance(value, str):
+        return pl.col(value)
+    return value if isinstance(value, pl.Expr) else pl.lit(value)
+
+
+def distance(x1, y1, x2, y2) -> pl.Expr:
+    """
+    Euclidean distance between two points, in pitch units.
+
+    Args:
+        x1, y1, x2, y2 (str | pl.Expr | float): Coordinates (column names, expressions or literals).
+
+    Returns:
+        pl.Expr: The distance expression.
+    """
+    x1, y1, x2, y2 = (_to_expr(c) for c in (x1, y1, x2, y2))
+    return ((x1 - x2) ** 2 + (y1 - y2) ** 2).sqrt()
+
+
+def in_triangle(px, py, a: tuple, b: tuple, c: tuple) -> pl.Expr:
+    """
+    Whether a point lies inside (or on the edge of) a triangle.
+
+    Uses the sign of the cross product against each edge, so it vectorizes to
+    a handful of arithmetic expressions.
+
+    Args:
+        px, py (str | pl.Expr): The point coordinates.
+        a, b, c (tuple): Triangle vertices as (x, y) pairs of column names, expressions or literals.
+
+    Returns:
+        pl.Expr: Boolean expression.
+    """
+    px, py = _to_expr(px), _to_expr(py)
+    (ax, ay), (bx, by), (cx, cy) = [(_to_expr(x), _to_expr(y)) for x, y in (a, b, c)]
+
+    def side(x1, y1, x2, y2):
+        return (px - x2) * (y1 - y2) - (x1 - x2) * (py - y2)
+
+    d1, d2, d3 = side(ax, ay, bx, by), side(bx, by, cx, cy), side(cx, cy, ax, ay)
+    has_negative = (d1 < 0) | (d2 < 0) | (d3 < 0)
+    has_positive = (d1 > 0) | (d2 > 0) | (d3 > 0)
+    return ~(has_negative & has_positive)
+
+
+def frames_with_event_location(frames: pl.LazyFrame, events: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Attach the event location (event_x, event_y) to every freeze frame row.
+
+    Args:
+        frames (pl.LazyFrame): Silver freeze frames.
+        events (pl.LazyFrame): Silver events (id, location_x, location_y).
+
+    Returns:
+        pl.LazyFrame: Freeze frame rows of events that have a location.
+    """
+    locations = events.select(
+        pl.col("id").alias("event_uuid"),
+        pl.col("location_x").alias("event_x"),
+        pl.col("location_y").alias("event_y"),
+    ).filter(pl.col("event_x").is_not_null())
+    return frames.join(locations, on="event_uuid", how="inner")
+
+
+def _teammate_filter(teammate: bool | None) -> pl.Expr:
+    return pl.lit(True) if teammate is None else pl.col("teammate") == teammate
+
+
+def players_within_radius(
+    frames: pl.LazyFrame,
+    events: pl.LazyFrame,
+    radius_m: float,
+    teammate: bool | None = None,
+) -> pl.LazyFrame:
+    """
+    Freeze frame players within ``radius_m`` metres of their event's location.
+
+    Args:
+        frames (pl.LazyFrame): Silver freeze frames.
+        events (pl.LazyFrame): Silver events.
+        radius_m (float): The radius in metres.
+        teammate (bool, optional): Only teammates (True) or opponents (False) of the actor.
+            None keeps both. Defaults to None.
+
+    Returns:
+        pl.LazyFrame: The matching freeze frame rows with event_x, event_y and distance_m.
+    """
+    return (
+        frames_with_event_location(frames, events)
+        .filter(~pl.col("actor") & _teammate_filter(teammate))
+        .with_columns((distance("x", "y", "event_x", "event_y") * METRES_PER_UNIT).alias("distance_m"))
+        .filter(pl.col("distance_m") <= radius_m)
+    )
+
+
+def players_between_ball_and_goal(
+    frames: pl.LazyFrame,
+    events: pl.LazyFrame,
+    teammate: bool | None = False,
+) -> pl.LazyFrame:
+    """
+    Freeze frame players inside the triangle between the event location and the goal posts.
+
+    Args:
+        frames (pl.LazyFrame): Silver freeze frames.
+        events (pl.LazyFrame): Silver events.
+        teammate (bool, optional): Only teammates (True) or opponents (False) of the actor.
+            None keeps both. Defaults to False (opponents, i.e. players blocking the goal).
+
+    Returns:
+        pl.LazyFrame: The matching freeze frame rows with event_x and event_y.
+    """
+    triangle = in_triangle(
+        "x", "y",
+        ("event_x", "event_y"),
+        (GOAL_X, GOAL_POST_Y[0]),
+        (GOAL_X, GOAL_POST_Y[1]),
+    )
+    return (
+        frames_with_event_location(frames, events)
+        .filter(~pl.col("actor") & _teammate_filter(teammate) & triangle)
+    )
+
+
+def pressure_counts(
+    frames: pl.LazyFrame,
+    events: pl.LazyFrame,
+    radius_m: float = 5.0,
+) -> pl.LazyFrame:
+    """
+    Number of opponents within ``radius_m`` metres of each event with a freeze frame.
+
+    Args:
+        frames (pl.LazyFrame): Silver freeze frames.
+        events (pl.LazyFrame): Silver events.
+        radius_m (float, optional): The radius in metres. Defaults to 5.0.
+
+    Returns:
+        pl.LazyFrame: Columns event_uuid, opponents_within (0 when nobody is near).
+    """
+    near = (distance("x", "y", "event_x", "event_y") * METRES_PER_UNIT <= radius_m) & ~pl.col("teammate")
+    return (
+        frames_with_event_location(frames, events)
+        .group_by("event_uuid")
+        .agg(near.sum().cast(pl.UInt32).alias("opponents_within"))
+    )
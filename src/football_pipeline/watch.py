@@ -0,0 +1,357 @@
+"""
+Watch mode: a long-running pipeline process that picks up matches as they land.
+
+``football_pipeline watch`` keeps one warm process (Polars, pandas and the
+worker pools are loaded once) and watches the landing directories of both
+sources, as laid out by ``_get_paths`` in bronze/open_data/ingest.py and
+bronze/j1_league/ingest.py. For every batch of new or changed landing files it
+runs only the stages that read those files and the stages downstream of them.
+Every stage is incremental, so a new match is ingested on its own, its
+competition/season partition is recompacted and the silver events/360 tables
+transform that partition only (silver/open_data/incremental.py).
+
+Landing files are debounced: a file counts as written once its size and mtime
+stayed the same for ``settle_seconds``. Hidden and temporary files (``.name``,
+``*.tmp``, ``*.part``) are ignored until they are renamed. Files that settle
+together are processed as one batch; a batch waits up to ``max_wait_seconds``
+for files that are still being written.
+
+On Linux the watcher sleeps on inotify (through libc, no extra dependency) and
+wakes up as soon as something is written to a landing directory; landing
+directories are still rescanned every RESCAN_SECONDS in case an event was
+missed. Elsewhere it polls every ``poll_seconds``.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import signal
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from football_pipeline.config import PipelineConfig
+from football_pipeline.utils.archive import find_sources
+from football_pipeline.utils.constants import (
+    DEFAULT_WATCH_MAX_WAIT_SECONDS,
+    DEFAULT_WATCH_POLL_SECONDS,
+    DEFAULT_WATCH_SETTLE_SECONDS,
+    LOGS_DIR,
+    SUPPORTED_SOURCES,
+)
+from football_pipeline.utils.logging import setup_logger
+from football_pipeline.utils.metrics import finish_run, start_run
+from football_pipeline.utils.scheduler import downstream_stages, run_stages
+
+# Without inotify events, landing is still rescanned this often
+RESCAN_SECONDS = 60.0
+
+# Names of files that are still being written (renamed once complete)
+TEMPORARY_SUFFIXES = (".tmp", ".part", ".partial", ".crdownload", ".swp")
+
+# inotify(7) event flags
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+INOTIFY_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+@dataclass(frozen=True)
+class LandingDir:
+    """
+    A landing directory and the stages that read it.
+
+    Attributes:
+        directory: The landing directory.
+        pattern: Glob pattern of its files, relative to the directory.
+        stages: Names of the stages to run when one of its files lands.
+    """
+    directory: Path
+    pattern: str
+    stages: tuple[str, ...]
+
+
+def landing_dirs(source: str | None = None) -> list[LandingDir]:
+    """
+    The landing directories to watch, from the sources' ``_get_paths``.
+
+    Args:
+        source (str, optional): Only watch this source. Defaults to None (all sources).
+
+    Returns:
+        list[LandingDir]: The directories and the stages reading them.
+    """
+    from football_pipeline.bronze.j1_league.ingest import _get_paths as j1_league_paths
+    from football_pipeline.bronze.open_data.ingest import _get_paths as open_data_paths
+
+    dirs = []
+    if source in (None, "open_data"):
+        paths = open_data_paths()
+        dirs += [
+            LandingDir(paths["landing_competitions"], "competitions.json", ("bronze/open_data/competitions",)),
+            LandingDir(paths["landing_matches"], "*/*.json", ("bronze/open_data/matches",)),
+            LandingDir(paths["landing_lineups"], "*.json", ("bronze/open_data/lineups",)),
+            # SPADL converts the landing events themselves
+            LandingDir(paths["landing_events"], "*.json", ("bronze/open_data/events", "silver/open_data/spadl")),
+            LandingDir(paths["landing_three_sixty_events"], "*.json", ("bronze/open_data/three-sixty",)),
+        ]
+    if source in (None, "j1_league"):
+        paths = j1_league_paths()
+        dirs += [
+            LandingDir(paths["landing_sb_events"], "*.json", ("bronze/j1_league/events",)),
+            LandingDir(paths["landing_sb_matches"], "*.json", ("bronze/j1_league/matches",)),
+            LandingDir(paths["landing_hudl_physical"], "*.json", ("bronze/j1_league/physical",)),
+            LandingDir(paths["landing_mappings"], "*.csv", ("bronze/j1_league/mappings",)),
+        ]
+    return dirs
+
+
+def _is_temporary(path: Path) -> bool:
+    return path.name.startswith((".", "~")) or path.name.endswith(TEMPORARY_SUFFIXES)
+
+
+@dataclass
+class _Pending:
+    """A landing file that changed but has not been processed yet."""
+    signature: tuple[int, int]
+    # When the file was first seen with this size/mtime (monotonic clock)
+    stable_since: float
+    # When the file was first seen changed at all
+    first_seen: float
+
+
+class LandingWatcher:
+    """
+    Tracks the landing files and hands out the ones that finished changing.
+    """
+
+    def __init__(self, dirs: list[LandingDir], settle_seconds: float, max_wait_seconds: float):
+        self.dirs = dirs
+        self.settle_seconds = settle_seconds
+        self.max_wait_seconds = max_wait_seconds
+        # Path -> (size, mtime_ns) it had when it was last processed
+        self.known: dict[Path, tuple[int, int]] = {}
+        self.pending: dict[Path, _Pending] = {}
+        self.owner: dict[Path, LandingDir] = {}
+
+    def scan(self) -> dict[Path, tuple[int, int]]:
+        """The size and mtime of every landing file."""
+        files = {}
+        for landing in self.dirs:
+            if not landing.directory.is_dir():
+                continue
+            for _, path in find_sources(landing.directory, landing.pattern):
+                if _is_temporary(path):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files[path] = (stat.st_size, stat.st_mtime_ns)
+                self.owner[path] = landing
+        return files
+
+    def start(self):
+        """Take the current landing files as processed (the start-up run covers them)."""
+        self.known = self.scan()
+
+    def poll(self) -> list[Path]:
+        """
+        Rescan landing and return the batch of files that is ready, if any.
+
+        A batch is released once every changed file has settled, or when its
+        oldest file has waited max_wait_seconds for the others.
+
+        Returns:
+            list[Path]: Settled new or changed files (empty while nothing is ready).
+        """
+        now = time.monotonic()
+        current = self.scan()
+        for path, signature in current.items():
+            if self.known.get(path) == signature:
+                self.pending.pop(path, None)
+                continue
+            pending = self.pending.get(path)
+            if pending is None:
+                self.pending[path] = _Pending(signature, now, now)
+            elif pending.signature != signature:
+                pending.signature, pending.stable_since = signature, now
+        # Files that vanished before settling (e.g. renamed temporary files)
+        for path in [p for p in self.pending if p not in current]:
+            del self.pending[path]
+
+        settled = [p for p, pending in self.pending.items() if now - pending.stable_since >= self.settle_seconds]
+        if not settled:
+            return []
+        waited = now - min(self.pending[p].first_seen for p in settled)
+        if len(settled) < len(self.pending) and waited < self.max_wait_seconds:
+            return []
+        return sorted(settled)
+
+    def mark_processed(self, paths: list[Path]):
+        """Record the files of a batch, so they only come back when they change again."""
+        for path in paths:
+            self.known[path] = self.pending.pop(path).signature
+
+    def stages_for(self, paths: list[Path]) -> set[str]:
+        """The stages that read the given landing files."""
+        return {stage for path in paths for stage in self.owner[path].stages}
+
+    def directories(self) -> set[Path]:
+        """The directories that hold landing files (for inotify watches)."""
+        dirs = set()
+        for landing in self.dirs:
+            if not landing.directory.is_dir():
+                continue
+            dirs.add(landing.directory)
+            if "/" in landing.pattern:
+                dirs.update(d for d in landing.directory.iterdir() if d.is_dir())
+        return dirs
+
+
+class _Inotify:
+    """Wakes the watcher when something is written to a watched directory (Linux only)."""
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watched: set[Path] = set()
+
+    def watch(self, directories: set[Path]):
+        for directory in directories - self.watched:
+            if self._libc.inotify_add_watch(self.fd, os.fsencode(directory), INOTIFY_MASK) >= 0:
+                self.watched.add(directory)
+
+    def wait(self, timeout: float) -> bool:
+        """Block until an event arrives or the timeout passes; True when woken by an event."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        # The events only wake the watcher; the rescan finds out what changed
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _open_inotify(logger) -> _Inotify | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify()
+    except (OSError, AttributeError) as e:
+        logger.debug("inotify is not available (%s), polling instead", e)
+        return None
+
+
+def watch_landing(
+    bronze: bool = True,
+    silver: bool = True,
+    gold: bool = True,
+    source: str | None = None,
+    config: PipelineConfig | None = None,
+    poll_seconds: float = DEFAULT_WATCH_POLL_SECONDS,
+    settle_seconds: float = DEFAULT_WATCH_SETTLE_SECONDS,
+    max_wait_seconds: float = DEFAULT_WATCH_MAX_WAIT_SECONDS,
+    stop: threading.Event | None = None,
+):
+    """
+    Watch the landing directories and push new files through the requested layers until stopped.
+
+    Starts with one incremental run of every requested stage (catching up on
+    files that landed while nothing was watching), then runs the affected
+    stages for every batch of landed files. A failed batch is logged and the
+    watcher carries on; its files are retried when they change again. Stops on
+    Ctrl-C, SIGTERM or when ``stop`` is set.
+
+    Args:
+        bronze: Whether to run the bronze layer
+        silver: Whether to run the silver layer
+        gold: Whether to run the gold layer
+        source: Source to watch (None for all sources)
+        config: Run options such as the worker count (None for defaults)
+        poll_seconds: Seconds between rescans while files are settling, or always without inotify
+        settle_seconds: Seconds a file's size and mtime must stay unchanged
+        max_wait_seconds: Longest a settled file waits for files that are still changing
+        stop: Set to stop watching (e.g. from another thread)
+    """
+    from football_pipeline.pipeline import declare_stages
+
+    config = config or PipelineConfig()
+    if config.open_data_archive or config.shard is not None:
+        raise ValueError("watch reads the landing directories; it does not combine with --archive or --shard")
+    logger = setup_logger(LOGS_DIR / "watch" / "watch.log", "watch", json_lines=config.log_json)
+    stop = stop or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    stages = declare_stages(bronze, silver, gold, source, config)
+    watcher = LandingWatcher(landing_dirs(source), settle_seconds, max_wait_seconds)
+    inotify = _open_inotify(logger)
+    logger.info(
+        f"👀 Watching {len(watcher.dirs)} landing directories of {source or ', '.join(SUPPORTED_SOURCES)} "
+        f"({'inotify' if inotify else f'polling every {poll_seconds:g}s'}, {len(stages)} stages)"
+    )
+
+    def run_batch(batch_stages, files: list[Path]):
+        start_run(profile=config.profile, label="watch")
+        start = time.perf_counter()
+        try:
+            results = run_stages(batch_stages, config.workers, logger, fail_fast=False, continue_on_error=True)
+        finally:
+            report_file = finish_run({
+                "config": asdict(config),
+                "source": source or "all",
+                "watch_files": [str(f) for f in files],
+            })
+        failed = [name for name, result in results.items() if result.status != "done"]
+        elapsed = time.perf_counter() - start
+        if failed:
+            logger.error(f"Batch finished in {elapsed:.1f}s with failed or skipped stages: {failed}")
+        else:
+            logger.info(f"Batch finished in {elapsed:.1f}s, report in {report_file}")
+        return not failed
+
+    try:
+        watcher.start()
+        logger.info("Catching up on files that landed before the watcher started...")
+        run_batch(stages, [])
+        while not stop.is_set():
+            batch = watcher.poll()
+            if batch:
+                affected = downstream_stages(stages, watcher.stages_for(batch))
+                first_seen = min(watcher.pending[p].first_seen for p in batch)
+                logger.info(f"⚡ {len(batch)} landed files, running {len(affected)} stages")
+                logger.debug("Landed files: %s", [str(p) for p in batch])
+                run_batch(affected, batch)
+                watcher.mark_processed(batch)
+                logger.info(f"Landed files went through in {time.monotonic() - first_seen:.1f}s since they were seen")
+                continue
+            if inotify is None or watcher.pending:
+                # Polling, or waiting for changed files to settle
+                stop.wait(poll_seconds)
+                continue
+            # Sleep until landing changes or the safety rescan is due, checking for stop every second
+            inotify.watch(watcher.directories())
+            deadline = time.monotonic() + RESCAN_SECONDS
+            while not stop.is_set() and time.monotonic() < deadline and not inotify.wait(1.0):
+                pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if inotify is not None:
+            inotify.close()
+        logger.info("Watcher stopped")
@@ -0,0 +1,138 @@
+"""
+Tests for reading landing JSON out of archives and compressed files (utils/archive.py).
+"""
+
+import gzip
+import io
+import tarfile
+import zipfile
+import zlib
+
+import pytest
+
+from football_pipeline.utils.archive import (
+    ArchiveDir,
+    ArchiveMember,
+    find_archive_root,
+    find_sources,
+    fingerprint_member,
+    list_members,
+    read_source,
+    stream_sources,
+)
+
+ROOT = "open-data-master/data"
+
+
+def _content(name: str) -> bytes:
+    return f'[{{"source": "{name}"}}]'.encode()
+
+
+def _zip(path, names):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name in names:
+            zf.writestr(name, gzip.compress(_content(name)) if name.endswith(".gz") else _content(name))
+    return path
+
+
+def _tar(path, names):
+    with tarfile.open(path, "w:gz") as tf:
+        for name in names:
+            data = _content(name)
+            info = tarfile.TarInfo(name)
+            info.size, info.mtime = len(data), 1_700_000_000
+            tf.addfile(info, io.BytesIO(data))
+    return path
+
+
+def test_plain_directory_keys_drop_the_gz_suffix(tmp_path):
+    (tmp_path / "11").mkdir()
+    (tmp_path / "11" / "90.json").write_bytes(_content("90"))
+    (tmp_path / "11" / "27.json.gz").write_bytes(gzip.compress(_content("27")))
+    (tmp_path / "11" / "notes.txt").write_text("not a source")
+
+    sources = find_sources(tmp_path, "*/*.json")
+
+    assert [key for key, _ in sources] == ["11/27.json", "11/90.json"]
+    assert read_source(sources[0][1]) == _content("27")
+
+
+def test_an_extracted_file_wins_over_its_gz_copy(tmp_path):
+    (tmp_path / "7.json").write_bytes(_content("extracted"))
+    (tmp_path / "7.json.gz").write_bytes(gzip.compress(_content("compressed")))
+
+    [(key, source)] = find_sources(tmp_path, "*.json")
+
+    assert key == "7.json"
+    assert source == tmp_path / "7.json"
+
+
+@pytest.mark.parametrize("make", [_zip, _tar], ids=["zip", "tar"])
+def test_archive_dir_matches_its_prefix_and_depth(tmp_path, make):
+    archive = make(tmp_path / f"snapshot.{'zip' if make is _zip else 'tar.gz'}", [
+        f"{ROOT}/competitions.json",
+        f"{ROOT}/events/3788741.json",
+        f"{ROOT}/events/3788742.json.gz" if make is _zip else f"{ROOT}/events/3788742.json",
+        # Same prefix as a string, but another directory
+        f"{ROOT}/events_old/1.json",
+        # One level too deep for "*.json"
+        f"{ROOT}/events/nested/2.json",
+        f"{ROOT}/matches/11/90.json",
+    ])
+    root = find_archive_root(archive, "competitions.json")
+
+    assert root == ArchiveDir(archive, ROOT)
+    events = find_sources(root / "events", "*.json")
+    assert [key for key, _ in events] == ["3788741.json", "3788742.json"]
+    assert all(isinstance(source, ArchiveMember) for _, source in events)
+    assert read_source(events[1][1]) == _content(events[1][1].member)
+    assert [key for key, _ in find_sources(root / "matches", "*/*.json")] == ["11/90.json"]
+    assert find_sources(root / "matches", "*.json") == []
+
+
+def test_archive_member_wins_over_its_gz_copy(tmp_path):
+    archive = _zip(tmp_path / "snapshot.zip", ["events/7.json.gz", "events/7.json"])
+
+    [(key, source)] = find_sources(ArchiveDir(archive, "events"), "*.json")
+
+    assert key == "7.json"
+    assert source.member == "events/7.json"
+
+
+def test_stream_sources_reads_tar_members_once_in_archive_order(tmp_path):
+    names = [f"events/{match_id}.json" for match_id in (30, 10, 20, 40)]
+    archive = _tar(tmp_path / "snapshot.tar.gz", names)
+    members = list_members(archive)
+    plain = tmp_path / "5.json"
+    plain.write_bytes(_content("5"))
+
+    # Requested in key order, and without the last member of the archive
+    wanted = sorted(members[:3], key=lambda member: member.member)
+    streamed = list(stream_sources([*wanted, plain]))
+
+    assert streamed[0] == plain
+    assert [source.member for source in streamed[1:]] == names[:3]
+    assert [source.data for source in streamed[1:]] == [_content(name) for name in names[:3]]
+
+
+def test_zip_members_are_fingerprinted_by_their_crc(tmp_path):
+    archive = _zip(tmp_path / "snapshot.zip", ["events/7.json"])
+    [member] = list_members(archive)
+
+    fingerprint = fingerprint_member(member)
+
+    assert fingerprint["digest"] == f"crc32:{zlib.crc32(_content('events/7.json')):08x}"
+    assert fingerprint["size"] == len(_content("events/7.json"))
+    # Rewriting the archive with the same content keeps the digest
+    rewritten = _zip(tmp_path / "copy.zip", ["events/7.json"])
+    assert fingerprint_member(list_members(rewritten)[0])["digest"] == fingerprint["digest"]
+
+
+def test_tar_members_are_fingerprinted_by_size_and_mtime(tmp_path):
+    [member] = list_members(_tar(tmp_path / "snapshot.tar.gz", ["events/7.json"]))
+
+    assert fingerprint_member(member) == {
+        "size": member.size,
+        "mtime_ns": 1_700_000_000 * 1_000_000_000,
+        "digest": f"tar:{member.size}:{1_700_000_000 * 1_000_000_000}",
+    }
@@ -0,0 +1,82 @@
+"""
+Tests for the on-disk result cache (cache.py).
+"""
+
+import os
+
+import polars as pl
+
+from football_pipeline import cache
+
+
+def _counting(tmp_path, input_file):
+    """A cached function reading input_file, and the list of its actual calls."""
+    calls = []
+
+    @cache.cached(inputs=[input_file], cache_dir=tmp_path / "cache")
+    def total(column: str) -> pl.DataFrame:
+        calls.append(column)
+        return pl.read_parquet(input_file).select(pl.col(column).sum())
+
+    return total, calls
+
+
+def _write(path, values):
+    pl.DataFrame({"goals": values}).write_parquet(path)
+
+
+def test_repeated_calls_read_the_stored_result(tmp_path):
+    input_file = tmp_path / "shots.parquet"
+    _write(input_file, [1, 0, 2])
+    total, calls = _counting(tmp_path, input_file)
+
+    assert total("goals").item() == 3
+    assert total("goals").item() == 3
+    assert calls == ["goals"]
+
+
+def test_a_rewritten_input_invalidates_the_result(tmp_path):
+    input_file = tmp_path / "shots.parquet"
+    _write(input_file, [1, 0, 2])
+    total, calls = _counting(tmp_path, input_file)
+    total("goals")
+
+    _write(input_file, [1, 1, 1, 1])
+    stat = input_file.stat()
+    # Same second on coarse filesystems: make sure the mtime moves
+    os.utime(input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert total("goals").item() == 4
+    assert calls == ["goals", "goals"]
+
+
+def test_results_are_evicted_least_recently_used_first(tmp_path):
+    input_file = tmp_path / "shots.parquet"
+    pl.DataFrame({f"c{i}": range(20_000) for i in range(3)}).write_parquet(input_file)
+    calls = []
+
+    # Room for about two results of one 20k-row Int64 column
+    @cache.cached(inputs=[input_file], cache_dir=tmp_path / "cache", max_mb=0.35)
+    def column(name: str) -> pl.DataFrame:
+        calls.append(name)
+        return pl.read_parquet(input_file, columns=[name])
+
+    column("c0")
+    column("c1")
+    column("c0")
+    column("c2")
+    column("c0")
+    column("c1")
+
+    assert calls == ["c0", "c1", "c2", "c1"]
+
+
+def test_clear_cache_removes_the_functions_results(tmp_path):
+    input_file = tmp_path / "shots.parquet"
+    _write(input_file, [1])
+    total, calls = _counting(tmp_path, input_file)
+    total("goals")
+
+    assert total.cache_clear() == 1
+    total("goals")
+    assert calls == ["goals", "goals"]
@@ -0,0 +1,83 @@
+"""
+Tests for bronze JSON ingestion against the schema registry (utils/dataframe.py).
+"""
+
+import gzip
+import json
+
+import polars as pl
+
+from football_pipeline.utils.dataframe import ingest_json_to_parquet
+from football_pipeline.utils.schemas import flat_schema, get_schema
+
+
+class _Recorder:
+    """A logger keeping its warnings."""
+
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, msg, *args):
+        self.warnings.append(msg % args if args else msg)
+
+    def info(self, msg, *args):
+        pass
+
+    debug = error = info
+
+
+def _event(index, **fields):
+    return {"id": f"e{index}", "index": index, "period": 1, "type": {"id": 30, "name": "Pass"}, **fields}
+
+
+def _ingest(tmp_path, records, **options):
+    input_file = tmp_path / "3788741.json"
+    input_file.write_text(json.dumps(records))
+    output_file = tmp_path / "out" / "3788741.parquet"
+    logger = _Recorder()
+    ingest_json_to_parquet(input_file, output_file, logger, "events", schema="events", use_manifest=False, **options)
+    return pl.read_parquet(output_file), logger.warnings
+
+
+def test_registered_fields_only_keep_the_registry_columns(tmp_path):
+    df, warnings = _ingest(tmp_path, [_event(1), _event(2, under_pressure=True)])
+
+    assert df.columns == list(flat_schema(get_schema("events")))
+    assert warnings == []
+
+
+def test_unknown_top_level_fields_are_kept(tmp_path):
+    records = [_event(1), _event(2, brand_new_field={"value": 0.5, "tags": ["a"]}), _event(3, late_flag=True)]
+
+    df, warnings = _ingest(tmp_path, records)
+
+    registered = list(flat_schema(get_schema("events")))
+    assert df.columns[: len(registered)] == registered
+    assert df["brand_new_field_value"].to_list() == [None, 0.5, None]
+    assert df["brand_new_field_tags"].to_list() == [None, ["a"], None]
+    assert df["late_flag"].to_list() == [None, None, True]
+    assert len(warnings) == 1
+    assert "brand_new_field, late_flag" in warnings[0]
+
+
+def test_unknown_nested_fields_are_reported(tmp_path):
+    records = [_event(1, type={"id": 30, "name": "Pass", "subtype": "short"})]
+
+    df, warnings = _ingest(tmp_path, records)
+
+    assert "type_subtype" not in df.columns
+    assert df["type_name"].to_list() == ["Pass"]
+    assert len(warnings) == 1
+    assert "not written: subtype" in warnings[0]
+
+
+def test_streamed_and_compressed_files_keep_unknown_fields(tmp_path):
+    # Several chunks of about 40 KB each
+    records = [_event(i, brand_new_field=i) for i in range(2000)]
+    input_file = tmp_path / "3788741.json.gz"
+    input_file.write_bytes(gzip.compress(json.dumps(records).encode()))
+    output_file = tmp_path / "out" / "3788741.parquet"
+
+    ingest_json_to_parquet(input_file, output_file, schema="events", use_manifest=False, max_memory_mb=1)
+
+    assert pl.read_parquet(output_file)["brand_new_field"].to_list() == list(range(2000))
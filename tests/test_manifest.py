@@ -0,0 +1,101 @@
+"""
+Tests for the incremental ingest manifests (utils/manifest.py).
+"""
+
+import os
+
+from football_pipeline.utils.io import fingerprint_file
+from football_pipeline.utils.manifest import MANIFEST_FILENAME, IngestManifest, plan_incremental
+
+VERSION = "1"
+
+
+def _ingested(tmp_path, names):
+    """Sources with their outputs written and recorded in a saved manifest."""
+    source_dir, output_dir = tmp_path / "landing", tmp_path / "bronze"
+    source_dir.mkdir()
+    output_dir.mkdir()
+    manifest = IngestManifest.load(output_dir)
+    items = []
+    for name in names:
+        source = source_dir / f"{name}.json"
+        source.write_text(f'{{"match_id": {name}}}')
+        output = output_dir / f"{name}.parquet"
+        output.write_bytes(b"parquet")
+        manifest.record(source.name, output, VERSION, fingerprint_file(source))
+        items.append((source.name, source, output))
+    manifest.save()
+    return IngestManifest.load(output_dir), items
+
+
+def _statuses(plan):
+    return {key: status for key, _, _, status, _ in plan}
+
+
+def _touch(path, offset_ns=10**9):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + offset_ns))
+
+
+def test_unchanged_sources_are_not_hashed(tmp_path):
+    manifest, items = _ingested(tmp_path, [1, 2])
+
+    plan = plan_incremental(manifest, items, VERSION)
+
+    assert _statuses(plan) == {"1.json": "unchanged", "2.json": "unchanged"}
+    assert all(fingerprint is None for *_, fingerprint in plan)
+
+
+def test_new_changed_and_touched_sources(tmp_path):
+    manifest, items = _ingested(tmp_path, [1, 2, 3])
+    (_, edited, _), (_, touched, _) = items[0], items[1]
+    edited.write_text('{"match_id": 1, "edited": true}')
+    _touch(touched)
+    new = tmp_path / "landing" / "4.json"
+    new.write_text('{"match_id": 4}')
+    items.append((new.name, new, tmp_path / "bronze" / "4.parquet"))
+
+    plan = plan_incremental(manifest, items, VERSION)
+
+    assert _statuses(plan) == {"1.json": "changed", "2.json": "unchanged", "3.json": "unchanged", "4.json": "new"}
+    # The touched source was hashed once; its new mtime is remembered so the next run skips the hash
+    assert manifest.entries["2.json"]["mtime_ns"] == touched.stat().st_mtime_ns
+    assert manifest.quick_status("2.json", touched, items[1][2], VERSION) == "unchanged"
+
+
+def test_same_size_edit_with_a_new_mtime_is_changed(tmp_path):
+    manifest, items = _ingested(tmp_path, [1])
+    _, source, output = items[0]
+    source.write_text(source.read_text().replace("1", "7"))
+    _touch(source)
+
+    assert manifest.quick_status("1.json", source, output, VERSION) == "verify"
+    assert _statuses(plan_incremental(manifest, items, VERSION)) == {"1.json": "changed"}
+
+
+def test_version_bump_missing_output_and_overwrite_rebuild(tmp_path):
+    manifest, items = _ingested(tmp_path, [1, 2])
+
+    assert _statuses(plan_incremental(manifest, items, "2")) == {"1.json": "changed", "2.json": "changed"}
+    assert _statuses(plan_incremental(manifest, items, VERSION, overwrite=True)) == {
+        "1.json": "changed",
+        "2.json": "changed",
+    }
+    items[0][2].unlink()
+    assert _statuses(plan_incremental(manifest, items, VERSION)) == {"1.json": "changed", "2.json": "unchanged"}
+
+
+def test_corrupt_or_foreign_manifest_reads_as_empty(tmp_path):
+    (tmp_path / MANIFEST_FILENAME).write_text("{not json")
+    assert IngestManifest.load(tmp_path).entries == {}
+
+    (tmp_path / MANIFEST_FILENAME).write_text('{"format": 0, "entries": {"1.json": {}}}')
+    assert IngestManifest.load(tmp_path).entries == {}
+
+
+def test_per_source_versions_rebuild_only_the_changed_source(tmp_path):
+    manifest, items = _ingested(tmp_path, [1, 2])
+
+    plan = plan_incremental(manifest, items, {"1.json": VERSION, "2.json": f"{VERSION}-context"})
+
+    assert _statuses(plan) == {"1.json": "unchanged", "2.json": "changed"}
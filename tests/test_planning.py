@@ -0,0 +1,127 @@
+"""
+Tests for the size-aware work planner (utils/planning.py).
+"""
+
+import polars as pl
+import pytest
+
+from football_pipeline.utils.metrics import FILES_FILENAME
+from football_pipeline.utils.planning import (
+    MAX_BATCH_FILES,
+    MIN_HISTORY_FILES,
+    CostModel,
+    cost_model,
+    iter_batches,
+    plan_work,
+)
+
+MB = 1 << 20
+
+
+def _files(tmp_path, sizes: dict[str, int]) -> list:
+    paths = []
+    for name, size in sizes.items():
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        paths.append(path)
+    return paths
+
+
+def test_large_files_get_their_own_task_and_come_first(tmp_path):
+    files = _files(tmp_path, {"small_1.json": 100, "big.json": 2 * MB, "small_2.json": 200, "medium.json": MB})
+    model = CostModel(file_seconds=0.01, seconds_per_mb=1.0)
+
+    plan = plan_work("events", files, workers=2, model=model)
+
+    assert [[path.name for path in batch] for batch in plan.batches] == [
+        ["big.json"],
+        ["medium.json"],
+        ["small_2.json", "small_1.json"],
+    ]
+    assert plan.files == 4
+    assert plan.bytes == 3 * MB + 300
+    assert plan.sources()[0].name == "big.json"
+
+
+def test_small_files_are_packed_up_to_the_file_cap(tmp_path):
+    files = _files(tmp_path, {f"{i:03}.json": 10 for i in range(MAX_BATCH_FILES + 6)})
+    # All of them together stay under the batch target: only the file cap closes a batch
+    model = CostModel(file_seconds=0.001, seconds_per_mb=0.0)
+
+    plan = plan_work("lineups", files, workers=1, model=model)
+
+    assert [len(batch) for batch in plan.batches] == [MAX_BATCH_FILES, 6]
+    assert sorted(plan.sources()) == sorted(files)
+
+
+def test_every_worker_gets_a_task_on_small_jobs(tmp_path):
+    files = _files(tmp_path, {f"{i}.json": 1000 for i in range(8)})
+
+    plan = plan_work("lineups", files, workers=4, model=CostModel(file_seconds=0.01, seconds_per_mb=0.0))
+
+    assert len(plan.batches) >= 4
+
+
+def test_estimated_wall_time_assigns_tasks_to_the_first_free_worker(tmp_path):
+    files = _files(tmp_path, {"a.json": 3 * MB, "b.json": 2 * MB, "c.json": 2 * MB})
+    plan = plan_work("events", files, workers=2, model=CostModel(file_seconds=0.0, seconds_per_mb=1.0))
+
+    assert plan.sequential_s == pytest.approx(7.0)
+    # a on one worker, b then c on the other
+    assert plan.estimated_wall_s == pytest.approx(4.0, abs=0.01)
+
+
+def test_empty_plan(tmp_path):
+    plan = plan_work("events", [], workers=4, unchanged=3)
+
+    assert plan.batches == []
+    assert plan.estimated_wall_s == 0.0
+    assert plan.describe() == ["nothing to do, 3 unchanged"]
+
+
+def test_iter_batches_yields_a_batch_once_all_its_sources_arrived(tmp_path):
+    files = _files(tmp_path, {"big.json": MB, "s1.json": 10, "s2.json": 20, "s3.json": 30})
+    plan = plan_work("events", files, workers=1, model=CostModel(file_seconds=0.01, seconds_per_mb=1.0))
+    big, packed = plan.batches
+    assert big == [tmp_path / "big.json"]
+
+    # Archive order differs from plan order: the packed batch completes last
+    arrivals = [packed[-1], big[0], *packed[:-1]]
+    batches = list(iter_batches(plan, arrivals))
+
+    assert batches[0] == big
+    assert sorted(batches[1]) == sorted(packed)
+    assert len(batches) == 2
+
+
+def _write_history(runs_dir, output_dir, rows):
+    run_dir = runs_dir / "20250101_000000"
+    run_dir.mkdir(parents=True)
+    pl.DataFrame(
+        [
+            {"status": status, "output_file": f"{output_dir}/{i}.parquet", "input_bytes": size, "wall_s": wall}
+            for i, (status, size, wall) in enumerate(rows)
+        ]
+    ).write_parquet(run_dir / FILES_FILENAME)
+
+
+def test_cost_model_is_fitted_on_earlier_runs(tmp_path):
+    output_dir = tmp_path / "data" / "events"
+    rows = [("processed", size * MB, 0.02 + 0.5 * size) for size in range(1, MIN_HISTORY_FILES + 3)]
+    # Skipped files say nothing about the cost of processing one
+    rows.append(("unchanged", 100 * MB, 0.0))
+    _write_history(tmp_path / "runs", output_dir, rows)
+
+    model = cost_model(output_dir, tmp_path / "runs")
+
+    assert model.history_files == MIN_HISTORY_FILES + 2
+    assert model.file_seconds == pytest.approx(0.02)
+    assert model.seconds_per_mb == pytest.approx(0.5)
+
+
+def test_cost_model_falls_back_to_defaults_without_history(tmp_path):
+    output_dir = tmp_path / "data" / "events"
+    _write_history(tmp_path / "runs", output_dir, [("processed", MB, 0.1)])
+
+    assert cost_model(output_dir, tmp_path / "runs") == CostModel()
+    assert cost_model(output_dir, tmp_path / "no_runs") == CostModel()
@@ -0,0 +1,156 @@
+"""
+Tests for the stage scheduler (utils/scheduler.py).
+"""
+
+import threading
+
+import pytest
+
+from football_pipeline.utils.scheduler import (
+    Stage,
+    StageResult,
+    critical_path,
+    downstream_stages,
+    run_stages,
+)
+
+
+def _recorder():
+    """A list of started stage names and a factory of stage functions appending to it."""
+    started = []
+    lock = threading.Lock()
+
+    def stage_fn(name, error=None):
+        def fn():
+            with lock:
+                started.append(name)
+            if error is not None:
+                raise error
+        return fn
+
+    return started, stage_fn
+
+
+def test_stages_run_after_their_dependencies():
+    started, fn = _recorder()
+    stages = [
+        Stage("gold", fn("gold"), ["silver"]),
+        Stage("silver", fn("silver"), ["bronze"]),
+        Stage("bronze", fn("bronze")),
+    ]
+
+    results = run_stages(stages, workers=4)
+
+    assert started == ["bronze", "silver", "gold"]
+    assert list(results) == ["bronze", "silver", "gold"]
+    assert all(r.status == "done" and r.duration is not None for r in results.values())
+
+
+def test_dependencies_outside_the_run_are_satisfied():
+    started, fn = _recorder()
+
+    results = run_stages([Stage("silver", fn("silver"), ["bronze"])], workers=1)
+
+    assert started == ["silver"]
+    assert results["silver"].status == "done"
+
+
+def test_fail_fast_reraises_and_skips_dependents():
+    started, fn = _recorder()
+    stages = [
+        Stage("bronze", fn("bronze", KeyError("boom"))),
+        Stage("silver", fn("silver"), ["bronze"]),
+    ]
+
+    with pytest.raises(KeyError, match="boom"):
+        run_stages(stages, workers=1)
+    assert started == ["bronze"]
+
+
+def test_continue_on_error_runs_independent_stages():
+    started, fn = _recorder()
+    stages = [
+        Stage("bronze/a", fn("bronze/a", RuntimeError("bad input"))),
+        Stage("silver/a", fn("silver/a"), ["bronze/a"]),
+        Stage("gold/a", fn("gold/a"), ["silver/a"]),
+        Stage("bronze/b", fn("bronze/b")),
+        Stage("silver/b", fn("silver/b"), ["bronze/b"]),
+    ]
+
+    results = run_stages(stages, workers=1, fail_fast=False, continue_on_error=True)
+
+    assert sorted(started) == ["bronze/a", "bronze/b", "silver/b"]
+    assert {name: r.status for name, r in results.items()} == {
+        "bronze/a": "failed",
+        "silver/a": "skipped",
+        "gold/a": "skipped",
+        "bronze/b": "done",
+        "silver/b": "done",
+    }
+    assert isinstance(results["bronze/a"].error, RuntimeError)
+
+
+def test_without_continue_on_error_scheduling_stops_and_failures_are_listed():
+    started, fn = _recorder()
+    stages = [
+        Stage("bronze/a", fn("bronze/a", RuntimeError("bad input"))),
+        Stage("bronze/b", fn("bronze/b"), ["bronze/a"]),
+    ]
+
+    with pytest.raises(Exception, match=r"Pipeline stages failed: \['bronze/a'\]"):
+        run_stages(stages, workers=1, fail_fast=False)
+    assert started == ["bronze/a"]
+
+
+def test_duplicate_names_and_cycles_are_rejected():
+    _, fn = _recorder()
+
+    with pytest.raises(ValueError, match="unique"):
+        run_stages([Stage("a", fn("a")), Stage("a", fn("a"))])
+    with pytest.raises(ValueError, match="cycle"):
+        run_stages([Stage("a", fn("a"), ["b"]), Stage("b", fn("b"), ["a"])])
+
+
+def test_critical_path_follows_the_longest_chain():
+    stages = [
+        Stage("bronze/events", None),
+        Stage("bronze/lineups", None),
+        Stage("silver/events", None, ["bronze/events"]),
+        Stage("silver/lineups", None, ["bronze/lineups"]),
+        Stage("gold/xg", None, ["silver/events", "silver/lineups"]),
+    ]
+    durations = {
+        "bronze/events": 4.0,
+        "bronze/lineups": 1.0,
+        "silver/events": 2.0,
+        "silver/lineups": 3.0,
+        "gold/xg": 0.5,
+    }
+    results = {name: StageResult(name, "done", seconds) for name, seconds in durations.items()}
+
+    length, chain = critical_path(stages, results)
+
+    assert length == pytest.approx(6.5)
+    assert chain == ["bronze/events", "silver/events", "gold/xg"]
+
+
+def test_critical_path_ignores_stages_that_did_not_run():
+    stages = [Stage("a", None), Stage("b", None, ["a"])]
+    results = {"a": StageResult("a", "done", 2.0), "b": StageResult("b", "skipped")}
+
+    assert critical_path(stages, results) == (2.0, ["a"])
+    assert critical_path(stages, {}) == (0.0, [])
+
+
+def test_downstream_stages_are_transitive_and_keep_declaration_order():
+    stages = [
+        Stage("bronze/events", None),
+        Stage("bronze/lineups", None),
+        Stage("silver/events", None, ["bronze/events"]),
+        Stage("silver/star", None, ["silver/events", "silver/lineups"]),
+        Stage("silver/lineups", None, ["bronze/lineups"]),
+    ]
+
+    affected = downstream_stages(stages, ["bronze/events"])
+
+    assert [stage.name for stage in affected] == ["bronze/events", "silver/events", "silver/star"]
@@ -0,0 +1,104 @@
+"""
+Tests for sharded runs (utils/sharding.py) and their finalization.
+"""
+
+import zlib
+
+import pytest
+
+from football_pipeline.utils.manifest import MANIFEST_FILENAME, IngestManifest, merge_shard_manifests
+from football_pipeline.utils.sharding import (
+    Shard,
+    clear_shard_marker,
+    clear_shard_markers,
+    finished_shards,
+    shard_of,
+    write_shard_marker,
+)
+
+MATCH_KEYS = [f"{match_id}.json" for match_id in range(3788741, 3788841)]
+
+
+def test_shard_of_is_crc32_of_the_match_key():
+    assert shard_of("3788741.json", 8) == zlib.crc32(b"3788741") % 8 + 1
+    assert shard_of("11/90.json", 8) == zlib.crc32(b"11/90") % 8 + 1
+
+
+def test_every_file_of_a_match_goes_to_the_same_shard():
+    for count in (1, 3, 8):
+        assert shard_of("3788741.json", count) == shard_of("3788741.parquet", count) == shard_of("3788741", count)
+
+
+def test_shards_partition_the_sources():
+    shards = [Shard(index, 4) for index in range(1, 5)]
+
+    owners = [[shard.index for shard in shards if shard.owns(key)] for key in MATCH_KEYS]
+
+    assert all(len(owner) == 1 for owner in owners)
+    # crc32 spreads a run of match ids over every shard
+    assert {owner[0] for owner in owners} == {1, 2, 3, 4}
+
+
+def test_parse_shard():
+    shard = Shard.parse("2/8")
+
+    assert (shard.index, shard.count) == (2, 8)
+    assert shard.name == "shard-2-of-8"
+    assert str(shard) == "2/8"
+    for spec in ["2", "a/8", "0/8", "9/8", "1/0"]:
+        with pytest.raises(ValueError):
+            Shard.parse(spec)
+
+
+def test_finished_shards_needs_every_shard_of_the_round(tmp_path):
+    with pytest.raises(RuntimeError, match="No finished shards"):
+        finished_shards(tmp_path)
+
+    write_shard_marker(Shard(1, 3), {"run_id": "a"}, tmp_path)
+    write_shard_marker(Shard(3, 3), {"run_id": "c"}, tmp_path)
+    with pytest.raises(RuntimeError, match="Shards 2/3 have not finished"):
+        finished_shards(tmp_path)
+
+    write_shard_marker(Shard(2, 3), {"run_id": "b"}, tmp_path)
+    count, markers = finished_shards(tmp_path)
+    assert count == 3
+    assert [marker["run_id"] for marker in markers] == ["a", "b", "c"]
+
+    # A shard started again no longer counts as finished
+    clear_shard_marker(Shard(2, 3), tmp_path)
+    with pytest.raises(RuntimeError, match="Shards 2/3"):
+        finished_shards(tmp_path)
+
+
+def test_finished_shards_rejects_mixed_rounds(tmp_path):
+    write_shard_marker(Shard(1, 2), {}, tmp_path)
+    write_shard_marker(Shard(1, 3), {}, tmp_path)
+
+    with pytest.raises(RuntimeError, match="different shard counts"):
+        finished_shards(tmp_path)
+
+    clear_shard_markers(tmp_path)
+    assert not list(tmp_path.iterdir())
+
+
+def test_finalize_merges_the_shard_manifests(tmp_path):
+    output_dir = tmp_path / "bronze" / "events"
+    stale = {"size": 1, "mtime_ns": 1, "digest": "old", "version": "1", "output": "x.parquet"}
+    IngestManifest(output_dir / MANIFEST_FILENAME, {key: stale for key in MATCH_KEYS}).save()
+
+    for index in (1, 2):
+        shard = Shard(index, 2)
+        manifest = IngestManifest.load(output_dir, shard)
+        # A shard starts from the dataset's entries of the sources it owns
+        assert set(manifest.entries) == {key for key in MATCH_KEYS if shard.owns(key)}
+        for key in manifest.entries:
+            manifest.record(key, output_dir / key, "2", {"size": 2, "mtime_ns": 2, "digest": f"new-{index}"})
+        manifest.save()
+
+    assert merge_shard_manifests(tmp_path) == 2
+    entries = IngestManifest.load(output_dir).entries
+    assert set(entries) == set(MATCH_KEYS)
+    assert {key: entry["digest"] for key, entry in entries.items()} == {
+        key: f"new-{shard_of(key, 2)}" for key in MATCH_KEYS
+    }
+    assert [path.name for path in output_dir.iterdir()] == [MANIFEST_FILENAME]
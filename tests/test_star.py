@@ -0,0 +1,54 @@
+"""
+Tests for the star schema dimensions (silver/open_data/star.py).
+"""
+
+import polars as pl
+
+from football_pipeline.silver.open_data.star import DIMENSIONS, build_fact_events_query, event_indexes, update_dimension
+
+TEAM = DIMENSIONS["team"]
+
+
+def _teams(*rows):
+    return pl.DataFrame(rows, schema={"team_id": pl.Int64, "team_name": pl.String}, orient="row")
+
+
+def test_first_build_numbers_ids_in_order():
+    table = update_dimension(TEAM, None, _teams((217, "Barcelona"), (206, "Deportivo Alavés"), (217, "Barcelona")))
+
+    assert table.rows() == [(1, 206, "Deportivo Alavés"), (2, 217, "Barcelona")]
+    assert table.schema["team_key"] == pl.Int32
+
+
+def test_existing_keys_never_change():
+    first = update_dimension(TEAM, None, _teams((217, "Barcelona"), (206, "Deportivo Alavés")))
+
+    # A later run sees a lower id first, misses one team and renames another
+    second = update_dimension(TEAM, first, _teams((1, "Arsenal"), (217, "FC Barcelona")))
+
+    assert second.rows() == [(1, 206, "Deportivo Alavés"), (2, 217, "FC Barcelona"), (3, 1, "Arsenal")]
+    assert update_dimension(TEAM, second, _teams()).equals(second)
+
+
+def test_missing_attributes_keep_the_known_value():
+    first = update_dimension(TEAM, None, _teams((217, "Barcelona")))
+
+    second = update_dimension(TEAM, first, _teams((217, None)))
+
+    assert second.rows() == [(1, 217, "Barcelona")]
+
+
+def test_event_references_become_indexes_within_the_match():
+    events = pl.LazyFrame({
+        "id": ["a", "b", "c", "d"],
+        "index": [1, 2, 1, 2],
+        "match_id": [10, 10, 20, 20],
+        "related_events": [["b"], ["a"], ["d"], []],
+        "pass_assisted_shot_id": ["b", None, "d", None],
+    })
+
+    facts = build_fact_events_query(events, {}, event_indexes(events)).collect()
+
+    assert facts.columns == ["index", "match_id", "related_event_indexes", "pass_assisted_shot_index"]
+    assert facts["related_event_indexes"].to_list() == [[2], [1], [2], []]
+    assert facts["pass_assisted_shot_index"].to_list() == [2, None, 2, None]